@@ -0,0 +1,470 @@
+# Copyright (c) 2025, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.utils import flt
+
+from asset_reconcile.asset_reconcile.location import get_location_filter
+from asset_reconcile.asset_reconcile.perf import perf_stage, record_cache
+from asset_reconcile.asset_reconcile.valuation import get_values_after_depreciation
+
+# Redis hash holding resolved scans: "<company>::<location>::<search_value>" -> asset name
+# An empty string marks a search value that did not resolve to any asset
+BARCODE_INDEX_CACHE_KEY = "asset_reconcile_barcode_index"
+
+# Seconds the barcode index lives, counted from its first entry
+BARCODE_INDEX_TTL = 24 * 3600
+
+# Max entries of the barcode index, it is dropped and refilled when reached
+BARCODE_INDEX_MAX_ENTRIES = 200_000
+
+# Max number of search values passed in a single IN (...) clause
+BARCODE_CHUNK_SIZE = 1000
+
+# Columns of every asset entry in a scan snapshot (same keys as get_asset_data)
+SNAPSHOT_FIELDS = [
+    "asset",
+    "asset_name",
+    "item_code",
+    "location",
+    "asset_category",
+    "value_after_depreciation",
+    "gross_purchase_amount",
+]
+
+
+def resolve_barcode(search_value, company=None, location=None, include_sub_locations=False):
+    """
+    Resolve a scanned value to an Asset name
+
+    Reads through the barcode index cache, so repeated scans of the same
+    code cost a single Redis lookup. On a miss the value is resolved with
+    one database query (see resolve_barcodes) and stored in the index.
+
+    Args:
+            search_value(str): Barcode, asset name, or item barcode
+            company(str, optional): Company filter for item barcode lookups
+            location(str, optional): Location filter for item barcode lookups
+            include_sub_locations(bool, optional): Item barcodes also match assets under location
+
+    Returns:
+            str: Asset name or None if not found
+    """
+    if not search_value:
+        return None
+
+    cache_field = get_cache_field(search_value, company, location, include_sub_locations)
+    asset_name = frappe.cache().hget(BARCODE_INDEX_CACHE_KEY, cache_field)
+    record_cache(asset_name is not None)
+
+    if asset_name is None:
+        asset_name = (
+            resolve_barcodes([search_value], company, location, include_sub_locations).get(search_value) or ""
+        )
+        set_barcode_index(cache_field, asset_name)
+
+    return asset_name or None
+
+
+def set_barcode_index(cache_field, asset_name):
+    """
+    Store a resolved scan in the barcode index
+
+    Every company, location and scanned value gets an entry, so the hash
+    is bounded: it expires BARCODE_INDEX_TTL after its first entry and is
+    dropped when it reaches BARCODE_INDEX_MAX_ENTRIES. HLEN and EXPIRE are
+    not RedisWrapper helpers, they run on the make_key name in a pipeline.
+    """
+    cache = frappe.cache()
+    cache_key = cache.make_key(BARCODE_INDEX_CACHE_KEY)
+
+    size = cache.pipeline().hlen(cache_key).execute()[0]
+    if size >= BARCODE_INDEX_MAX_ENTRIES:
+        cache.delete_value(BARCODE_INDEX_CACHE_KEY)
+        size = 0
+
+    cache.hset(BARCODE_INDEX_CACHE_KEY, cache_field, asset_name)
+    if not size:
+        cache.pipeline().expire(cache_key, BARCODE_INDEX_TTL).execute()
+
+
+def resolve_barcodes(search_values, company=None, location=None, include_sub_locations=False):
+    """
+    Resolve many scanned values to Asset names with one query per chunk
+
+    Follows the same search order as scan_asset_barcode:
+    1. Asset custom_barcode
+    2. Asset name
+    3. Item Barcode, then the Asset of that item (filtered by company and location)
+
+    Only submitted assets are matched. Comparison follows the database
+    collation (case-insensitive), like the individual lookups did.
+
+    Args:
+            search_values(list): Barcodes, asset names, or item barcodes
+            company(str, optional): Company filter for item barcode lookups
+            location(str, optional): Location filter for item barcode lookups
+            include_sub_locations(bool, optional): Item barcodes also match assets under location
+
+    Returns:
+            dict: Mapping of search value to Asset name (unresolved values are omitted)
+    """
+    # Map normalized values back to what was scanned
+    values_by_key = {}
+    for value in search_values:
+        if value:
+            values_by_key.setdefault(get_match_key(value), []).append(value)
+
+    keys = list(values_by_key)
+    resolved = {}
+
+    for start in range(0, len(keys), BARCODE_CHUNK_SIZE):
+        chunk = keys[start : start + BARCODE_CHUNK_SIZE]
+        with perf_stage("barcode_query"):
+            matches = get_barcode_matches(chunk, company, location, include_sub_locations)
+        for row in matches:
+            key = get_match_key(row.search_value)
+            if key in resolved:
+                continue
+            resolved[key] = row.asset
+
+    return {
+        value: resolved[key]
+        for key, values in values_by_key.items()
+        if key in resolved
+        for value in values
+    }
+
+
+def get_barcode_matches(search_values, company=None, location=None, include_sub_locations=False):
+    """
+    Run the combined barcode lookup query
+
+    Rows are ordered by search priority, so the first row per search value
+    is the asset scan_asset_barcode would return.
+
+    Args:
+            search_values(list): Values to look up
+            company(str, optional): Company filter for item barcode lookups
+            location(str, optional): Location filter for item barcode lookups
+            include_sub_locations(bool, optional): Item barcodes also match assets under location
+
+    Returns:
+            list: Rows with search_value, asset and priority
+    """
+    params = {"values": search_values, "company": company, "location": location}
+    queries = []
+
+    # 1. Asset custom_barcode (if exists)
+    if frappe.get_meta("Asset").has_field("custom_barcode"):
+        queries.append(
+            """
+            select custom_barcode as search_value, name as asset, 1 as priority, modified
+            from `tabAsset`
+            where custom_barcode in %(values)s and docstatus = 1
+            """
+        )
+
+    # 2. Asset name
+    queries.append(
+        """
+        select name as search_value, name as asset, 2 as priority, modified
+        from `tabAsset`
+        where name in %(values)s and docstatus = 1
+        """
+    )
+
+    # 3. Item Barcode -> Asset by item_code
+    item_conditions = ""
+    if company:
+        item_conditions += " and asset.company = %(company)s"
+    if location:
+        # The newest asset of the item within the location tree, not anywhere in the company
+        location_filter = get_location_filter(location, include_sub_locations)
+        if isinstance(location_filter, tuple):
+            item_conditions += " and asset.location in %(locations)s"
+            params["locations"] = location_filter[1]
+        else:
+            item_conditions += " and asset.location = %(location)s"
+
+    queries.append(
+        f"""
+        select item_barcode.barcode as search_value, asset.name as asset, 3 as priority, asset.modified
+        from `tabItem Barcode` item_barcode
+        inner join `tabAsset` asset on asset.item_code = item_barcode.parent
+        where item_barcode.barcode in %(values)s
+            and item_barcode.parenttype = 'Item'
+            and asset.docstatus = 1
+            {item_conditions}
+        """
+    )
+
+    return frappe.db.sql(
+        " union all ".join(queries) + " order by priority asc, modified desc",
+        params,
+        as_dict=True,
+    )
+
+
+def get_scan_snapshot_version(company, location=None, include_sub_locations=False):
+    """
+    Get the version of the offline scan snapshot without building it
+
+    The snapshot only holds assets of the location, their finance book
+    values and the barcodes of their items. Saving any of them bumps its
+    modified, removing one lowers a count, so one aggregate query over the
+    three tables changes whenever the snapshot would.
+
+    Args:
+            company(str): Company filter
+            location(str, optional): Location filter
+            include_sub_locations(bool, optional): Include locations under location
+
+    Returns:
+            str: Snapshot version
+    """
+    conditions = "asset.docstatus = 1 and asset.company = %(company)s"
+    params = {"company": company}
+    location_filter = get_location_filter(location, include_sub_locations) if location else None
+    if isinstance(location_filter, tuple):
+        conditions += " and asset.location in %(locations)s"
+        params["locations"] = location_filter[1]
+    elif location_filter:
+        conditions += " and asset.location = %(location)s"
+        params["location"] = location_filter
+
+    aggregates = frappe.db.sql(
+        f"""
+        select
+            (select count(*) from `tabAsset` asset where {conditions}),
+            (select max(asset.modified) from `tabAsset` asset where {conditions}),
+            (
+                select concat(count(*), '|', coalesce(max(finance_book.modified), ''))
+                from `tabAsset Finance Book` finance_book
+                inner join `tabAsset` asset on asset.name = finance_book.parent
+                where finance_book.parenttype = 'Asset' and {conditions}
+            ),
+            (
+                select concat(count(*), '|', coalesce(max(item_barcode.modified), ''))
+                from `tabItem Barcode` item_barcode
+                where item_barcode.parenttype = 'Item'
+                    and item_barcode.parent in (select asset.item_code from `tabAsset` asset where {conditions})
+            )
+        """,
+        params,
+    )[0]
+
+    # The location tree and the payload layout are part of the version too
+    key = [company, location or "", location_filter, SNAPSHOT_FIELDS, *aggregates]
+    return hashlib.md5(frappe.as_json(key).encode()).hexdigest()
+
+
+def build_scan_snapshot(company, location=None, include_sub_locations=False, version=None):
+    """
+    Build the offline scan snapshot of a company and location
+
+    Codes are added in search priority order (custom_barcode, asset name,
+    item barcode) so a local lookup returns the same asset as
+    scan_asset_barcode for every asset of the location.
+
+    Args:
+            company(str): Company filter
+            location(str, optional): Location filter
+            include_sub_locations(bool, optional): Include locations under location
+            version(str, optional): Version read before building (see get_scan_snapshot_version)
+
+    Returns:
+            dict: Snapshot with version, company, location, fields, assets and codes
+    """
+    # Read before the assets: a change in between makes the next check fetch again
+    version = version or get_scan_snapshot_version(company, location, include_sub_locations)
+
+    filters = {"docstatus": 1, "company": company}
+    if location:
+        filters["location"] = get_location_filter(location, include_sub_locations)
+
+    has_custom_barcode = frappe.get_meta("Asset").has_field("custom_barcode")
+    fields = [
+        "name",
+        "asset_name",
+        "company",
+        "item_code",
+        "location",
+        "asset_category",
+        "gross_purchase_amount",
+        "value_after_depreciation",
+        "calculate_depreciation",
+    ]
+    if has_custom_barcode:
+        fields.append("custom_barcode")
+
+    asset_records = frappe.get_all("Asset", filters=filters, fields=fields, order_by="modified desc")
+    values_after_depreciation = get_values_after_depreciation(asset_records)
+
+    assets = []
+    codes = {}
+    asset_index_by_item = {}
+
+    for index, asset in enumerate(asset_records):
+        assets.append(
+            [
+                asset.name,
+                asset.asset_name,
+                asset.item_code,
+                asset.location,
+                asset.asset_category,
+                flt(values_after_depreciation.get(asset.name)),
+                flt(asset.gross_purchase_amount),
+            ]
+        )
+        # Newest asset wins for item barcodes, like the server lookup
+        if asset.item_code:
+            asset_index_by_item.setdefault(asset.item_code, index)
+
+    # 1. Asset custom_barcode
+    if has_custom_barcode:
+        for index, asset in enumerate(asset_records):
+            if asset.custom_barcode:
+                codes.setdefault(get_match_key(asset.custom_barcode), index)
+
+    # 2. Asset name
+    for index, asset in enumerate(asset_records):
+        codes.setdefault(get_match_key(asset.name), index)
+
+    # 3. Item Barcode -> Asset by item_code
+    item_codes = list(asset_index_by_item)
+    for start in range(0, len(item_codes), BARCODE_CHUNK_SIZE):
+        item_barcodes = frappe.get_all(
+            "Item Barcode",
+            filters={
+                "parent": ("in", item_codes[start : start + BARCODE_CHUNK_SIZE]),
+                "parenttype": "Item",
+            },
+            fields=["parent", "barcode"],
+        )
+        for item_barcode in item_barcodes:
+            if item_barcode.barcode:
+                codes.setdefault(get_match_key(item_barcode.barcode), asset_index_by_item[item_barcode.parent])
+
+    return {
+        "version": version,
+        "company": company,
+        "location": location or "",
+        "include_sub_locations": 1 if include_sub_locations else 0,
+        "fields": SNAPSHOT_FIELDS,
+        "assets": assets,
+        "codes": codes,
+    }
+
+
+def get_ambiguous_barcodes(company=None):
+    """
+    Find scanned values that can mean more than one asset
+
+    custom_barcode is unique, but the search order still hides assets when:
+    - a custom_barcode equals the name of another asset
+    - an item barcode equals a custom_barcode or an asset name
+    - an item barcode belongs to an item with several assets (of one company),
+      the newest one is always returned
+
+    Args:
+            company(str, optional): Only report assets of this company
+
+    Returns:
+            list: Rows with barcode, reason and assets (names, the one a scan returns first)
+    """
+    params = {"company": company}
+    company_condition = "and asset.company = %(company)s" if company else ""
+    has_custom_barcode = frappe.get_meta("Asset").has_field("custom_barcode")
+    ambiguous = []
+
+    if has_custom_barcode:
+        for row in frappe.db.sql(
+            f"""
+            select asset.custom_barcode as barcode, asset.name as asset, other.name as other_asset
+            from `tabAsset` asset
+            inner join `tabAsset` other on other.name = asset.custom_barcode and other.name != asset.name
+            where asset.docstatus = 1 and other.docstatus = 1 {company_condition}
+            """,
+            params,
+            as_dict=True,
+        ):
+            ambiguous.append(
+                frappe._dict(
+                    barcode=row.barcode,
+                    reason="custom_barcode equals the name of another asset",
+                    assets=[row.asset, row.other_asset],
+                )
+            )
+
+    item_barcode_columns = [("name", "an asset name")]
+    if has_custom_barcode:
+        item_barcode_columns.insert(0, ("custom_barcode", "a custom_barcode"))
+
+    for column, label in item_barcode_columns:
+        for row in frappe.db.sql(
+            f"""
+            select item_barcode.barcode, asset.name as asset, item_barcode.parent as item_code
+            from `tabItem Barcode` item_barcode
+            inner join `tabAsset` asset on asset.{column} = item_barcode.barcode
+            where item_barcode.parenttype = 'Item' and asset.docstatus = 1 {company_condition}
+            """,
+            params,
+            as_dict=True,
+        ):
+            ambiguous.append(
+                frappe._dict(
+                    barcode=row.barcode,
+                    reason=f"item barcode of {row.item_code} equals {label}",
+                    assets=[row.asset],
+                )
+            )
+
+    for row in frappe.db.sql(
+        f"""
+        select item_barcode.barcode, asset.company,
+            group_concat(asset.name order by asset.modified desc separator '\n') as assets
+        from `tabItem Barcode` item_barcode
+        inner join `tabAsset` asset on asset.item_code = item_barcode.parent
+        where item_barcode.parenttype = 'Item' and asset.docstatus = 1 {company_condition}
+        group by item_barcode.barcode, asset.company
+        having count(*) > 1
+        """,
+        params,
+        as_dict=True,
+    ):
+        ambiguous.append(
+            frappe._dict(
+                barcode=row.barcode,
+                reason=f"item barcode shared by several assets of {row.company}",
+                assets=row.assets.split("\n"),
+            )
+        )
+
+    return ambiguous
+
+
+def get_match_key(value):
+    """Normalize a search value the way the database collation compares it"""
+    return str(value).rstrip().casefold()
+
+
+def get_cache_field(search_value, company=None, location=None, include_sub_locations=False):
+    """Build the barcode index field for a scan (a location tree is marked with /*)"""
+    if location and include_sub_locations:
+        location = f"{location}/*"
+    return f"{company or ''}::{location or ''}::{search_value}"
+
+
+def clear_barcode_index(doc=None, method=None):
+    """
+    Invalidate the barcode index
+
+    Called from Asset and Item doc events (Item Barcode is a child of Item),
+    since any of them can change what a scanned value resolves to, from
+    Asset Movement: it moves assets with db_set, no Asset event runs, and
+    from Location: item barcodes are matched over location trees.
+    """
+    frappe.cache().delete_value(BARCODE_INDEX_CACHE_KEY)
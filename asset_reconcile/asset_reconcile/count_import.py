@@ -0,0 +1,162 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import csv
+import math
+import os
+
+import frappe
+from frappe import _
+from frappe.utils import cstr, flt
+
+# Accepted header labels (lower case) per column
+IMPORT_COLUMNS = {
+    "asset": ("asset", "asset id"),
+    "barcode": ("barcode", "asset barcode", "item barcode"),
+    "qty": ("counted qty", "reconcile qty", "qty", "quantity", "count"),
+}
+
+# Rejected lines reported back (and in the comment) at most
+IMPORT_ERROR_LIMIT = 500
+
+
+def iter_file_rows(file_path):
+    """
+    Stream the rows of a CSV or XLSX file
+
+    CSV is read line by line, XLSX with openpyxl's read-only mode, so memory
+    does not grow with the number of lines.
+
+    Args:
+            file_path(str): Path of the file on disk
+
+    Yields:
+            list: Cell values of one row
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+
+    if extension == ".csv":
+        with open(file_path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.reader(f)
+    elif extension == ".xlsx":
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for row in workbook.active.iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+    else:
+        frappe.throw(_("Counts can only be imported from CSV or XLSX files"))
+
+
+def get_column_positions(header):
+    """
+    Find the asset, barcode and qty columns of a header row
+
+    Args:
+            header(list): Header cells
+
+    Returns:
+            dict: Column key -> position, for the columns found
+    """
+    labels = [cstr(cell).strip().lower() for cell in header]
+    positions = {}
+    for key, aliases in IMPORT_COLUMNS.items():
+        for position, label in enumerate(labels):
+            if label in aliases:
+                positions[key] = position
+                break
+
+    if "qty" not in positions or not ({"asset", "barcode"} & set(positions)):
+        frappe.throw(
+            _("The file needs a Counted Qty column and an Asset or Barcode column, found: {0}").format(
+                ", ".join(label for label in labels if label) or _("no header")
+            )
+        )
+
+    return positions
+
+
+def read_count_file(file_url):
+    """
+    Read counted quantities from an uploaded CSV or XLSX file
+
+    Lines are streamed and summed per identifier as they are read: memory
+    grows with the number of distinct assets, not with the number of lines.
+    The Asset column wins over the Barcode column when both are filled.
+
+    Args:
+            file_url(str): URL of the uploaded File
+
+    Returns:
+            dict: counts (identifier -> counted qty), lines (data lines read),
+                    rejected (number of rejected lines) and errors (rejected
+                    lines as "line: reason", at most IMPORT_ERROR_LIMIT)
+    """
+    file_doc = frappe.get_doc("File", {"file_url": file_url})
+    file_doc.check_permission("read")
+    file_path = file_doc.get_full_path()
+
+    counts = {}
+    lines = rejected = 0
+    errors = []
+    positions = None
+
+    for line_number, row in enumerate(iter_file_rows(file_path), start=1):
+        if not any(cstr(cell).strip() for cell in row):
+            continue
+
+        if positions is None:
+            positions = get_column_positions(row)
+            continue
+
+        lines += 1
+        identifier = get_cell(row, positions.get("asset")) or get_cell(row, positions.get("barcode"))
+        qty = get_cell(row, positions["qty"])
+
+        error = None
+        if not identifier:
+            error = _("no asset or barcode")
+        elif not qty:
+            error = _("no counted qty")
+        elif not is_number(qty):
+            # flt would read it as 0: the asset would be reported missing
+            error = _("counted qty {0} is not a number").format(qty)
+        elif flt(qty) < 0:
+            error = _("negative counted qty {0}").format(qty)
+
+        if error:
+            rejected += 1
+            if len(errors) < IMPORT_ERROR_LIMIT:
+                errors.append(f"{line_number}: {error}")
+            continue
+
+        counts[identifier] = counts.get(identifier, 0) + flt(qty)
+
+    if positions is None:
+        frappe.throw(_("The file is empty"))
+
+    return frappe._dict(counts=counts, lines=lines, rejected=rejected, errors=errors)
+
+
+def is_number(value):
+    """Whether a cell text parses as a number (thousands separators allowed, like flt)"""
+    try:
+        return math.isfinite(float(value.replace(",", "")))
+    except ValueError:
+        return False
+
+
+def get_cell(row, position):
+    """Stripped text of a cell, empty if the row is shorter"""
+    if position is None or position >= len(row) or row[position] is None:
+        return ""
+
+    value = row[position]
+    # Spreadsheets return whole numbers as floats (barcode 1001 -> 1001.0)
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+
+    return cstr(value).strip()
@@ -1,6 +1,76 @@
 // Copyright (c) 2025, abdopcnet@gmail.com and contributors
 // For license information, please see license.txt
 
+// Above this many assets, "Get Assets" fills the table in a background job
+const BACKGROUND_POPULATE_THRESHOLD = 2000;
+
+// Rows per page of the paginated assets grid (large documents)
+const ASSET_ROWS_PAGE_LENGTH = 100;
+
+// Document totals, computed on the server for paginated documents
+const TOTAL_FIELDS = [
+	'total_system_qty',
+	'total_reconcile_qty',
+	'total_variance_qty',
+	'total_system_value',
+	'total_reconcile_value',
+	'total_variance_value',
+];
+
+// Keys requested from the scan APIs: only what a new row stores
+const SCAN_FIELDS = [
+	'asset',
+	'item_code',
+	'location',
+	'asset_category',
+	'custodian',
+	'value_after_depreciation',
+];
+
+// Keys requested by "Get Assets": the other row fields follow from system_value
+const ASSET_FETCH_FIELDS = [
+	'asset',
+	'item_code',
+	'location',
+	'asset_category',
+	'custodian',
+	'system_value',
+];
+
+// Scans arriving within this many ms are resolved with one server call
+const SCAN_BATCH_DELAY = 250;
+
+// A burst is sent right away once this many scans are waiting
+const SCAN_BATCH_SIZE = 50;
+
+/**
+ * Point in time system data is taken at: the reconciliation date and time
+ * for counts valued as of their date, empty (now) otherwise
+ */
+function get_as_of(frm) {
+	if (!frm.doc.value_as_of || !frm.doc.reconciliation_date) {
+		return '';
+	}
+	return `${frm.doc.reconciliation_date} ${frm.doc.reconciliation_time || '23:59:59'}`;
+}
+
+/**
+ * Turns a compact {fields, rows} response back into objects (null rows stay null)
+ */
+function unpack_rows(payload) {
+	const fields = payload.fields || [];
+	return (payload.rows || []).map((values) => {
+		if (!values) {
+			return null;
+		}
+		let row = {};
+		fields.forEach((field, i) => {
+			row[field] = values[i];
+		});
+		return row;
+	});
+}
+
 /**
  * Client-side form events for Asset Reconcile main document
  * Handles barcode scanning, asset fetching, and totals calculation
@@ -22,32 +92,76 @@ frappe.ui.form.on('Asset Reconcile', {
 			prompt_qty: false,
 		});
 
+		// Offline scan session: snapshot of the location and codes waiting for sync
+		frm.scan_snapshot = null;
+		frm.scan_queue = [];
+
+		// Live scan pipeline: scans waiting for the next micro-batch, and the
+		// chain batches are applied on, so results land in scan order
+		frm.scan_batch = [];
+		frm.scan_batch_timer = null;
+		frm.scan_results = Promise.resolve();
+
+		// Identifies this scanner session in the multi-counter scan log
+		frm.scan_client_id = `${frappe.session.user}::${frappe.utils.get_random(8)}`;
+
 		// Override scan_api_call to pass location parameter
+		// Scans are resolved locally against the snapshot first, and queued when offline
+		// Everything else is coalesced into micro-batches (see enqueue_scan)
 		frm.barcode_scanner.scan_api_call = function (input, callback) {
-			frappe
-				.call({
-					method: this.scan_api,
-					args: {
-						search_value: input,
-						company: this.frm.doc.company,
-						location: this.frm.doc.location,
-					},
-				})
-				.then((r) => {
-					callback(r);
-				})
-				.catch((err) => {
-					callback({ message: {} });
-				});
+			// Multi-counter: append to the scan log, the server merges it into the table
+			if (frm.doc.multi_counter && !frm.is_new()) {
+				frm.events.append_scan(frm, input);
+				return;
+			}
+
+			// Paginated table: the scan is applied to the saved rows on the server
+			if (frm.assets_paginated) {
+				frm.events.apply_paginated_scan(frm, input);
+				return;
+			}
+
+			// Resolved locally, but still applied in turn with the scans before it
+			const local_data = frm.events.lookup_scan_snapshot(frm, input);
+			if (local_data) {
+				frm.events.enqueue_scan(frm, input, local_data);
+				return;
+			}
+
+			if (frm.scan_snapshot && !navigator.onLine) {
+				frm.events.queue_scan(frm, input);
+				this.clean_up();
+				return;
+			}
+
+			frm.events.enqueue_scan(frm, input);
 		};
 
+		// Sync queued scans as soon as the connection comes back
+		$(window).on('online', () => frm.events.flush_scan_queue(frm));
+
+		// Show scans merged by other counters (or the scheduler)
+		frappe.realtime.on('asset_reconcile_scans_merged', (data) => {
+			if (data.docname !== frm.doc.name) {
+				return;
+			}
+			if (frm.is_dirty()) {
+				frappe.show_alert({
+					message: __('Scans were merged, reload to see them'),
+					indicator: 'orange',
+				});
+				return;
+			}
+			frm.reload_doc();
+		});
+
 		// Override update_table to work with Assets
 		frm.barcode_scanner.update_table = function (data) {
 			return new Promise((resolve, reject) => {
 				let cur_grid = this.frm.fields_dict[this.items_table_name].grid;
 				frappe.flags.trigger_from_barcode_scanner = true;
 
-				const { asset, asset_name, location, asset_category, item_code } = data;
+				const { asset, location, asset_category, item_code } = data;
 
 				if (!asset) {
 					this.show_alert(__('Cannot find Asset with this Barcode'), 'red');
@@ -66,16 +180,20 @@ frappe.ui.form.on('Asset Reconcile', {
 				});
 
 				// If asset exists, increment quantity
+				// Resolved once the change handlers ran, so the next scan sees the new qty
 				if (existing_row) {
-					frappe.model.set_value(
-						existing_row.doctype,
-						existing_row.name,
-						'reconcile_qty',
-						flt(existing_row.reconcile_qty || 0) + 1,
-					);
-					this.frm.trigger('calculate_totals');
-					this.play_success_sound();
-					resolve(existing_row);
+					frappe.model
+						.set_value(
+							existing_row.doctype,
+							existing_row.name,
+							'reconcile_qty',
+							flt(existing_row.reconcile_qty || 0) + 1,
+						)
+						.then(() => {
+							this.frm.trigger('calculate_totals');
+							this.play_success_sound();
+							resolve(existing_row);
+						});
 					return;
 				}
 
@@ -93,26 +211,30 @@ frappe.ui.form.on('Asset Reconcile', {
 				);
 
 				// Set values from scan API response
-				frappe.model.set_value(row.doctype, row.name, {
-					asset: asset,
-					asset_name: asset_name,
-					location: location,
-					asset_category: asset_category,
-					item_code: item_code,
-					system_qty: 1,
-					reconcile_qty: 1,
-					variance_qty: 0,
-					variance_value: 0,
-					system_value: data.value_after_depreciation || 0,
-					reconcile_value: data.value_after_depreciation || 0,
-					gross_purchase_amount: data.gross_purchase_amount || 0,
-				});
-
-				this.frm.refresh_field(this.items_table_name);
-				this.frm.trigger('calculate_totals');
-				this.play_success_sound();
-				this.clean_up();
-				resolve(row);
+				frappe.model
+					.set_value(row.doctype, row.name, {
+						asset: asset,
+						location: location,
+						asset_category: asset_category,
+						custodian: data.custodian || '',
+						item_code: item_code,
+						system_qty: 1,
+						reconcile_qty: 1,
+						variance_qty: 0,
+						variance_value: 0,
+						system_value: data.value_after_depreciation || 0,
+						reconcile_value: data.value_after_depreciation || 0,
+					})
+					.then(() => {
+						// A batch refreshes the grid once, after its last row
+						if (!this.frm.applying_scan_batch) {
+							this.frm.refresh_field(this.items_table_name);
+						}
+						this.frm.trigger('calculate_totals');
+						this.play_success_sound();
+						this.clean_up();
+						resolve(row);
+					});
 			});
 		};
 	},
@@ -141,6 +263,10 @@ frappe.ui.form.on('Asset Reconcile', {
 	 */
 	before_save(frm) {
 		frm.set_value('counted_by', frappe.session.user);
+		// Tell the server to keep the rows this form did not load
+		if (frm.assets_paginated) {
+			frm.doc.__assets_paginated = 1;
+		}
 	},
 
 	/**
@@ -164,6 +290,73 @@ frappe.ui.form.on('Asset Reconcile', {
 		}
 		frm.set_df_property('counted_by', 'read_only', 1);
 
+		// Large tables are read page by page from the server instead of rendered in full
+		frm.assets_paginated = Boolean(frm.doc.__onload && frm.doc.__onload.assets_paginated);
+		frm.toggle_display('assets', !frm.assets_paginated);
+		frm.toggle_reqd('assets', !frm.assets_paginated);
+		if (frm.assets_paginated) {
+			frm.doc.__assets_paginated = 1;
+			frm.events.render_assets_grid(frm);
+		}
+
+		// Preload the location so scans keep working on a bad connection
+		if (frm.doc.docstatus === 0 && frm.doc.company) {
+			frm.events.load_scan_snapshot(frm);
+		}
+		frm.events.toggle_scan_queue_button(frm);
+
+		// Scanner dumps from batch-mode terminals are merged on the server in one save
+		if (frm.doc.docstatus === 0 && !frm.is_new()) {
+			frm.add_custom_button(
+				__('Scanner Dump'),
+				() => frm.events.ingest_scanner_dump(frm),
+				__('Import'),
+			);
+			frm.add_custom_button(
+				__('Counts from CSV / XLSX'),
+				() => frm.events.import_counts(frm),
+				__('Import'),
+			);
+		}
+
+		// Barcodes that resolve to more than one asset make counts unreliable
+		if (frm.doc.docstatus === 0 && frm.doc.company) {
+			frm.add_custom_button(__('Check Barcodes'), () => frm.events.check_barcode_health(frm));
+		}
+
+		// Multi-counter scans are merged every few minutes, or on demand
+		if (frm.doc.docstatus === 0 && !frm.is_new() && frm.doc.multi_counter) {
+			frm.add_custom_button(__('Merge Scans'), () => frm.events.merge_scans(frm));
+		}
+
+		// Long counts: pick up assets that moved, were sold or depreciated since the last sync
+		if (
+			frm.doc.docstatus === 0 &&
+			!frm.is_new() &&
+			!frm.doc.value_as_of &&
+			(frm.assets_paginated || (frm.doc.assets || []).length)
+		) {
+			frm.add_custom_button(__('Refresh System Data'), () =>
+				frm.events.refresh_system_data(frm),
+			);
+		}
+
+		// Variance postings run in the background; failed ones can be retried
+		if (frm.doc.docstatus > 0 && frm.doc.posting_status === 'Failed') {
+			frm.add_custom_button(__('Retry Posting'), () => frm.events.retry_variance_posting(frm));
+		}
+
+		// Streaming export of the assets table (with variances) for auditors
+		if (!frm.is_new()) {
+			['CSV', 'XLSX'].forEach((file_format) => {
+				frm.add_custom_button(
+					file_format,
+					() => frm.events.export_assets(frm, file_format),
+					__('Export'),
+				);
+			});
+		}
+
 		// Style the 'get_assets' button to be green (success)
 		// This mimics the 'success' style requested
 		if (frm.fields_dict['get_assets'] && frm.fields_dict['get_assets'].$input) {
@@ -172,6 +365,821 @@ frappe.ui.form.on('Asset Reconcile', {
 		}
 	},
 
+	/**
+	 * Event handlers: Reload the scan snapshot when company or location changes
+	 */
+	company(frm) {
+		frm.events.load_scan_snapshot(frm);
+	},
+
+	location(frm) {
+		frm.events.load_scan_snapshot(frm);
+	},
+
+	include_sub_locations(frm) {
+		frm.events.load_scan_snapshot(frm);
+	},
+
+	/**
+	 * Loads the scan snapshot of the selected company and location
+	 * The snapshot is cached in localStorage and only re-downloaded when its version changes
+	 */
+	load_scan_snapshot(frm) {
+		if (!frm.doc.company) {
+			frm.scan_snapshot = null;
+			return;
+		}
+
+		const include_sub_locations = frm.doc.location && frm.doc.include_sub_locations ? 1 : 0;
+		const cache_key = `asset_reconcile_snapshot::${frm.doc.company}::${frm.doc.location || ''}::${include_sub_locations}`;
+		let cached = null;
+		try {
+			cached = JSON.parse(localStorage.getItem(cache_key) || 'null');
+		} catch (e) {
+			cached = null;
+		}
+		if (cached) {
+			frm.scan_snapshot = cached;
+		}
+
+		frappe.call({
+			method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.get_scan_snapshot',
+			args: {
+				company: frm.doc.company,
+				location: frm.doc.location || '',
+				include_sub_locations: include_sub_locations,
+				version: cached ? cached.version : '',
+			},
+			callback: function (r) {
+				if (!r.message || r.message.unchanged) {
+					return;
+				}
+				frm.scan_snapshot = r.message;
+				try {
+					localStorage.setItem(cache_key, JSON.stringify(r.message));
+				} catch (e) {
+					// Storage full: keep the snapshot in memory only
+				}
+			},
+		});
+	},
+
+	/**
+	 * Resolves a scanned value against the scan snapshot
+	 * Returns the same data as scan_asset_barcode, or null if not in the snapshot
+	 */
+	lookup_scan_snapshot(frm, input) {
+		const snapshot = frm.scan_snapshot;
+		// The snapshot holds current values, backdated counts are valued on the server
+		if (
+			!snapshot ||
+			frm.doc.value_as_of ||
+			snapshot.company !== frm.doc.company ||
+			snapshot.location !== (frm.doc.location || '') ||
+			snapshot.include_sub_locations !== (frm.doc.location && frm.doc.include_sub_locations ? 1 : 0)
+		) {
+			return null;
+		}
+
+		const index = snapshot.codes[String(input).trimEnd().toLowerCase()];
+		if (index === undefined) {
+			return null;
+		}
+
+		let data = {};
+		snapshot.fields.forEach((field, i) => {
+			data[field] = snapshot.assets[index][i];
+		});
+		return data;
+	},
+
+	/**
+	 * Adds a live scan to the next micro-batch
+	 * The batch is sent after SCAN_BATCH_DELAY ms, or at once when it reaches SCAN_BATCH_SIZE
+	 */
+	enqueue_scan(frm, input, data) {
+		frm.scan_batch.push({ input: input, data: data || null });
+		frm.barcode_scanner.clean_up();
+
+		if (frm.scan_batch.length >= SCAN_BATCH_SIZE) {
+			frm.events.send_scan_batch(frm);
+		} else if (!frm.scan_batch_timer) {
+			frm.scan_batch_timer = setTimeout(
+				() => frm.events.send_scan_batch(frm),
+				SCAN_BATCH_DELAY,
+			);
+		}
+	},
+
+	/**
+	 * Resolves the waiting scans with one scan_asset_barcodes call
+	 * Calls of consecutive batches may overlap, but their results are applied
+	 * one batch after the other, in scan order
+	 */
+	send_scan_batch(frm) {
+		clearTimeout(frm.scan_batch_timer);
+		frm.scan_batch_timer = null;
+
+		const batch = frm.scan_batch.splice(0);
+		if (!batch.length) {
+			return;
+		}
+
+		// Scans resolved against the snapshot need no server call
+		const pending = batch.filter((scan) => !scan.data);
+		const request = pending.length
+			? frappe
+					.call({
+						method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.scan_asset_barcodes',
+						args: {
+							search_values: pending.map((scan) => scan.input),
+							company: frm.doc.company,
+							location: frm.doc.location || '',
+							include_sub_locations: frm.doc.include_sub_locations,
+							fields: SCAN_FIELDS,
+							compact: 1,
+							as_of: get_as_of(frm),
+						},
+					})
+					.then((r) => unpack_rows(r.message || {}))
+			: Promise.resolve([]);
+
+		frm.scan_results = frm.scan_results
+			.then(() =>
+				request.then(
+					(results) => {
+						pending.forEach((scan, i) => {
+							scan.data = results[i];
+						});
+						return batch;
+					},
+					() => {
+						// Keep the scans for later instead of losing them when the network drops
+						pending.forEach((scan) => frm.events.queue_scan(frm, scan.input));
+						return batch.filter((scan) => scan.data);
+					},
+				),
+			)
+			.then((scans) => frm.events.apply_scan_results(frm, scans))
+			.then((not_found) => {
+				if (not_found.length) {
+					frm.barcode_scanner.show_alert(
+						__('Cannot find Asset with this Barcode: {0}', [not_found.join(', ')]),
+						'red',
+					);
+					frm.barcode_scanner.play_fail_sound();
+				}
+			})
+			.catch((err) => {
+				// Never block the batches after this one
+				console.error(err);
+			});
+	},
+
+	/**
+	 * Applies resolved scans to the table one at a time, in order
+	 * Repeated codes increment the same row; the grid and the totals are
+	 * refreshed once for the whole batch
+	 *
+	 * @returns {Promise<string[]>} Codes that did not match an asset
+	 */
+	async apply_scan_results(frm, scans) {
+		const not_found = [];
+
+		frm.applying_scan_batch = true;
+		try {
+			for (const scan of scans) {
+				if (scan.data && scan.data.asset) {
+					await frm.barcode_scanner.update_table(scan.data);
+				} else {
+					not_found.push(scan.input);
+				}
+			}
+		} finally {
+			frm.applying_scan_batch = false;
+		}
+
+		frm.refresh_field('assets');
+		frm.trigger('calculate_totals');
+		return not_found;
+	},
+
+	/**
+	 * Lists ambiguous barcodes of the company: which asset a scan returns is then a guess
+	 */
+	check_barcode_health(frm) {
+		frappe
+			.call({
+				method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.check_barcode_health',
+				args: { company: frm.doc.company },
+				freeze: true,
+				freeze_message: __('Checking barcodes...'),
+			})
+			.then((r) => {
+				const rows = r.message || [];
+				if (!rows.length) {
+					frappe.show_alert({ message: __('No ambiguous barcodes'), indicator: 'green' });
+					return;
+				}
+
+				frappe.msgprint({
+					title: __('{0} ambiguous barcodes', [rows.length]),
+					message: rows
+						.map(
+							(row) =>
+								`<b>${frappe.utils.escape_html(row.barcode)}</b>: ${frappe.utils.escape_html(
+									row.reason,
+								)} (${row.assets.map(frappe.utils.escape_html).join(', ')})`,
+						)
+						.join('<br>'),
+					indicator: 'orange',
+				});
+			});
+	},
+
+	/**
+	 * Queues a scan that could not be resolved while offline
+	 */
+	queue_scan(frm, input) {
+		frm.scan_queue.push(input);
+		frm.barcode_scanner.show_alert(
+			__('{0} queued, will be checked when back online', [input]),
+			'orange',
+		);
+		frm.events.toggle_scan_queue_button(frm);
+	},
+
+	/**
+	 * Appends a scan to the multi-counter scan log
+	 * Queued for later when the call fails (offline)
+	 */
+	append_scan(frm, input) {
+		const scanner = frm.barcode_scanner;
+		frappe
+			.call({
+				method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.append_scans',
+				args: {
+					docname: frm.doc.name,
+					barcodes: [input],
+					client_id: frm.scan_client_id,
+				},
+			})
+			.then(() => {
+				scanner.show_alert(__('{0} recorded', [input]), 'green');
+				scanner.play_success_sound();
+				scanner.clean_up();
+			})
+			.catch(() => {
+				frm.events.queue_scan(frm, input);
+				scanner.clean_up();
+			});
+	},
+
+	/**
+	 * Applies a scan to a paginated document on the server
+	 * Updates the totals shown in the form and reloads the current page
+	 */
+	apply_paginated_scan(frm, input) {
+		const scanner = frm.barcode_scanner;
+		frappe
+			.call({
+				method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.apply_scan',
+				args: { docname: frm.doc.name, search_value: input },
+			})
+			.then((r) => {
+				if (!r.message || !r.message.row) {
+					scanner.show_alert(__('Cannot find Asset with this Barcode'), 'red');
+					scanner.play_fail_sound();
+					scanner.clean_up();
+					return;
+				}
+				frm.events.set_server_totals(frm, r.message.totals);
+				scanner.show_alert(
+					r.message.action === 'out_of_location'
+						? __('{0} is outside this location, added as a flagged row', [r.message.row.asset])
+						: __('{0} counted', [r.message.row.asset]),
+					r.message.action === 'out_of_location' ? 'orange' : 'green',
+				);
+				scanner.play_success_sound();
+				scanner.clean_up();
+				frm.events.load_assets_page(frm);
+			})
+			.catch(() => {
+				frm.events.queue_scan(frm, input);
+				scanner.clean_up();
+			});
+	},
+
+	/**
+	 * Shows totals computed on the server without marking the form dirty
+	 */
+	set_server_totals(frm, totals) {
+		TOTAL_FIELDS.forEach((fieldname) => {
+			frm.doc[fieldname] = totals[fieldname];
+		});
+		frm.refresh_fields(TOTAL_FIELDS);
+	},
+
+	/**
+	 * Builds the paginated assets grid: filters, one page of rows and a pager
+	 */
+	render_assets_grid(frm) {
+		const $wrapper = frm.fields_dict.assets_html.$wrapper;
+		frm.assets_grid = frm.assets_grid || {
+			start: 0,
+			filters: {},
+		};
+
+		$wrapper.html(`
+			<div class="asset-rows-filters row">
+				<div class="col-sm-3 filter-variance"></div>
+				<div class="col-sm-3 filter-asset-category"></div>
+				<div class="col-sm-3 filter-asset-status"></div>
+				<div class="col-sm-3 filter-search"></div>
+			</div>
+			<div class="asset-rows-table table-responsive"></div>
+			<div class="asset-rows-pager text-right">
+				<span class="asset-rows-count text-muted small"></span>
+				<button class="btn btn-default btn-xs asset-rows-prev">${__('Previous')}</button>
+				<button class="btn btn-default btn-xs asset-rows-next">${__('Next')}</button>
+			</div>
+		`);
+
+		const make_filter = (selector, df) => {
+			const control = frappe.ui.form.make_control({
+				parent: $wrapper.find(selector),
+				df: {
+					...df,
+					change() {
+						frm.assets_grid.filters[df.fieldname] = control.get_value();
+						frm.assets_grid.start = 0;
+						frm.events.load_assets_page(frm);
+					},
+				},
+				render_input: true,
+			});
+			control.set_value(frm.assets_grid.filters[df.fieldname] || '');
+		};
+		make_filter('.filter-variance', {
+			fieldname: 'variance',
+			fieldtype: 'Select',
+			label: __('Variance'),
+			options: ['', 'Matched', 'Missing', 'Surplus'],
+		});
+		make_filter('.filter-asset-category', {
+			fieldname: 'asset_category',
+			fieldtype: 'Link',
+			label: __('Asset Category'),
+			options: 'Asset Category',
+		});
+		make_filter('.filter-asset-status', {
+			fieldname: 'asset_status',
+			fieldtype: 'Select',
+			label: __('Asset Status'),
+			options: [
+				'',
+				'Submitted',
+				'Partially Depreciated',
+				'Fully Depreciated',
+				'In Maintenance',
+				'Out of Order',
+				'Sold',
+				'Scrapped',
+			],
+		});
+		make_filter('.filter-search', {
+			fieldname: 'search',
+			fieldtype: 'Data',
+			label: __('Search'),
+		});
+
+		$wrapper.find('.asset-rows-prev').on('click', () => {
+			frm.assets_grid.start = Math.max(0, frm.assets_grid.start - ASSET_ROWS_PAGE_LENGTH);
+			frm.events.load_assets_page(frm);
+		});
+		$wrapper.find('.asset-rows-next').on('click', () => {
+			frm.assets_grid.start += ASSET_ROWS_PAGE_LENGTH;
+			frm.events.load_assets_page(frm);
+		});
+
+		frm.events.load_assets_page(frm);
+	},
+
+	/**
+	 * Loads and renders the current page of the paginated assets grid
+	 */
+	load_assets_page(frm) {
+		const $wrapper = frm.fields_dict.assets_html.$wrapper;
+		frappe.call({
+			method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.get_asset_rows',
+			args: {
+				docname: frm.doc.name,
+				start: frm.assets_grid.start,
+				page_length: ASSET_ROWS_PAGE_LENGTH,
+				filters: frm.assets_grid.filters,
+			},
+			callback: function (r) {
+				if (!r.message) {
+					return;
+				}
+				const { rows, total_rows } = r.message;
+				const currency = frappe.get_doc(':Company', frm.doc.company)?.default_currency;
+				const columns = [
+					['idx', __('No.')],
+					['asset', __('Asset')],
+					['asset_name', __('Asset Name')],
+					['asset_category', __('Asset Category')],
+					['location', __('Location')],
+					['system_qty', __('System Qty')],
+					['reconcile_qty', __('Reconcile Qty')],
+					['variance_qty', __('Variance Qty')],
+					['system_value', __('System Value')],
+					['variance_value', __('Variance Value')],
+					['notes', __('Notes')],
+				];
+				const format = (row, fieldname) =>
+					fieldname.endsWith('_value')
+						? format_currency(row[fieldname], currency)
+						: frappe.utils.escape_html(String(row[fieldname] ?? ''));
+
+				$wrapper.find('.asset-rows-table').html(`
+					<table class="table table-bordered table-hover table-sm">
+						<thead><tr>${columns.map(([, label]) => `<th>${label}</th>`).join('')}</tr></thead>
+						<tbody>
+							${rows
+								.map(
+									(row, i) => `
+								<tr data-index="${i}" class="${flt(row.variance_qty) ? 'text-danger' : ''}" style="cursor: pointer">
+									${columns.map(([fieldname]) => `<td>${format(row, fieldname)}</td>`).join('')}
+								</tr>`,
+								)
+								.join('')}
+						</tbody>
+					</table>
+				`);
+				$wrapper.find('tbody tr').on('click', function () {
+					frm.events.edit_asset_row(frm, rows[$(this).data('index')]);
+				});
+
+				const end = Math.min(frm.assets_grid.start + rows.length, total_rows);
+				$wrapper
+					.find('.asset-rows-count')
+					.text(
+						__('{0} to {1} of {2}', [
+							total_rows ? frm.assets_grid.start + 1 : 0,
+							end,
+							total_rows,
+						]),
+					);
+				$wrapper.find('.asset-rows-prev').prop('disabled', frm.assets_grid.start <= 0);
+				$wrapper.find('.asset-rows-next').prop('disabled', end >= total_rows);
+			},
+		});
+	},
+
+	/**
+	 * Edits the counted quantity and notes of one row of a paginated document
+	 */
+	edit_asset_row(frm, row) {
+		if (frm.doc.docstatus !== 0) {
+			return;
+		}
+		const dialog = new frappe.ui.Dialog({
+			title: __('Row {0}: {1}', [row.idx, row.asset]),
+			fields: [
+				{
+					fieldname: 'reconcile_qty',
+					fieldtype: 'Int',
+					label: __('Reconcile Qty'),
+					default: row.reconcile_qty,
+				},
+				{
+					fieldname: 'notes',
+					fieldtype: 'Small Text',
+					label: __('Notes'),
+					default: row.notes,
+				},
+			],
+			primary_action_label: __('Update'),
+			primary_action(values) {
+				frappe.call({
+					method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.update_asset_row',
+					args: {
+						docname: frm.doc.name,
+						row_name: row.name,
+						reconcile_qty: values.reconcile_qty,
+						notes: values.notes || '',
+					},
+					callback: function (r) {
+						if (r.message) {
+							frm.events.set_server_totals(frm, r.message.totals);
+							frm.events.load_assets_page(frm);
+						}
+						dialog.hide();
+					},
+				});
+			},
+		});
+		dialog.show();
+	},
+
+	/**
+	 * Merges the multi-counter scan log into the assets table
+	 */
+	merge_scans(frm) {
+		const merge = () =>
+			frappe.call({
+				method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.merge_scans',
+				args: { docname: frm.doc.name },
+				freeze: true,
+				freeze_message: __('Merging Scans...'),
+				callback: function (r) {
+					if (!r.message) {
+						frappe.show_alert({ message: __('No scans to merge'), indicator: 'blue' });
+						return;
+					}
+					frm.reload_doc();
+				},
+			});
+
+		// Save local edits first, the merge saves the document on the server
+		if (frm.is_dirty()) {
+			frm.save().then(merge);
+		} else {
+			merge();
+		}
+	},
+
+	/**
+	 * Shows the sync button while there are queued scans
+	 */
+	toggle_scan_queue_button(frm) {
+		frm.remove_custom_button(__('Sync Queued Scans'));
+		if ((frm.scan_queue || []).length) {
+			frm.add_custom_button(__('Sync Queued Scans'), () =>
+				frm.events.flush_scan_queue(frm),
+			);
+		}
+	},
+
+	/**
+	 * Resolves all queued scans in one server call and applies them in scan order
+	 */
+	flush_scan_queue(frm) {
+		if (!frm.scan_queue || !frm.scan_queue.length) {
+			return;
+		}
+
+		const queued = frm.scan_queue.splice(0);
+		frm.events.toggle_scan_queue_button(frm);
+
+		// Multi-counter: the whole queue goes to the scan log in one call
+		if (frm.doc.multi_counter && !frm.is_new()) {
+			frappe
+				.call({
+					method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.append_scans',
+					args: {
+						docname: frm.doc.name,
+						barcodes: queued,
+						client_id: frm.scan_client_id,
+					},
+				})
+				.then((r) => {
+					frappe.show_alert({
+						message: __('{0} queued scans recorded', [r.message.appended]),
+						indicator: 'green',
+					});
+				})
+				.catch(() => {
+					frm.scan_queue = queued.concat(frm.scan_queue);
+					frm.events.toggle_scan_queue_button(frm);
+				});
+			return;
+		}
+
+		frappe
+			.call({
+				method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.scan_asset_barcodes',
+				args: {
+					search_values: queued,
+					company: frm.doc.company,
+					location: frm.doc.location || '',
+					include_sub_locations: frm.doc.include_sub_locations,
+					fields: SCAN_FIELDS,
+					compact: 1,
+					as_of: get_as_of(frm),
+				},
+			})
+			.then(async (r) => {
+				const results = unpack_rows(r.message || {});
+
+				// Applied after the live batches already in progress
+				const not_found = await (frm.scan_results = frm.scan_results.then(() =>
+					frm.events.apply_scan_results(
+						frm,
+						queued.map((input, i) => ({ input: input, data: results[i] })),
+					),
+				));
+
+				if (not_found.length) {
+					frappe.msgprint({
+						title: __('Scans not found'),
+						message: not_found.join('<br>'),
+						indicator: 'red',
+					});
+				}
+			})
+			.catch(() => {
+				// Still offline: put the scans back in front of the queue
+				frm.scan_queue = queued.concat(frm.scan_queue);
+				frm.events.toggle_scan_queue_button(frm);
+			});
+	},
+
+	/**
+	 * Refreshes system quantities and values from the assets changed since the last sync
+	 * Counted quantities are kept
+	 */
+	refresh_system_data(frm) {
+		const refresh = () =>
+			frappe.call({
+				method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.refresh_system_data',
+				args: { docname: frm.doc.name },
+				freeze: true,
+				freeze_message: __('Refreshing System Data...'),
+				callback: function (r) {
+					if (!r.message) {
+						return;
+					}
+					frm.reload_doc();
+					frappe.show_alert({
+						message: __(
+							'{0} assets changed: {1} rows updated, {2} added, {3} removed',
+							[r.message.checked, r.message.updated, r.message.added, r.message.removed],
+						),
+						indicator: 'green',
+					});
+				},
+			});
+
+		// The refresh works on the saved rows
+		if (frm.is_dirty()) {
+			frm.save().then(refresh);
+		} else {
+			refresh();
+		}
+	},
+
+	/**
+	 * Queues the failed variance posting (or reversal) again
+	 * Rows that were already posted are skipped on the server
+	 */
+	retry_variance_posting(frm) {
+		frappe.call({
+			method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.retry_variance_posting',
+			args: { docname: frm.doc.name },
+			freeze: true,
+			callback: function () {
+				frm.reload_doc();
+				frappe.show_alert({ message: __('Posting queued'), indicator: 'blue' });
+			},
+		});
+	},
+
+	/**
+	 * Exports the assets table on the server and downloads the file
+	 */
+	export_assets(frm, file_format) {
+		frappe.call({
+			method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.export_asset_reconcile',
+			args: {
+				docname: frm.doc.name,
+				file_format: file_format,
+			},
+			freeze: true,
+			freeze_message: __('Exporting...'),
+			callback: function (r) {
+				if (r.message) {
+					window.open(r.message);
+					frm.reload_doc();
+				}
+			},
+		});
+	},
+
+	/**
+	 * Asks for a scanner dump (one barcode per line) and ingests it on the server
+	 */
+	ingest_scanner_dump(frm) {
+		frappe.prompt(
+			[
+				{
+					fieldname: 'barcodes',
+					fieldtype: 'Code',
+					label: __('Barcodes'),
+					description: __('One barcode per line'),
+					reqd: 1,
+				},
+			],
+			(values) => {
+				frappe.call({
+					method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.ingest_scans',
+					args: {
+						docname: frm.doc.name,
+						barcodes: values.barcodes,
+					},
+					freeze: true,
+					freeze_message: __('Ingesting Scans...'),
+					callback: function (r) {
+						if (!r.message) {
+							return;
+						}
+						frm.reload_doc();
+						frappe.msgprint(
+							__(
+								'{0} scans ingested: {1} rows added, {2} rows updated, {3} outside location, {4} not found',
+								[
+									r.message.scans,
+									r.message.added,
+									r.message.updated,
+									r.message.out_of_location.length,
+									r.message.not_found.length,
+								],
+							),
+						);
+					},
+				});
+			},
+			__('Import Scanner Dump'),
+			__('Import'),
+		);
+	},
+
+	/**
+	 * Imports counted quantities from a spreadsheet (Asset or Barcode, Counted Qty)
+	 * The file is streamed and merged on the server with one save
+	 */
+	import_counts(frm) {
+		frappe.prompt(
+			[
+				{
+					fieldname: 'file_url',
+					fieldtype: 'Attach',
+					label: __('Counts File'),
+					description: __(
+						'CSV or XLSX with a Counted Qty column and an Asset or Barcode column',
+					),
+					reqd: 1,
+				},
+			],
+			(values) => {
+				const import_counts = () =>
+					frappe.call({
+						method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.import_counts',
+						args: {
+							docname: frm.doc.name,
+							file_url: values.file_url,
+						},
+						freeze: true,
+						freeze_message: __('Importing Counts...'),
+						callback: function (r) {
+							if (!r.message) {
+								return;
+							}
+							frm.reload_doc();
+							let message = __(
+								'{0} lines imported: {1} rows added, {2} rows updated, {3} outside location, {4} not found, {5} rejected',
+								[
+									r.message.lines,
+									r.message.added,
+									r.message.updated,
+									r.message.out_of_location.length,
+									r.message.not_found_count,
+									r.message.rejected,
+								],
+							);
+							const unmatched = r.message.not_found.concat(r.message.errors);
+							if (unmatched.length) {
+								message +=
+									'<br><br>' +
+									unmatched.map((value) => frappe.utils.escape_html(value)).join('<br>');
+							}
+							frappe.msgprint(message);
+						},
+					});
+
+				// The counts are merged into the saved rows
+				if (frm.is_dirty()) {
+					frm.save().then(import_counts);
+				} else {
+					import_counts();
+				}
+			},
+			__('Import Counts'),
+			__('Import'),
+		);
+	},
+
 	/**
 	 * Event handler for the 'Get Assets' button
 	 * Triggers the asset fetching logic
@@ -202,35 +1210,122 @@ frappe.ui.form.on('Asset Reconcile', {
 			return;
 		}
 
+		// Cycle count: only the drawn sample goes into the table
+		if (frm.doc.cycle_count) {
+			frm.events.fetch_cycle_count_sample(frm);
+			return;
+		}
+
+		// A paginated table is never built in the browser
+		if (frm.assets_paginated) {
+			frm.events.populate_assets_in_background(frm, 0);
+			return;
+		}
+
+		// Large locations are filled on the server so the browser doesn't build every row
+		frappe.db
+			.count('Asset', {
+				filters: {
+					docstatus: 1,
+					company: frm.doc.company,
+					...(frm.doc.location
+						? {
+								location: frm.doc.include_sub_locations
+									? ['descendants of (inclusive)', frm.doc.location]
+									: frm.doc.location,
+							}
+						: {}),
+					status: ['not in', ['Sold', 'Scrapped', 'Capitalized']],
+				},
+			})
+			.then((count) => {
+				if (count > BACKGROUND_POPULATE_THRESHOLD) {
+					frm.events.populate_assets_in_background(frm, count);
+				} else {
+					frm.events.fetch_assets_into_form(frm);
+				}
+			});
+	},
+
+	/**
+	 * Enqueues the server-side populate job and follows its progress
+	 * Opens the finished document when the job is done
+	 */
+	populate_assets_in_background(frm, count) {
+		frappe.call({
+			method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.populate_assets',
+			args: frm.is_new()
+				? {
+						company: frm.doc.company,
+						location: frm.doc.location || '',
+						include_sub_locations: frm.doc.include_sub_locations,
+					}
+				: { docname: frm.doc.name },
+			freeze: true,
+			freeze_message: __('Queuing Asset Fetch...'),
+			callback: function (r) {
+				if (!r.message) {
+					return;
+				}
+				const docname = r.message;
+				const on_progress = (data) => {
+					if (data.docname !== docname) {
+						return;
+					}
+					if (data.failed) {
+						frappe.hide_progress();
+						frappe.realtime.off('asset_reconcile_populate', on_progress);
+						frappe.msgprint(__('Fetching assets failed, please check the Error Log'));
+						return;
+					}
+					frappe.show_progress(
+						__('Fetching Assets'),
+						data.progress,
+						data.total,
+						__('{0} of {1} assets', [data.progress, data.total]),
+					);
+					if (data.done) {
+						frappe.hide_progress();
+						frappe.realtime.off('asset_reconcile_populate', on_progress);
+						frappe.show_alert({
+							message: __('Fetched {0} assets', [data.progress]),
+							indicator: 'green',
+						});
+						if (frm.is_new()) {
+							frappe.set_route('Form', 'Asset Reconcile', docname);
+						} else {
+							frm.reload_doc();
+						}
+					}
+				};
+				frappe.realtime.on('asset_reconcile_populate', on_progress);
+				frappe.show_progress(__('Fetching Assets'), 0, count, __('Queued'));
+			},
+		});
+	},
+
+	/**
+	 * Fetches assets and builds the rows in the form (small locations)
+	 */
+	fetch_assets_into_form(frm) {
 		frappe.call({
 			method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.get_assets_by_filters',
 			args: {
 				company: frm.doc.company,
 				location: frm.doc.location || '',
+				include_sub_locations: frm.doc.include_sub_locations,
+				fields: ASSET_FETCH_FIELDS,
+				compact: 1,
+				as_of: get_as_of(frm),
 			},
 			freeze: true,
 			freeze_message: __('Fetching Assets...'),
 			callback: function (r) {
-				if (r.message && r.message.length) {
-					// Add rows for each asset
-					frm.clear_table('assets');
-
-					// Python now returns the exact fields needed for the child table
-					// We use direct assignment to avoid triggering field change events (event storm)
-					// This is the most efficient, standard standard way for bulk loading
-					r.message.forEach(function (row_data) {
-						let row = frappe.model.add_child(
-							frm.doc,
-							'Asset Reconcile Item',
-							'assets',
-						);
-						Object.assign(row, row_data);
-					});
-
-					frm.refresh_field('assets');
-					frm.trigger('calculate_totals');
+				const rows = r.message ? unpack_rows(r.message) : [];
+				if (rows.length) {
+					frm.events.set_asset_rows(frm, rows, r.message.synced_on);
 					frappe.show_alert({
-						message: __('Fetched {0} assets', [r.message.length]),
+						message: __('Fetched {0} assets', [rows.length]),
 						indicator: 'green',
 					});
 				} else {
@@ -240,11 +1335,96 @@ frappe.ui.form.on('Asset Reconcile', {
 		});
 	},
 
+	/**
+	 * Draws the cycle count sample and fills the assets and strata tables
+	 * The seed of an earlier draw is sent back, so the same assets are drawn again
+	 */
+	fetch_cycle_count_sample(frm) {
+		frappe.call({
+			method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.get_cycle_count_sample',
+			args: {
+				company: frm.doc.company,
+				location: frm.doc.location || '',
+				include_sub_locations: frm.doc.include_sub_locations,
+				sample_size: frm.doc.sample_size,
+				seed: frm.doc.sample_seed || '',
+				fields: [...ASSET_FETCH_FIELDS, 'stratum'],
+				compact: 1,
+				as_of: get_as_of(frm),
+			},
+			freeze: true,
+			freeze_message: __('Drawing Sample...'),
+			callback: function (r) {
+				const sample = r.message || {};
+				const rows = sample.rows ? unpack_rows(sample.rows) : [];
+				if (!rows.length) {
+					frappe.msgprint(__('No assets found'));
+					return;
+				}
+
+				frm.events.set_asset_rows(frm, rows, sample.synced_on);
+
+				frm.clear_table('strata');
+				(sample.strata || []).forEach((stratum) => {
+					Object.assign(
+						frappe.model.add_child(frm.doc, 'Asset Reconcile Stratum', 'strata'),
+						stratum,
+					);
+				});
+				frm.refresh_field('strata');
+
+				frm.set_value({
+					sample_seed: sample.seed,
+					population_count: sample.population_count,
+					population_value: sample.population_value,
+				});
+				frappe.show_alert({
+					message: __('Drew {0} of {1} assets', [rows.length, sample.population_count]),
+					indicator: 'green',
+				});
+			},
+		});
+	},
+
+	/**
+	 * Replaces the assets table with fetched rows, all counted as present
+	 * synced_on is the server time taken before the rows were read
+	 */
+	set_asset_rows(frm, rows, synced_on) {
+		// Add rows for each asset
+		frm.clear_table('assets');
+
+		// Python returns only the stored fields that differ per asset (compact body)
+		// We use direct assignment to avoid triggering field change events (event storm)
+		// This is the most efficient, standard standard way for bulk loading
+		rows.forEach(function (row_data) {
+			let row = frappe.model.add_child(frm.doc, 'Asset Reconcile Item', 'assets');
+			Object.assign(row, row_data, {
+				system_qty: 1,
+				reconcile_qty: 1,
+				reconcile_value: row_data.system_value,
+				variance_qty: 0,
+				variance_value: 0,
+			});
+		});
+
+		frm.refresh_field('assets');
+		frm.trigger('calculate_totals');
+		// Watermark for Refresh System Data, from the server clock
+		frm.set_value('last_synced_on', synced_on);
+	},
+
 	/**
 	 * Calculates totals for system value, reconcile value, and variance
 	 * Sums up values from all rows in the assets table
 	 */
 	calculate_totals(frm) {
+		// Paginated documents show the totals computed on the server
+		// A scan batch computes them once, after its last scan
+		if (frm.assets_paginated || frm.applying_scan_batch) {
+			return;
+		}
+
 		let total_system_value = 0;
 		let total_reconcile_value = 0;
 		let total_system_qty = 0;
@@ -259,17 +1439,79 @@ frappe.ui.form.on('Asset Reconcile', {
 			total_reconcile_qty += flt(row.reconcile_qty || 0);
 		});
 
-		// Update total fields
-		frm.set_value('total_system_value', total_system_value);
-		frm.set_value('total_reconcile_value', total_reconcile_value);
-		frm.set_value('total_variance_value', total_reconcile_value - total_system_value);
-
-		frm.set_value('total_system_qty', total_system_qty);
-		frm.set_value('total_reconcile_qty', total_reconcile_qty);
-		frm.set_value('total_variance_qty', total_reconcile_qty - total_system_qty);
+		// Update total fields in one call
+		frm.set_value({
+			total_system_value: total_system_value,
+			total_reconcile_value: total_reconcile_value,
+			total_variance_value: total_reconcile_value - total_system_value,
+			total_system_qty: total_system_qty,
+			total_reconcile_qty: total_reconcile_qty,
+			total_variance_qty: total_reconcile_qty - total_system_qty,
+		});
 	},
 });
 
+// Wait this long (ms) for more changed rows before fetching their system data
+const SYSTEM_DATA_BATCH_DELAY = 100;
+
+/**
+ * Fetches system data for all queued rows with a single get_system_data_bulk call
+ * Automatically fills reconcile fields with system values (no variance initially)
+ */
+function flush_system_data(frm, cdt) {
+	const cdns = Array.from(frm.system_data_queue || []).filter((cdn) => locals[cdt][cdn]);
+	frm.system_data_queue = new Set();
+	if (!cdns.length) {
+		return;
+	}
+
+	const rows = cdns.map((cdn) => {
+		const row = locals[cdt][cdn];
+		return {
+			asset: row.asset || '',
+			item_code: row.item_code || '',
+			location: row.location || '',
+		};
+	});
+
+	frappe.call({
+		method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.get_system_data_bulk',
+		args: {
+			rows: rows,
+			company: frm.doc.company || '',
+		},
+		callback: function (r) {
+			let updated = false;
+			(r.message || []).forEach((data, i) => {
+				if (!locals[cdt][cdns[i]] || !(data.quantity > 0 || data.value > 0)) {
+					// Asset not found or no value in system: leave the row as is
+					return;
+				}
+				let system_qty_val = data.quantity || 0;
+				let system_val = data.value || 0;
+
+				// Update all fields: system fields and reconcile fields with same values
+				// This ensures no variance initially (reconcile matches system)
+				frappe.model.set_value(cdt, cdns[i], {
+					system_qty: system_qty_val,
+					system_value: system_val,
+					asset_category: data.asset_category || '',
+					reconcile_qty: system_qty_val, // Set reconcile_qty = system_qty
+					reconcile_value: system_val, // Set reconcile_value = system_value
+					variance_qty: 0, // No variance initially
+					variance_value: 0, // No variance initially
+				});
+				updated = true;
+			});
+
+			// Trigger totals calculation in parent form once for the batch
+			if (updated && frm.doctype === 'Asset Reconcile') {
+				frm.trigger('calculate_totals');
+			}
+		},
+	});
+}
+
 /**
  * Client-side form events for Asset Reconcile Item child table
  * Handles automatic data fetching when fields change in parent form context
@@ -312,7 +1554,7 @@ frappe.ui.form.on('Asset Reconcile Item', {
 	/**
 	 * Fetches system data (quantity and value) from Asset records
 	 * Based on asset, item_code, location, and company filters
-	 * Automatically fills reconcile fields with system values (no variance initially)
+	 * Rows are queued and fetched in batches (see flush_system_data)
 	 */
 	fetch_system_data(frm, cdt, cdn) {
 		let row = locals[cdt][cdn];
@@ -331,42 +1573,11 @@ frappe.ui.form.on('Asset Reconcile Item', {
 			return;
 		}
 
-		frappe.call({
-			method: 'asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.get_system_data',
-			args: {
-				asset: row.asset || '',
-				item_code: row.item_code || '',
-				location: row.location || '',
-				company: frm.doc.company || '',
-			},
-			callback: function (r) {
-				if (r.message && (r.message.quantity > 0 || r.message.value > 0)) {
-					let system_qty_val = r.message.quantity || 0;
-					let system_val = r.message.value || 0;
-
-					// Update all fields: system fields and reconcile fields with same values
-					// This ensures no variance initially (reconcile matches system)
-					frappe.model.set_value(cdt, cdn, {
-						system_qty: system_qty_val,
-						system_value: system_val,
-						asset_category: r.message.asset_category || '',
-						reconcile_qty: system_qty_val, // Set reconcile_qty = system_qty
-						reconcile_value: system_val, // Set reconcile_value = system_value
-						variance_qty: 0, // No variance initially
-						variance_value: 0, // No variance initially
-					});
-
-					// Trigger totals calculation in parent form
-					if (frm.doctype === 'Asset Reconcile') {
-						frm.trigger('calculate_totals');
-					}
-				} else {
-					// Asset not found or no value in system?
-					// Leave as is or warn? Default to 0?
-					// If we picked an Asset that has no value, it might be 0.
-				}
-			},
-		});
+		// Rows changed together (paste, import) are answered by one bulk call
+		frm.system_data_queue = frm.system_data_queue || new Set();
+		frm.system_data_queue.add(cdn);
+		clearTimeout(frm.system_data_timer);
+		frm.system_data_timer = setTimeout(() => flush_system_data(frm, cdt), SYSTEM_DATA_BATCH_DELAY);
 	},
 
 	/**
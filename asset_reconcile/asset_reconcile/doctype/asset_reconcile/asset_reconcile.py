@@ -1,10 +1,126 @@
 # Copyright (c) 2025, abdopcnet@gmail.com and contributors
 # For license information, please see license.txt
 
+from collections import Counter
+
 import frappe
 from frappe import _
+from frappe.model import no_value_fields
 from frappe.model.document import Document
-from frappe.utils import flt
+from frappe.utils import cint, cstr, flt, get_datetime, now
+
+from asset_reconcile.asset_reconcile.barcode import (
+    build_scan_snapshot,
+    get_ambiguous_barcodes,
+    get_scan_snapshot_version,
+    resolve_barcode,
+    resolve_barcodes,
+)
+from asset_reconcile.asset_reconcile.count_import import IMPORT_ERROR_LIMIT, read_count_file
+from asset_reconcile.asset_reconcile.doctype.asset_reconcile_anomaly.asset_reconcile_anomaly import (
+    update_anomaly_scores,
+    update_anomaly_statistics,
+)
+from asset_reconcile.asset_reconcile.doctype.asset_reconcile_summary.asset_reconcile_summary import (
+    update_reconcile_summary,
+)
+from asset_reconcile.asset_reconcile.export import write_export_file
+from asset_reconcile.asset_reconcile.location import (
+    get_descendant_locations,
+    get_location_filter,
+    is_in_location,
+)
+from asset_reconcile.asset_reconcile.perf import instrument, perf_stage
+from asset_reconcile.asset_reconcile.point_in_time import (
+    apply_asset_timelines,
+    get_as_of_datetime,
+    get_asset_records_as_of,
+)
+from asset_reconcile.asset_reconcile.posting import enqueue_variance_posting, has_postings
+from asset_reconcile.asset_reconcile.sampling import (
+    build_cycle_count_sample,
+    estimate_population_variance,
+    get_sample_seed,
+)
+from asset_reconcile.asset_reconcile.valuation import (
+    VALUATION_CHUNK_SIZE,
+    get_values_after_depreciation,
+)
+
+# Asset fields needed to build Asset Reconcile Item rows (see make_reconcile_rows)
+ASSET_FETCH_FIELDS = [
+    "name",
+    "asset_name",
+    "location",
+    "custodian",
+    "status",
+    "asset_category",
+    "department",
+    "cost_center",
+    "item_code",
+    "gross_purchase_amount",
+    "value_after_depreciation",
+    "calculate_depreciation",
+    "company",
+]
+
+# Asset Reconcile Item fields written by the background populate job
+POPULATE_ROW_FIELDS = [
+    "asset",
+    "item_code",
+    "location",
+    "asset_category",
+    "custodian",
+    "system_qty",
+    "system_value",
+    "reconcile_qty",
+    "reconcile_value",
+    "variance_qty",
+    "variance_value",
+]
+
+# Assets fetched and inserted per chunk by the background populate job
+POPULATE_CHUNK_SIZE = 2000
+
+# Above this many asset rows the form loads the table page by page (see AssetReconcile.onload)
+PAGINATED_ROWS_THRESHOLD = 2000
+
+# Max rows returned by get_asset_rows per page
+MAX_ROWS_PAGE_LENGTH = 500
+
+# Asset Reconcile Item fields returned to the paginated grid
+ASSET_ROW_FIELDS = [
+    "name",
+    "idx",
+    "asset",
+    "item_code",
+    "location",
+    "asset_category",
+    "system_qty",
+    "system_value",
+    "reconcile_qty",
+    "reconcile_value",
+    "variance_qty",
+    "variance_value",
+    "notes",
+]
+
+# Asset fields needed to build scan results (see get_asset_data)
+ASSET_DATA_FIELDS = [
+    "name",
+    "asset_name",
+    "company",
+    "location",
+    "custodian",
+    "status",
+    "asset_category",
+    "department",
+    "cost_center",
+    "item_code",
+    "gross_purchase_amount",
+    "value_after_depreciation",
+    "calculate_depreciation",
+]
 
 
 class AssetReconcile(Document):
@@ -13,27 +129,285 @@ class AssetReconcile(Document):
     Handles validation and totals calculation
     """
 
+    def onload(self):
+        """
+        Send large assets tables to the form page by page
+
+        Above PAGINATED_ROWS_THRESHOLD rows the table is left out of the
+        document sent to the form, which reads it with get_asset_rows and
+        scans through apply_scan. The form marks the document with
+        __assets_paginated so the rows are put back on save (see
+        load_paginated_assets).
+        """
+        if len(self.assets) <= PAGINATED_ROWS_THRESHOLD:
+            return
+
+        self.set_onload("assets_paginated", {"total_rows": len(self.assets)})
+        self.set("assets", [])
+
+    def before_validate(self):
+        """
+        Put back the rows of a paginated table, or of the amended document
+        """
+        self.load_paginated_assets()
+
+    def before_update_after_submit(self):
+        """
+        Put back the rows of a paginated table
+        """
+        self.load_paginated_assets()
+
+    def load_paginated_assets(self):
+        """
+        Load the asset rows the form did not send
+
+        A paginated form sends the document without its assets table. The
+        rows are taken from the database as they are, so the save finds them
+        unchanged and writes none of them. An amendment of a paginated
+        document starts with the rows of the amended document.
+        """
+        if self.is_new():
+            if self.amended_from and not self.assets:
+                amended_rows = frappe.get_all(
+                    "Asset Reconcile Item",
+                    filters={"parent": self.amended_from, "parenttype": self.doctype},
+                    fields=get_asset_row_fields(copy_only=True),
+                    order_by="idx asc",
+                )
+                self.set("assets", amended_rows)
+            return
+
+        if not self.get("__assets_paginated"):
+            return
+
+        doc_before_save = self.get_doc_before_save()
+        if not doc_before_save:
+            return
+
+        self.set("assets", [row.as_dict() for row in doc_before_save.assets])
+        for row in self.assets:
+            row.docstatus = self.docstatus
+
     def validate(self):
         """
         Main validation method
         Called before saving the document
         Validates items and calculates totals
+
+        On an existing draft only the rows changed since the last save are
+        validated and folded into the totals (see update_totals). New,
+        amended or submitted documents use the full recompute.
+        """
+        self.validate_cycle_count()
+        changed_rows = self.get_changed_rows()
+
+        if changed_rows is None:
+            self.validate_items()
+            self.set_custodians(self.assets)
+            self.calculate_totals()
+        else:
+            dirty_rows, removed_rows = changed_rows
+            self.validate_items(dirty_rows)
+            self.set_custodians([row for row, row_before_save in dirty_rows])
+            self.update_totals(dirty_rows, removed_rows)
+
+        self.update_cycle_count_estimate()
+
+    def before_submit(self):
+        """
+        Recompute totals from every row before submitting
+
+        Incremental totals are verified here, so submitted figures never
+        depend on how the draft was edited.
         """
-        self.validate_items()
+        self.validate_scan_log_merged()
         self.calculate_totals()
+        self.update_cycle_count_estimate()
+
+    def on_submit(self):
+        """
+        Add the submitted variances to the Asset Reconcile Summary
+        and queue their posting (see posting.post_variances)
+        """
+        update_reconcile_summary(self)
+
+        if self.post_variances_on_submit:
+            self.db_set("posting_status", "Queued")
+            enqueue_variance_posting(self.name)
+
+    def on_cancel(self):
+        """
+        Take the cancelled variances out of the Asset Reconcile Summary
+        (and the anomaly statistics, if scored) and queue the reversal of
+        posted Asset Movements and scraps
+        """
+        # Postings are reversed by the background job
+        self.ignore_linked_doctypes = ("Asset Movement", "Journal Entry")
+        update_reconcile_summary(self, sign=-1)
+
+        if self.anomaly_scored:
+            update_anomaly_statistics([self.name], sign=-1)
+            update_anomaly_scores(self.company)
+
+        if has_postings(self.name):
+            self.db_set("posting_status", "Reversing")
+            enqueue_variance_posting(self.name, reverse=True)
+
+    def on_trash(self):
+        """
+        Delete the scan log of the document
+        """
+        frappe.db.delete("Asset Reconcile Scan", {"asset_reconcile": self.name})
+
+    def get_as_of(self):
+        """
+        Point in time system data is taken at
+
+        Returns:
+                datetime: Reconciliation date and time if Value as of
+                        Reconciliation Date is set, else None (now)
+        """
+        if not (self.value_as_of and self.reconciliation_date):
+            return None
+
+        return get_as_of_datetime(self.reconciliation_date, self.reconciliation_time)
+
+    def validate_cycle_count(self):
+        """
+        A cycle count needs a sample size the form can hold
+        """
+        if not self.cycle_count:
+            return
+
+        if cint(self.sample_size) <= 0:
+            frappe.throw(_("Sample Size must be greater than 0 for a cycle count"))
+
+        if cint(self.sample_size) > PAGINATED_ROWS_THRESHOLD:
+            frappe.throw(
+                _("Sample Size of a cycle count can be at most {0}, count the location in full instead").format(
+                    PAGINATED_ROWS_THRESHOLD
+                )
+            )
+
+    def update_cycle_count_estimate(self):
+        """
+        Extrapolate the counted variances of a cycle count to its population
+        (see sampling.estimate_population_variance)
+        """
+        if not self.cycle_count or not self.strata:
+            return
+
+        self.update(estimate_population_variance(self.strata, self.assets, self.confidence_level))
+
+    def validate_scan_log_merged(self):
+        """
+        Stop submit while multi-counter scans are waiting to be merged
+        """
+        if frappe.db.exists("Asset Reconcile Scan", {"asset_reconcile": self.name, "merged": 0}):
+            frappe.throw(_("There are scans waiting to be merged, please use Merge Scans before submitting"))
+
+    def get_changed_rows(self):
+        """
+        Find the asset rows added, changed or removed since the last save
+
+        Compares every row with the copy Frappe loads from the database before
+        saving. Unchanged rows are remembered so update_child_table can skip
+        rewriting them.
+
+        Returns:
+                tuple|None: (dirty_rows, removed_rows) where dirty_rows is a list of
+                        (row, row_before_save) pairs (row_before_save is None for new
+                        rows), or None when a full recompute is needed
+        """
+        self.flags.unchanged_asset_rows = None
+        self.flags.removed_asset_rows = None
+
+        doc_before_save = self.get_doc_before_save()
+        if self.docstatus != 0 or not doc_before_save or doc_before_save.docstatus != 0:
+            return None
 
-    def validate_items(self):
+        compare_fields = [*get_asset_row_fields(), "idx"]
+        rows_before_save = {row.name: row for row in doc_before_save.assets}
+        dirty_rows = []
+        unchanged_rows = set()
+
+        for row in self.assets:
+            row_before_save = rows_before_save.pop(row.name, None)
+            if row_before_save and all(
+                row.get(fieldname) == row_before_save.get(fieldname) for fieldname in compare_fields
+            ):
+                unchanged_rows.add(row.name)
+            else:
+                dirty_rows.append((row, row_before_save))
+
+        removed_rows = list(rows_before_save.values())
+
+        self.flags.unchanged_asset_rows = unchanged_rows
+        self.flags.removed_asset_rows = [row.name for row in removed_rows]
+
+        return dirty_rows, removed_rows
+
+    def update_child_table(self, fieldname, df=None):
+        """
+        Write only the asset rows that changed
+
+        Frappe rewrites every child row on save. For the assets table the rows
+        found unchanged by get_changed_rows are skipped and removed rows are
+        deleted by name, so save cost follows the number of edited rows.
+
+        The flags hold for this save only: they are cleared once used, so a
+        later save that skips validate (ignore_validate, update after submit)
+        writes every row again.
+        """
+        if fieldname != "assets" or self.flags.unchanged_asset_rows is None:
+            return super().update_child_table(fieldname, df)
+
+        unchanged_rows = self.flags.unchanged_asset_rows
+        removed_rows = self.flags.removed_asset_rows
+        self.flags.unchanged_asset_rows = None
+        self.flags.removed_asset_rows = None
+
+        for row in self.assets:
+            if row.name not in unchanged_rows:
+                row.db_update()
+
+        if removed_rows:
+            frappe.db.delete(
+                "Asset Reconcile Item",
+                {
+                    "name": ("in", removed_rows),
+                    "parent": self.name,
+                    "parenttype": self.doctype,
+                },
+            )
+
+    def validate_items(self, dirty_rows=None):
         """
         Check for duplicate assets in the assets table
 
         Prevents the same asset from appearing multiple times
         in the reconciliation table. also validates quantity for serialized assets.
 
+        Args:
+                dirty_rows(list, optional): (row, row_before_save) pairs. If given,
+                        only these rows are checked against the rest of the table
+
         Raises:
                 frappe.ValidationError: If duplicate asset found or invalid quantity
         """
-        assets_seen = set()
-        for item in self.assets:
+        if dirty_rows is not None:
+            # Unchanged rows were already validated on a previous save
+            assets_seen = {
+                item.asset
+                for item in self.assets
+                if item.asset and item.name in self.flags.unchanged_asset_rows
+            }
+            items = [row for row, row_before_save in dirty_rows]
+        else:
+            assets_seen = set()
+            items = self.assets
+
+        for item in items:
             if not item.asset:
                 continue
 
@@ -50,6 +424,37 @@ class AssetReconcile(Document):
             # If you need to warn on qty > 1, add a msgprint here.
             # Currently intentionally silent as per requirement.
 
+    def set_custodians(self, rows):
+        """
+        Record the custodian of the asset on rows that have none yet
+
+        Rows built on the server carry it already; rows added in the form
+        (scanned against the offline snapshot, typed in) get it here. Anomaly
+        scoring groups variances by this custodian, the one at count time.
+
+        Args:
+                rows(list): Asset Reconcile Item rows to fill
+        """
+        if self.docstatus != 0:
+            return
+
+        rows = [row for row in rows if row.asset and not row.custodian]
+        asset_names = list({row.asset for row in rows})
+
+        custodians = {}
+        for start in range(0, len(asset_names), VALUATION_CHUNK_SIZE):
+            custodians.update(
+                frappe.get_all(
+                    "Asset",
+                    filters={"name": ("in", asset_names[start : start + VALUATION_CHUNK_SIZE])},
+                    fields=["name", "custodian"],
+                    as_list=True,
+                )
+            )
+
+        for row in rows:
+            row.custodian = custodians.get(row.asset)
+
     def calculate_totals(self):
         """
         Calculate system, reconcile, and variance totals
@@ -74,22 +479,61 @@ class AssetReconcile(Document):
             system_qty = flt(item.system_qty or 0)
             system_value = flt(item.system_value or 0)
 
-            unit_value = 0.0
-            if system_qty > 0:
-                unit_value = system_value / system_qty
-            elif reconcile_qty > 0 and item.asset:
-                # If system qty is 0 but we found it, try to get value from asset ref if possible?
-                # Ideally fetch_system_data handles this.
-                pass
+            item.reconcile_value, item.variance_qty, item.variance_value = get_row_variance(
+                system_qty, system_value, reconcile_qty
+            )
 
-            # Calculate Reconcile Value based on unit value of system asset
-            item.reconcile_value = reconcile_qty * unit_value
+            # Sum up values from child table
+            total_system_value += system_value
+            total_reconcile_value += item.reconcile_value
+            total_system_qty += system_qty
+            total_reconcile_qty += reconcile_qty
 
-            # Simple difference
-            item.variance_qty = reconcile_qty - system_qty
-            item.variance_value = item.reconcile_value - system_value
+        # Update total fields
+        self.total_system_value = total_system_value
+        self.total_reconcile_value = total_reconcile_value
+        self.total_variance_value = total_reconcile_value - total_system_value
+
+        self.total_system_qty = total_system_qty
+        self.total_reconcile_qty = total_reconcile_qty
+        self.total_variance_qty = total_reconcile_qty - total_system_qty
+
+    def update_totals(self, dirty_rows, removed_rows):
+        """
+        Update totals from the changed rows only
+
+        Starts from the totals saved with the document, takes out what the
+        changed and removed rows contributed before and adds what the changed
+        rows contribute now. calculate_totals stays the reference (full)
+        computation and runs again before submit.
+
+        Args:
+                dirty_rows(list): (row, row_before_save) pairs
+                removed_rows(list): Rows removed since the last save
+        """
+        doc_before_save = self.get_doc_before_save()
+        total_system_value = flt(doc_before_save.total_system_value)
+        total_reconcile_value = flt(doc_before_save.total_reconcile_value)
+        total_system_qty = flt(doc_before_save.total_system_qty)
+        total_reconcile_qty = flt(doc_before_save.total_reconcile_qty)
+
+        # Take out previous contributions of changed and removed rows
+        for item in [row_before_save for row, row_before_save in dirty_rows if row_before_save] + removed_rows:
+            total_system_value -= flt(item.system_value)
+            total_reconcile_value -= flt(item.reconcile_value)
+            total_system_qty -= flt(item.system_qty)
+            total_reconcile_qty -= flt(item.reconcile_qty)
+
+        # Add current contributions of changed rows
+        for item, _row_before_save in dirty_rows:
+            reconcile_qty = flt(item.reconcile_qty or 0)
+            system_qty = flt(item.system_qty or 0)
+            system_value = flt(item.system_value or 0)
+
+            item.reconcile_value, item.variance_qty, item.variance_value = get_row_variance(
+                system_qty, system_value, reconcile_qty
+            )
 
-            # Sum up values from child table
             total_system_value += system_value
             total_reconcile_value += item.reconcile_value
             total_system_qty += system_qty
@@ -103,10 +547,169 @@ class AssetReconcile(Document):
         self.total_system_qty = total_system_qty
         self.total_reconcile_qty = total_reconcile_qty
         self.total_variance_qty = total_reconcile_qty - total_system_qty
-        
+
+    def merge_scan_counts(self, scan_counts, replace=False):
+        """
+        Merge counted scans into the assets table
+
+        Applies the same rules as scanning one code at a time in the form:
+        an asset already in the table gets its reconcile_qty incremented,
+        a new asset is added with system_qty 1 and its value after depreciation.
+        Assets found outside the document location are added as flagged rows
+        (system_qty 0, with a note). Codes that match no asset are returned,
+        since Asset Reconcile Item rows require an asset.
+
+        Args:
+                scan_counts(dict): Mapping of scanned value to number of scans
+                replace(bool, optional): Set reconcile_qty to the count instead
+                        of adding to it (imported counts)
+
+        Returns:
+                dict: Summary with added, updated, out_of_location and not_found
+        """
+        # Item barcodes are matched within the location (tree), other codes anywhere
+        asset_by_value = resolve_barcodes(
+            list(scan_counts), self.company, self.location, self.include_sub_locations
+        )
+
+        # Sum scans per asset, several codes can point to the same asset
+        qty_by_asset = {}
+        for value, asset_name in asset_by_value.items():
+            qty_by_asset[asset_name] = qty_by_asset.get(asset_name, 0) + scan_counts[value]
+
+        # No location filter here: assets found elsewhere become flagged rows
+        assets_data = get_assets_data(list(qty_by_asset), company=self.company, as_of=self.get_as_of())
+        not_found = [value for value in scan_counts if asset_by_value.get(value) not in assets_data]
+
+        rows_by_asset = {row.asset: row for row in self.assets if row.asset}
+        added = updated = 0
+        out_of_location = []
+
+        for asset_name, qty in qty_by_asset.items():
+            data = assets_data.get(asset_name)
+            if not data:
+                continue
+
+            existing_row = rows_by_asset.get(asset_name)
+            if existing_row:
+                existing_row.reconcile_qty = qty if replace else flt(existing_row.reconcile_qty) + qty
+                updated += 1
+                continue
+
+            in_location = is_in_location(data["location"], self.location, self.include_sub_locations)
+            # Counted as absent and not expected here: nothing to record
+            if not qty and not in_location:
+                continue
+
+            row = {
+                "asset": asset_name,
+                "item_code": data["item_code"],
+                "location": data["location"],
+                "asset_category": data["asset_category"],
+                "custodian": data["custodian"],
+                "system_qty": 1,
+                "system_value": data["value_after_depreciation"],
+                "reconcile_qty": qty,
+            }
+
+            if not in_location:
+                row.update(
+                    {
+                        "system_qty": 0,
+                        "system_value": 0,
+                        "notes": _("Scanned outside location, asset is at {0}").format(data["location"]),
+                    }
+                )
+                out_of_location.append(asset_name)
+
+            rows_by_asset[asset_name] = self.append("assets", row)
+            added += 1
+
+        return {
+            "added": added,
+            "updated": updated,
+            "out_of_location": out_of_location,
+            "not_found": not_found,
+        }
+
+
+def get_row_variance(system_qty, system_value, reconcile_qty):
+    """
+    Calculate reconcile value and variances of one Asset Reconcile Item row
+
+    Reconcile value is based on the unit value of the system asset.
+    If the system knows nothing about the asset (system_qty 0), its value is 0.
+
+    Args:
+            system_qty(float): System quantity
+            system_value(float): System value
+            reconcile_qty(float): Counted quantity
+
+    Returns:
+            tuple: (reconcile_value, variance_qty, variance_value)
+    """
+    unit_value = 0.0
+    if system_qty > 0:
+        unit_value = system_value / system_qty
+
+    # Calculate Reconcile Value based on unit value of system asset
+    reconcile_value = reconcile_qty * unit_value
+
+    # Simple difference
+    return reconcile_value, reconcile_qty - system_qty, reconcile_value - system_value
+
+
+def get_asset_row_fields(copy_only=False):
+    """
+    Get the stored fields of Asset Reconcile Item
+
+    Args:
+            copy_only(bool, optional): Leave out "no copy" fields (posting references)
+
+    Returns:
+            list: Field names
+    """
+    return [
+        df.fieldname
+        for df in frappe.get_meta("Asset Reconcile Item").fields
+        if df.fieldtype not in no_value_fields and not (copy_only and df.no_copy)
+    ]
+
+
+def check_reconcile_permission(docname, ptype="read"):
+    """
+    Check a permission on an Asset Reconcile without loading its assets table
+
+    frappe.has_permission with a name loads the whole document, children
+    included. Row-level endpoints check against a document built from the
+    parent row only, so their cost does not depend on the size of the table.
+
+    Args:
+            docname(str): Asset Reconcile name
+            ptype(str, optional): Permission type
+
+    Returns:
+            frappe._dict: Values of the Asset Reconcile row
+
+    Raises:
+            frappe.DoesNotExistError: If the document does not exist
+            frappe.PermissionError: If the user lacks the permission
+    """
+    values = frappe.db.get_value("Asset Reconcile", docname, "*", as_dict=True)
+    if not values:
+        frappe.throw(_("Asset Reconcile {0} not found").format(docname), frappe.DoesNotExistError)
+
+    frappe.has_permission(
+        "Asset Reconcile", ptype, frappe.get_doc({**values, "doctype": "Asset Reconcile"}), throw=True
+    )
+    return values
+
 
 @frappe.whitelist()
-def scan_asset_barcode(search_value, company=None, location=None):
+@instrument
+def scan_asset_barcode(
+    search_value, company=None, location=None, include_sub_locations=None, fields=None, as_of=None
+):
     """
     Search Asset by barcode, name, or item barcode
 
@@ -119,219 +722,761 @@ def scan_asset_barcode(search_value, company=None, location=None):
             search_value(str): Barcode, asset name, or item barcode to search
             company(str, optional): Company filter
             location(str, optional): Location filter
+            include_sub_locations(bool, optional): Also match assets under location
+            fields(list|str, optional): Return only these keys (see get_payload)
+            as_of(str, optional): Location and value as of this datetime (backdated counts)
 
     Returns:
             dict: Asset data dictionary or empty dict if not found
     """
-    asset_name = None
-
-    # 1. Search custom_barcode field in Asset (if exists)
-    if frappe.db.has_column("Asset", "custom_barcode"):
-        asset_name = frappe.db.get_value(
-            "Asset",
-            {"custom_barcode": search_value, "docstatus": 1},
-            "name",
-        )
+    include_sub_locations = cint(include_sub_locations)
 
-    # 2. Search Asset name directly
-    if not asset_name:
-        asset_name = frappe.db.get_value(
-            "Asset",
-            {"name": search_value, "docstatus": 1},
-            "name",
-        )
-
-    # 3. Search Item Barcode (if Item has barcode, find Asset by item_code)
-    if not asset_name:
-        item_barcode = frappe.db.get_value(
-            "Item Barcode",
-            {"barcode": search_value},
-            "parent",
-        )
-
-        if item_barcode:
-            # Build filters for Asset search
-            filters = {"item_code": item_barcode, "docstatus": 1}
-            if company:
-                filters["company"] = company
-            if location:
-                filters["location"] = location
-
-            asset_name = frappe.db.get_value("Asset", filters, "name")
+    # Resolve all three search paths in one query (cached per company and location)
+    with perf_stage("resolve_barcode"):
+        asset_name = resolve_barcode(search_value, company, location, include_sub_locations)
 
     # Return empty dict if asset not found
     if not asset_name:
         return {}
 
     # Get full asset data using ERPNext's proper methods
-    return get_asset_data(asset_name, company, location)
+    with perf_stage("get_asset_data"):
+        data = get_asset_data(asset_name, company, location, include_sub_locations, as_of or None)
 
+    return get_payload([data], fields)[0] if data else {}
 
-def get_asset_data(asset_name, company=None, location=None):
+
+@frappe.whitelist()
+@instrument
+def scan_asset_barcodes(
+    search_values,
+    company=None,
+    location=None,
+    include_sub_locations=None,
+    fields=None,
+    compact=None,
+    as_of=None,
+):
     """
-    Get asset data with proper value_after_depreciation calculation
+    Resolve a batch of scanned values in one call
 
-    Retrieves asset document and calculates accurate value after depreciation.
-    Validates company and location filters if provided.
+    Used by the scanner to reconcile codes that were queued while working
+    offline against a scan snapshot. Follows the same rules as
+    scan_asset_barcode for every value.
 
     Args:
-            asset_name(str): Name of the asset document
-            company(str, optional): Company filter for validation
-            location(str, optional): Location filter for validation
+            search_values(list|str): Scanned values (list or JSON list)
+            company(str, optional): Company filter
+            location(str, optional): Location filter
+            include_sub_locations(bool, optional): Also match assets under location
+            fields(list|str, optional): Return only these keys (see get_payload)
+            compact(bool, optional): Return {fields, rows}, with null rows for values not found
+            as_of(str, optional): Location and value as of this datetime (backdated counts)
 
     Returns:
-            dict: Dictionary containing asset information:
-                    - asset: Asset name
-                    - name: Asset name
-                    - asset_name: Asset display name
-                    - location: Asset location
-                    - value_after_depreciation: Calculated value after depreciation
-                    - gross_purchase_amount: Original purchase amount
-                    - custodian: Asset custodian
-                    - status: Asset status
-                    - asset_category: Asset category
-                    - department: Department
-                    - cost_center: Cost center
-                    - item_code: Item code
+            list: Asset data dictionary per scanned value, in scan order
+                    (empty dict for values that were not found)
     """
-    asset_doc = frappe.get_cached_doc("Asset", asset_name)
-
-    # Validate company filter
-    if company and asset_doc.company != company:
-        return {}
+    search_values = frappe.parse_json(search_values) or []
+    include_sub_locations = cint(include_sub_locations)
+
+    with perf_stage("resolve_barcodes"):
+        asset_by_value = resolve_barcodes(search_values, company, location, include_sub_locations)
+    with perf_stage("get_asset_data"):
+        assets_data = get_assets_data(
+            list(asset_by_value.values()), company, location, include_sub_locations, as_of or None
+        )
 
-    # Validate location filter
-    if location and asset_doc.location != location:
-        return {}
+    results = [assets_data.get(asset_by_value.get(value), {}) for value in search_values]
+    if not parse_fields(fields) and not cint(compact):
+        return results
 
-    # Use ERPNext's get_value_after_depreciation method for accurate value
-    # This ensures proper depreciation calculation if asset uses depreciation
-    if hasattr(asset_doc, 'get_value_after_depreciation'):
-        value_after_depreciation = asset_doc.get_value_after_depreciation()
-    else:
-        # Fallback to stored value or gross purchase amount
-        value_after_depreciation = (
-            flt(asset_doc.value_after_depreciation)
-            or flt(asset_doc.gross_purchase_amount)
-        )
+    payload = get_payload([data for data in results if data], fields, compact)
+    if not cint(compact):
+        rows = iter(payload)
+        return [next(rows) if data else {} for data in results]
 
-    return {
-        "asset": asset_doc.name,
-        "name": asset_doc.name,
-        "asset_name": asset_doc.asset_name,
-        "location": asset_doc.location,
-        "value_after_depreciation": flt(value_after_depreciation),
-        "gross_purchase_amount": flt(asset_doc.gross_purchase_amount),
-        "custodian": asset_doc.custodian,
-        "status": asset_doc.status,
-        "asset_category": asset_doc.asset_category,
-        "department": asset_doc.department,
-        "cost_center": asset_doc.cost_center,
-        "item_code": asset_doc.item_code,
-    }
+    rows = iter(payload["rows"])
+    payload["rows"] = [next(rows) if data else None for data in results]
+    return payload
 
 
 @frappe.whitelist()
-def get_assets_by_location(location, company=None):
+@instrument
+def ingest_scans(docname, barcodes):
     """
-    Get all assets in a location for reconciliation
+    Ingest a scanner dump into an Asset Reconcile in one save
 
-    Convenience function that calls get_assets_by_filters with location parameter
+    Batch-mode terminals export thousands of scans at once. Duplicate codes
+    are counted up front, every distinct code is resolved with set-based
+    queries and the counts are merged into reconcile_qty (see
+    AssetReconcile.merge_scan_counts). Codes that match no asset are
+    recorded as a comment on the document.
 
     Args:
-            location(str): Location to filter assets
-            company(str, optional): Company filter
+            docname(str): Asset Reconcile name
+            barcodes(list|str): Scanned values, as a list, JSON list or newline separated text
 
     Returns:
-            list: List of asset dictionaries
+            dict: Summary with scans, added, updated, out_of_location and not_found
     """
-    return get_assets_by_filters(company=company, location=location)
+    doc = frappe.get_doc("Asset Reconcile", docname)
+    doc.check_permission("write")
 
+    if doc.docstatus != 0:
+        frappe.throw(_("Scans can only be added to a draft Asset Reconcile"))
 
-@frappe.whitelist()
-def get_assets_by_filters(company=None, location=None, asset_category=None, status=None):
-    """
-    Get all assets by filters for reconciliation
+    # Count duplicates first, memory grows with distinct codes only
+    scan_counts = Counter(parse_barcodes(barcodes))
 
-    If location is not provided, fetches all assets for the company.
-    Follows ERPNext's Fixed Asset Register pattern for filtering.
+    if not scan_counts:
+        frappe.throw(_("No barcodes to ingest"))
 
-    By default, excludes disposed assets(Sold, Scrapped, Capitalized).
+    return apply_scan_counts(doc, scan_counts)
+
+
+def parse_barcodes(barcodes):
+    """
+    Parse scanned values sent by a client
 
     Args:
-            company(str, optional): Company filter(required)
-            location(str, optional): Location filter
-            asset_category(str, optional): Asset category filter
-            status(str, optional): Status filter. If None, excludes disposed assets
+            barcodes(list|str): List, JSON list or newline separated text
 
     Returns:
-            list: List of asset dictionaries containing:
-                    - name: Asset name
-                    - asset_name: Asset display name
-                    - location: Asset location
-                    - custodian: Asset custodian
-                    - status: Asset status
-                    - asset_category: Asset category
-                    - department: Department
-                    - cost_center: Cost center
-                    - item_code: Item code
-                    - gross_purchase_amount: Original purchase amount
-                    - value_after_depreciation: Calculated value after depreciation
-
-    Raises:
-            frappe.ValidationError: If company is not provided
+            list: Stripped, non-empty values in scan order
     """
-    # Company is required
-    if not company:
-        frappe.throw(_("Company is required to fetch assets"))
-
-    # Build base filters
-    filters = {"docstatus": 1, "company": company}
+    if isinstance(barcodes, str):
+        barcodes = frappe.parse_json(barcodes) if barcodes.lstrip().startswith("[") else barcodes.splitlines()
 
-    # Location filter (optional)
-    if location:
-        filters["location"] = location
+    return [barcode for barcode in (cstr(value).strip() for value in barcodes or []) if barcode]
 
-    # Asset category filter (optional)
-    if asset_category:
-        filters["asset_category"] = asset_category
 
-    # Status filter - exclude disposed assets by default (following ERPNext pattern)
-    if status:
-        filters["status"] = status
-    else:
-        # Exclude Sold, Scrapped, Capitalized assets (like Fixed Asset Register)
-        filters["status"] = ("not in", ["Sold", "Scrapped", "Capitalized"])
+def apply_scan_counts(doc, scan_counts, replace=False):
+    """
+    Merge scan counts into an Asset Reconcile and save it once
 
-    # Get asset data with required fields
-    asset_records = frappe.get_all(
-        "Asset",
-        filters=filters,
-        fields=[
-            "name",
-            "asset_name",
-            "location",
-            "custodian",
-            "status",
-            "asset_category",
-            "department",
-            "cost_center",
-            "item_code",
-            "gross_purchase_amount",
-            "value_after_depreciation",
-            "calculate_depreciation",
-        ],
-        order_by="asset_name",
-    )
+    Codes that match no asset are recorded as a comment on the document.
 
-    # Get accurate value_after_depreciation for assets with depreciation
-    assets = []
-    for asset in asset_records:
-        # For assets with calculate_depreciation, get accurate value from method
-        if asset.calculate_depreciation:
-            asset_doc = frappe.get_cached_doc("Asset", asset.name)
-            if hasattr(asset_doc, 'get_value_after_depreciation'):
-                asset["value_after_depreciation"] = asset_doc.get_value_after_depreciation()
+    Args:
+            doc(AssetReconcile): Draft Asset Reconcile
+            scan_counts(dict): Mapping of scanned value to number of scans
+            replace(bool, optional): Counts replace reconcile_qty (see merge_scan_counts)
+
+    Returns:
+            dict: Summary with scans, added, updated, out_of_location and not_found
+    """
+    summary = doc.merge_scan_counts(scan_counts, replace=replace)
+
+    if summary["not_found"]:
+        doc.add_comment(
+            "Comment",
+            _("Scans not matched to any asset: {0}").format(", ".join(summary["not_found"][:500])),
+        )
+
+    doc.save()
+
+    summary["scans"] = sum(scan_counts.values())
+    return summary
+
+
+@frappe.whitelist()
+@instrument
+def import_counts(docname, file_url):
+    """
+    Import counted quantities from a CSV or XLSX file in one save
+
+    The file needs a Counted Qty column and an Asset or Barcode column. It
+    is streamed and summed per identifier (see count_import.read_count_file),
+    identifiers are resolved in bulk with the scan_asset_barcode rules, and
+    the counts replace reconcile_qty of the matched rows. Rejected lines and
+    identifiers that match no asset are reported, up to IMPORT_ERROR_LIMIT.
+
+    Args:
+            docname(str): Asset Reconcile name
+            file_url(str): URL of the uploaded File
+
+    Returns:
+            dict: Summary with lines, added, updated, out_of_location, not_found,
+                    rejected and errors
+    """
+    doc = frappe.get_doc("Asset Reconcile", docname)
+    doc.check_permission("write")
+
+    if doc.docstatus != 0:
+        frappe.throw(_("Counts can only be imported into a draft Asset Reconcile"))
+
+    with perf_stage("read_count_file"):
+        count_file = read_count_file(file_url)
+
+    if count_file.errors:
+        doc.add_comment(
+            "Comment",
+            _("Import Counts: {0} lines rejected: {1}").format(
+                count_file.rejected, "; ".join(count_file.errors)
+            ),
+        )
+
+    if not count_file.counts:
+        frappe.throw(_("No counted quantities found in the file"))
+
+    summary = apply_scan_counts(doc, count_file.counts, replace=True)
+    summary.update(
+        {
+            "lines": count_file.lines,
+            "rejected": count_file.rejected,
+            "errors": count_file.errors,
+            "not_found": summary["not_found"][:IMPORT_ERROR_LIMIT],
+            "not_found_count": len(summary["not_found"]),
+        }
+    )
+    return summary
+
+
+@frappe.whitelist()
+@instrument
+def append_scans(docname, barcodes, client_id=None):
+    """
+    Append scans to the scan log of a multi-counter Asset Reconcile
+
+    Scans are bulk-inserted as Asset Reconcile Scan rows without loading or
+    saving the Asset Reconcile, so any number of counters can scan into the
+    same document at the same time without document locks or save
+    conflicts. The log is folded into the assets table by merge_scan_log.
+
+    Args:
+            docname(str): Asset Reconcile name
+            barcodes(list|str): Scanned values, as a list, JSON list or newline separated text
+            client_id(str, optional): Scanner session id, kept on every scan
+
+    Returns:
+            dict: Number of scans appended
+    """
+    if check_reconcile_permission(docname, "write").docstatus != 0:
+        frappe.throw(_("Scans can only be added to a draft Asset Reconcile"))
+
+    barcodes = parse_barcodes(barcodes)
+    if not barcodes:
+        return {"appended": 0}
+
+    timestamp = now()
+    user = frappe.session.user
+    client_id = cstr(client_id)[:140] or user
+
+    fields = [
+        "name",
+        "creation",
+        "modified",
+        "owner",
+        "modified_by",
+        "docstatus",
+        "asset_reconcile",
+        "barcode",
+        "qty",
+        "client_id",
+        "scanned_at",
+        "merged",
+    ]
+    values = [
+        (
+            frappe.generate_hash(length=10),
+            timestamp,
+            timestamp,
+            user,
+            user,
+            0,
+            docname,
+            barcode[:140],
+            1,
+            client_id,
+            timestamp,
+            0,
+        )
+        for barcode in barcodes
+    ]
+    frappe.db.bulk_insert("Asset Reconcile Scan", fields, values)
+
+    return {"appended": len(barcodes)}
+
+
+@frappe.whitelist()
+@instrument
+def merge_scans(docname):
+    """
+    Merge the scan log of an Asset Reconcile now
+
+    Args:
+            docname(str): Asset Reconcile name
+
+    Returns:
+            dict: Merge summary (see apply_scan_counts), or None if nothing was pending
+    """
+    check_reconcile_permission(docname, "write")
+    return merge_scan_log(docname)
+
+
+def merge_scan_log(docname):
+    """
+    Fold unmerged Asset Reconcile Scan rows into reconcile_qty
+
+    The Asset Reconcile row is locked for the duration of the merge, so two
+    merges of the same document never count a scan twice. Only the scans
+    read under the lock are marked merged; scans appended meanwhile are
+    picked up by the next merge.
+
+    Args:
+            docname(str): Asset Reconcile name
+
+    Returns:
+            dict: Merge summary (see apply_scan_counts), or None if nothing was pending
+    """
+    docstatus = frappe.db.sql(
+        "select docstatus from `tabAsset Reconcile` where name = %s for update", (docname,)
+    )
+    if not docstatus or docstatus[0][0] != 0:
+        return None
+
+    scans = frappe.get_all(
+        "Asset Reconcile Scan",
+        filters={"asset_reconcile": docname, "merged": 0},
+        fields=["name", "barcode", "qty"],
+        order_by="creation asc",
+    )
+    if not scans:
+        return None
+
+    scan_counts = Counter()
+    for scan in scans:
+        scan_counts[scan.barcode] += flt(scan.qty) or 1
+
+    doc = frappe.get_doc("Asset Reconcile", docname)
+    summary = apply_scan_counts(doc, scan_counts)
+
+    scan_names = [scan.name for scan in scans]
+    for start in range(0, len(scan_names), POPULATE_CHUNK_SIZE):
+        frappe.db.sql(
+            "update `tabAsset Reconcile Scan` set merged = 1 where name in %s",
+            (scan_names[start : start + POPULATE_CHUNK_SIZE],),
+        )
+
+    frappe.publish_realtime(
+        "asset_reconcile_scans_merged",
+        {"docname": docname, **summary},
+        doctype="Asset Reconcile",
+        docname=docname,
+        after_commit=True,
+    )
+    return summary
+
+
+def merge_pending_scans():
+    """
+    Scheduler job: merge the scan log of every draft with pending scans
+
+    Each document is merged and committed on its own, so a failure only
+    affects that document.
+    """
+    docnames = frappe.db.sql_list(
+        """
+        select distinct scan.asset_reconcile
+        from `tabAsset Reconcile Scan` scan
+        inner join `tabAsset Reconcile` reconcile on reconcile.name = scan.asset_reconcile
+        where scan.merged = 0 and reconcile.docstatus = 0
+        """
+    )
+
+    for docname in docnames:
+        try:
+            merge_scan_log(docname)
+            frappe.db.commit()
+        except Exception:
+            frappe.db.rollback()
+            frappe.log_error(title=_("Merging scans failed for Asset Reconcile {0}").format(docname))
+
+
+@frappe.whitelist()
+@instrument
+def get_scan_snapshot(company, location=None, version=None, include_sub_locations=None):
+    """
+    Get a compact snapshot of the assets of a location for offline scanning
+
+    The snapshot maps every barcode, asset name and item barcode of the
+    location to its asset, so the scanner can resolve scans locally.
+    If the client already holds the current version, only the version is
+    returned: the version is read with one aggregate query, before any
+    asset is read or valued.
+
+    Args:
+            company(str): Company filter
+            location(str, optional): Location filter
+            version(str, optional): Snapshot version cached by the client
+            include_sub_locations(bool, optional): Include locations under location
+
+    Returns:
+            dict: Snapshot with version, fields, assets (list of value lists)
+                    and codes (normalized code -> index in assets)
+    """
+    include_sub_locations = cint(include_sub_locations)
+    current_version = get_scan_snapshot_version(company, location, include_sub_locations)
+    if version and version == current_version:
+        return {"version": version, "unchanged": 1}
+
+    with perf_stage("build_scan_snapshot"):
+        return build_scan_snapshot(company, location, include_sub_locations, current_version)
+
+
+@frappe.whitelist()
+def check_barcode_health(company=None):
+    """
+    List barcodes that make scans ambiguous (see get_ambiguous_barcodes)
+
+    Args:
+            company(str, optional): Only check assets of this company
+
+    Returns:
+            list: Rows with barcode, reason and assets
+    """
+    frappe.has_permission("Asset", "read", throw=True)
+    return get_ambiguous_barcodes(company)
+
+
+def get_asset_data(asset_name, company=None, location=None, include_sub_locations=False, as_of=None):
+    """
+    Get asset data with proper value_after_depreciation calculation
+
+    Retrieves asset document and calculates accurate value after depreciation.
+    Validates company and location filters if provided.
+
+    Args:
+            asset_name(str): Name of the asset document
+            company(str, optional): Company filter for validation
+            location(str, optional): Location filter for validation
+            include_sub_locations(bool, optional): Locations under location pass too
+            as_of(datetime, optional): Location and value as of this point in time
+
+    Returns:
+            dict: Dictionary containing asset information:
+                    - asset: Asset name
+                    - name: Asset name
+                    - asset_name: Asset display name
+                    - location: Asset location
+                    - value_after_depreciation: Calculated value after depreciation
+                    - gross_purchase_amount: Original purchase amount
+                    - custodian: Asset custodian
+                    - status: Asset status
+                    - asset_category: Asset category
+                    - department: Department
+                    - cost_center: Cost center
+                    - item_code: Item code
+    """
+    return get_assets_data([asset_name], company, location, include_sub_locations, as_of).get(asset_name, {})
+
+
+def get_assets_data(asset_names, company=None, location=None, include_sub_locations=False, as_of=None):
+    """
+    Get asset data for many assets with bulk queries
+
+    Set-based version of get_asset_data. Assets that do not exist or do not
+    match the company/location filters are left out of the result.
+
+    Args:
+            asset_names(list): Names of the asset documents
+            company(str, optional): Company filter for validation
+            location(str, optional): Location filter for validation
+            include_sub_locations(bool, optional): Locations under location pass too
+            as_of(datetime, optional): Location and value as of this point in time
+                    (see point_in_time.apply_asset_timelines)
+
+    Returns:
+            dict: Mapping of asset name to the get_asset_data dictionary
+    """
+    asset_names = list(dict.fromkeys(name for name in asset_names if name))
+    asset_records = []
+    fields = [*ASSET_DATA_FIELDS, "disposal_date"] if as_of else ASSET_DATA_FIELDS
+
+    with perf_stage("asset_query"):
+        for start in range(0, len(asset_names), VALUATION_CHUNK_SIZE):
+            asset_records.extend(
+                frappe.get_all(
+                    "Asset",
+                    filters={"name": ("in", asset_names[start : start + VALUATION_CHUNK_SIZE])},
+                    fields=fields,
+                )
+            )
+
+    if as_of:
+        asset_records = apply_asset_timelines(asset_records, as_of)
+
+    # Validate company and location filters
+    asset_records = [
+        asset
+        for asset in asset_records
+        if (not company or asset.company == company)
+        and is_in_location(asset.location, location, include_sub_locations)
+    ]
+
+    # Same value as ERPNext's get_value_after_depreciation, without loading the full docs
+    values_after_depreciation = get_values_after_depreciation(asset_records)
+
+    return {
+        asset.name: {
+            "asset": asset.name,
+            "name": asset.name,
+            "asset_name": asset.asset_name,
+            "location": asset.location,
+            "value_after_depreciation": flt(values_after_depreciation.get(asset.name)),
+            "gross_purchase_amount": flt(asset.gross_purchase_amount),
+            "custodian": asset.custodian,
+            "status": asset.status,
+            "asset_category": asset.asset_category,
+            "department": asset.department,
+            "cost_center": asset.cost_center,
+            "item_code": asset.item_code,
+        }
+        for asset in asset_records
+    }
+
+
+@frappe.whitelist()
+@instrument
+def get_assets_by_location(location, company=None):
+    """
+    Get all assets in a location for reconciliation
+
+    Convenience function that calls get_assets_by_filters with location parameter
+
+    Args:
+            location(str): Location to filter assets
+            company(str, optional): Company filter
+
+    Returns:
+            list: List of asset dictionaries
+    """
+    return get_assets_by_filters(company=company, location=location)
+
+
+@frappe.whitelist()
+@instrument
+def get_assets_by_filters(
+    company=None,
+    location=None,
+    asset_category=None,
+    status=None,
+    include_sub_locations=None,
+    fields=None,
+    compact=None,
+    as_of=None,
+):
+    """
+    Get all assets by filters for reconciliation
+
+    If location is not provided, fetches all assets for the company.
+    Follows ERPNext's Fixed Asset Register pattern for filtering.
+
+    By default, excludes disposed assets(Sold, Scrapped, Capitalized).
+
+    With include_sub_locations, assets of every location under the given one
+    are fetched in the same query, grouped by location in tree order.
+
+    Args:
+            company(str, optional): Company filter(required)
+            location(str, optional): Location filter
+            asset_category(str, optional): Asset category filter
+            status(str, optional): Status filter. If None, excludes disposed assets
+            include_sub_locations(bool, optional): Include locations under location
+            fields(list|str, optional): Return only these keys (see get_payload)
+            compact(bool, optional): Return {fields, rows, synced_on} with one value list
+                    per asset; synced_on is the Refresh System Data watermark, taken
+                    before the assets are read
+            as_of(str, optional): Rebuild location and value as of this datetime
+                    (backdated counts, see get_as_of_asset_records)
+
+    Returns:
+            list: List of asset dictionaries containing:
+                    - name: Asset name
+                    - asset_name: Asset display name
+                    - location: Asset location
+                    - custodian: Asset custodian
+                    - status: Asset status
+                    - asset_category: Asset category
+                    - department: Department
+                    - cost_center: Cost center
+                    - item_code: Item code
+                    - gross_purchase_amount: Original purchase amount
+                    - value_after_depreciation: Calculated value after depreciation
+
+    Raises:
+            frappe.ValidationError: If company is not provided
+    """
+    # Company is required
+    if not company:
+        frappe.throw(_("Company is required to fetch assets"))
+
+    # Taken before the read: changes made while it runs are picked up by the next refresh
+    synced_on = now()
+
+    if as_of:
+        asset_records = get_as_of_asset_records(
+            company, location, asset_category, status, include_sub_locations, as_of
+        )
+    else:
+        # Get asset data with required fields
+        with perf_stage("asset_query"):
+            asset_records = frappe.get_all(
+                "Asset",
+                filters=get_asset_filters(company, location, asset_category, status, include_sub_locations),
+                fields=ASSET_FETCH_FIELDS,
+                order_by="asset_name",
+            )
+
+    if location and cint(include_sub_locations):
+        # Stable sort: by location in tree order, by asset name within a location
+        location_order = {name: i for i, name in enumerate(get_descendant_locations(location))}
+        asset_records.sort(key=lambda asset: location_order.get(asset.location, 0))
+
+    payload = get_payload(make_reconcile_rows(asset_records), fields, compact)
+    if cint(compact):
+        payload["synced_on"] = synced_on
+
+    return payload
+
+
+@frappe.whitelist()
+@instrument
+def get_cycle_count_sample(
+    company=None,
+    location=None,
+    include_sub_locations=None,
+    sample_size=None,
+    seed=None,
+    fields=None,
+    compact=None,
+    as_of=None,
+):
+    """
+    Draw the assets of a cycle count (see sampling.build_cycle_count_sample)
+
+    The population is what get_assets_by_filters returns for the same
+    filters; only the drawn assets are sent back, in the same order.
+
+    Args:
+            company(str): Company filter
+            location(str, optional): Location filter
+            include_sub_locations(bool, optional): Include locations under location
+            sample_size(int): Number of assets to count
+            seed(int, optional): Seed of an earlier draw, a new one if empty
+            fields(list|str, optional): Return only these keys (see get_payload)
+            compact(bool, optional): Return rows as {fields, rows}
+            as_of(str, optional): Rebuild location and value as of this datetime
+
+    Returns:
+            dict: rows (drawn assets with their stratum), strata, seed,
+                    population_count, population_value and synced_on
+                    (Refresh System Data watermark, taken before the read)
+    """
+    synced_on = now()
+    population = get_assets_by_filters(
+        company, location, include_sub_locations=include_sub_locations, as_of=as_of
+    )
+    seed = cint(seed) or get_sample_seed()
+
+    with perf_stage("cycle_count_sample"):
+        sample, strata = build_cycle_count_sample(population, sample_size, seed)
+
+    sampled = {row["asset"] for row in sample}
+    return {
+        "rows": get_payload([row for row in population if row["asset"] in sampled], fields, compact),
+        "strata": strata,
+        "seed": seed,
+        "population_count": len(population),
+        "population_value": sum(flt(row["system_value"]) for row in population),
+        "synced_on": synced_on,
+    }
+
+
+def get_as_of_asset_records(
+    company, location=None, asset_category=None, status=None, include_sub_locations=False, as_of=None
+):
+    """
+    Get the Asset records of a backdated count, as they were at as_of
+
+    Assets disposed after as_of were still in service then, so disposed
+    assets are only left out by their disposal date (see
+    point_in_time.get_asset_records_as_of).
+
+    Args:
+            company(str): Company filter
+            location(str, optional): Location filter
+            asset_category(str, optional): Asset category filter
+            status(str, optional): Status filter (current status)
+            include_sub_locations(bool, optional): Include locations under location
+            as_of(datetime|str): Point in time
+
+    Returns:
+            list: Asset records with ASSET_FETCH_FIELDS, location and value as of as_of
+    """
+    filters = get_asset_filters(company, asset_category=asset_category, status=status)
+    if not status:
+        filters.pop("status")
+
+    locations = None
+    if location:
+        locations = get_descendant_locations(location) if cint(include_sub_locations) else [location]
+
+    return get_asset_records_as_of(filters, ASSET_FETCH_FIELDS, get_datetime(as_of), locations)
+
+
+def get_asset_filters(company, location=None, asset_category=None, status=None, include_sub_locations=False):
+    """
+    Build Asset filters used to fetch assets for reconciliation
+
+    Args:
+            company(str): Company filter
+            location(str, optional): Location filter
+            asset_category(str, optional): Asset category filter
+            status(str, optional): Status filter. If None, excludes disposed assets
+            include_sub_locations(bool, optional): Match every location under location too
+
+    Returns:
+            dict: Filters for frappe.get_all("Asset")
+    """
+    # Build base filters
+    filters = {"docstatus": 1, "company": company}
+
+    # Location filter (optional)
+    if location:
+        filters["location"] = get_location_filter(location, cint(include_sub_locations))
+
+    # Asset category filter (optional)
+    if asset_category:
+        filters["asset_category"] = asset_category
+
+    # Status filter - exclude disposed assets by default (following ERPNext pattern)
+    if status:
+        filters["status"] = status
+    else:
+        # Exclude Sold, Scrapped, Capitalized assets (like Fixed Asset Register)
+        filters["status"] = ("not in", ["Sold", "Scrapped", "Capitalized"])
+
+    return filters
+
+
+def make_reconcile_rows(asset_records):
+    """
+    Build Asset Reconcile Item rows from Asset records
+
+    Args:
+            asset_records(list): Asset records with ASSET_FETCH_FIELDS
+
+    Returns:
+            list: Fully prepared dicts for Asset Reconcile Item
+    """
+    # Get accurate value_after_depreciation for all assets in bulk
+    # (same numbers as Asset.get_value_after_depreciation, without loading each doc)
+    values_after_depreciation = get_values_after_depreciation(asset_records)
+
+    assets = []
+    for asset in asset_records:
+        asset["value_after_depreciation"] = values_after_depreciation.get(asset.name)
 
         # Fallback to gross_purchase_amount if value_after_depreciation is 0
         if not flt(asset.value_after_depreciation):
@@ -373,7 +1518,896 @@ def get_assets_by_filters(company=None, location=None, asset_category=None, stat
     return assets
 
 
+def get_payload(rows, fields=None, compact=False):
+    """
+    Shape rows for a response
+
+    Bulk responses are sent to mobile scanners as well: the client can ask
+    for the keys it stores only, and for an array-encoded body where the
+    keys are sent once instead of once per row.
+
+    Args:
+            rows(list): Row dicts
+            fields(list|str, optional): Keys to keep (list, JSON list or comma separated)
+            compact(bool, optional): Encode as {fields, rows} with one value list per row
+
+    Returns:
+            list|dict: Row dicts, or {"fields": [...], "rows": [[...], ...]} if compact
+    """
+    fields = parse_fields(fields)
+    if not fields and not cint(compact):
+        return rows
+
+    fields = fields or (list(rows[0]) if rows else [])
+    if cint(compact):
+        return {"fields": fields, "rows": [[row.get(fieldname) for fieldname in fields] for row in rows]}
+
+    return [{fieldname: row.get(fieldname) for fieldname in fields} for row in rows]
+
+
+def parse_fields(fields):
+    """Parse the fields of a compact request (list, JSON list or comma separated)"""
+    if isinstance(fields, str):
+        fields = frappe.parse_json(fields) if fields.lstrip().startswith("[") else fields.split(",")
+
+    return [cstr(fieldname).strip() for fieldname in fields or [] if cstr(fieldname).strip()]
+
+
+def iter_asset_chunks(filters, chunk_size=POPULATE_CHUNK_SIZE):
+    """
+    Stream Asset records matching filters in keyset-paginated chunks
+
+    Pages on the primary key (name > last seen name) instead of offsets,
+    so every chunk is an index range scan no matter how deep it is.
+
+    Args:
+            filters(dict): Asset filters (see get_asset_filters)
+            chunk_size(int, optional): Number of assets per chunk
+
+    Yields:
+            list: Asset records with ASSET_FETCH_FIELDS
+    """
+    last_name = None
+    while True:
+        chunk_filters = dict(filters)
+        if last_name:
+            chunk_filters["name"] = (">", last_name)
+
+        asset_records = frappe.get_all(
+            "Asset",
+            filters=chunk_filters,
+            fields=ASSET_FETCH_FIELDS,
+            order_by="name asc",
+            limit_page_length=chunk_size,
+        )
+        if not asset_records:
+            return
+
+        yield asset_records
+
+        if len(asset_records) < chunk_size:
+            return
+        last_name = asset_records[-1].name
+
+
+def iter_populate_chunks(doc, filters):
+    """
+    Stream the assets of an Asset Reconcile, location by location in tree order
+
+    Args:
+            doc(AssetReconcile): Asset Reconcile being populated
+            filters(dict): Asset filters (see get_asset_filters)
+
+    Yields:
+            list: Asset records with ASSET_FETCH_FIELDS
+    """
+    if not (doc.location and doc.include_sub_locations):
+        yield from iter_asset_chunks(filters)
+        return
+
+    for location in get_descendant_locations(doc.location):
+        yield from iter_asset_chunks({**filters, "location": location})
+
+
+@frappe.whitelist()
+@instrument
+def populate_assets(docname=None, company=None, location=None, include_sub_locations=None):
+    """
+    Fill the assets table on the server as a background job
+
+    For large locations the client-side "Get Assets" has to build every row
+    in the browser. This enqueues populate_assets_job instead. If no
+    document exists yet, a draft Asset Reconcile is created first.
+
+    Args:
+            docname(str, optional): Existing draft Asset Reconcile
+            company(str, optional): Company for a new document
+            location(str, optional): Location for a new document
+            include_sub_locations(bool, optional): Include sub-locations in a new document
+
+    Returns:
+            str: Name of the Asset Reconcile being populated
+    """
+    if docname:
+        doc = frappe.get_doc("Asset Reconcile", docname)
+        doc.check_permission("write")
+    else:
+        if not company:
+            frappe.throw(_("Company is required to fetch assets"))
+        doc = frappe.new_doc("Asset Reconcile")
+        doc.company = company
+        doc.location = location
+        doc.include_sub_locations = cint(include_sub_locations)
+        # The assets table is filled by the job
+        doc.flags.ignore_mandatory = True
+        doc.insert()
+
+    if doc.docstatus != 0:
+        frappe.throw(_("Assets can only be fetched into a draft Asset Reconcile"))
+
+    frappe.enqueue(
+        "asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.populate_assets_job",
+        queue="long",
+        timeout=3600,
+        job_id=f"asset_reconcile_populate::{doc.name}",
+        deduplicate=True,
+        docname=doc.name,
+    )
+
+    return doc.name
+
+
+def populate_assets_job(docname):
+    """
+    Background job: replace the assets table with all matching assets
+
+    Streams assets in keyset-paginated chunks, values each chunk in bulk and
+    inserts Asset Reconcile Item rows directly, without loading the whole
+    table into a document. Progress is published over realtime
+    (asset_reconcile_populate event).
+
+    With include_sub_locations, locations are streamed one after another in
+    tree order, so the rows come out grouped by location.
+
+    With value_as_of, every asset is rebuilt as of the reconciliation date in
+    one pass (see get_as_of_asset_records) and inserted in the same chunks.
+
+    Args:
+            docname(str): Asset Reconcile name
+    """
+    # Parent row only: the rows are replaced below
+    values = frappe.db.get_value("Asset Reconcile", docname, "*", as_dict=True)
+
+    # Submitted, cancelled or deleted while the job was queued
+    if not values or values.docstatus != 0:
+        frappe.publish_realtime(
+            "asset_reconcile_populate",
+            {"docname": docname, "failed": 1},
+            user=frappe.session.user,
+        )
+        return
+
+    doc = frappe.get_doc({**values, "doctype": "Asset Reconcile"})
+
+    if doc.get_as_of():
+        asset_records = get_as_of_asset_records(
+            doc.company,
+            doc.location,
+            include_sub_locations=doc.include_sub_locations,
+            as_of=doc.get_as_of(),
+        )
+        total = len(asset_records)
+        chunks = (
+            asset_records[start : start + POPULATE_CHUNK_SIZE]
+            for start in range(0, total, POPULATE_CHUNK_SIZE)
+        )
+    else:
+        filters = get_asset_filters(doc.company, doc.location, include_sub_locations=doc.include_sub_locations)
+        total = frappe.db.count("Asset", filters)
+        chunks = iter_populate_chunks(doc, filters)
+
+    # Taken before reading assets, so changes made during the job are picked up by the next refresh
+    synced_on = now()
+
+    frappe.db.delete("Asset Reconcile Item", {"parent": docname, "parenttype": "Asset Reconcile"})
+
+    fields = [
+        "name",
+        "creation",
+        "modified",
+        "owner",
+        "modified_by",
+        "docstatus",
+        "parent",
+        "parentfield",
+        "parenttype",
+        "idx",
+        *POPULATE_ROW_FIELDS,
+    ]
+    timestamp = now()
+    user = frappe.session.user
+    idx = 0
+    total_system_value = 0
+
+    try:
+        for asset_records in chunks:
+            values = []
+            for row in make_reconcile_rows(asset_records):
+                idx += 1
+                total_system_value += row["system_value"]
+                values.append(
+                    (
+                        frappe.generate_hash(length=10),
+                        timestamp,
+                        timestamp,
+                        user,
+                        user,
+                        0,
+                        docname,
+                        "assets",
+                        "Asset Reconcile",
+                        idx,
+                        *(row[fieldname] for fieldname in POPULATE_ROW_FIELDS),
+                    )
+                )
+
+            frappe.db.bulk_insert("Asset Reconcile Item", fields, values)
+
+            frappe.publish_realtime(
+                "asset_reconcile_populate",
+                {"docname": docname, "progress": idx, "total": total},
+                user=user,
+            )
+    except Exception:
+        frappe.publish_realtime(
+            "asset_reconcile_populate",
+            {"docname": docname, "failed": 1},
+            user=user,
+        )
+        raise
+
+    # Every fetched row has system_qty = reconcile_qty = 1 and no variance
+    frappe.db.set_value(
+        "Asset Reconcile",
+        docname,
+        {
+            "total_system_qty": idx,
+            "total_reconcile_qty": idx,
+            "total_variance_qty": 0,
+            "total_system_value": total_system_value,
+            "total_reconcile_value": total_system_value,
+            "total_variance_value": 0,
+            "last_synced_on": synced_on,
+        },
+    )
+
+    frappe.publish_realtime(
+        "asset_reconcile_populate",
+        {"docname": docname, "progress": idx, "total": total, "done": 1},
+        user=user,
+        after_commit=True,
+    )
+
+
+@frappe.whitelist()
+@instrument
+def refresh_system_data(docname):
+    """
+    Refresh system quantities and values of a draft from the assets changed since its last sync
+
+    Only assets modified after last_synced_on (or revalued by a Journal
+    Entry, Asset Value Adjustment or depreciation schedule since then) are
+    read, so the cost follows the number of changes, not the size of the
+    location. For each of them:
+    - still at the location: system fields are updated, reconcile_qty is kept
+    - no longer at the location (moved, sold, scrapped, cancelled): the row
+      is removed, or kept with system_qty 0 and a note if it was counted
+    - newly at the location: a row is added, as Get Assets would
+
+    Rows are updated in place and totals adjusted by the difference, without
+    loading or saving the whole document.
+
+    Args:
+            docname(str): Asset Reconcile name
+
+    Returns:
+            dict: Summary with checked, updated, added, removed and flagged
+    """
+    doc_values = check_reconcile_permission(docname, "write")
+
+    if doc_values.docstatus != 0:
+        frappe.throw(_("System data can only be refreshed on a draft Asset Reconcile"))
+
+    if doc_values.value_as_of:
+        frappe.throw(
+            _("System data of a count valued as of its reconciliation date is refreshed with Get Assets")
+        )
+
+    # Taken before reading assets, so changes made meanwhile are picked up by the next refresh
+    synced_on = now()
+    filters = get_asset_filters(
+        doc_values.company, doc_values.location, include_sub_locations=doc_values.include_sub_locations
+    )
+
+    if doc_values.last_synced_on:
+        changed_assets = get_changed_assets(doc_values.company, doc_values.last_synced_on)
+    else:
+        # Never synced: compare every asset of the table and of the location
+        changed_assets = set(
+            frappe.get_all(
+                "Asset Reconcile Item",
+                filters={"parent": docname, "parenttype": "Asset Reconcile"},
+                pluck="asset",
+            )
+        )
+        changed_assets.update(frappe.get_all("Asset", filters=filters, pluck="name"))
+
+    changed_assets = sorted(asset for asset in changed_assets if asset)
+    summary = {"checked": len(changed_assets), "updated": 0, "added": 0, "removed": 0, "flagged": 0}
+    # Locked like apply_scan and update_asset_row, so a scan meanwhile is not overwritten
+    totals = get_reconcile_totals(docname, for_update=True)
+    next_idx = get_max_row_idx(docname)
+
+    for start in range(0, len(changed_assets), VALUATION_CHUNK_SIZE):
+        chunk = changed_assets[start : start + VALUATION_CHUNK_SIZE]
+
+        existing_rows = frappe.get_all(
+            "Asset Reconcile Item",
+            filters={"parent": docname, "parenttype": "Asset Reconcile", "asset": ("in", chunk)},
+            fields=[
+                "name",
+                "asset",
+                "item_code",
+                "location",
+                "asset_category",
+                "custodian",
+                "system_qty",
+                "system_value",
+                "reconcile_qty",
+                "reconcile_value",
+                "variance_qty",
+                "variance_value",
+            ],
+        )
+        current_rows = {
+            row["asset"]: row
+            for row in make_reconcile_rows(
+                frappe.get_all(
+                    "Asset",
+                    filters={**filters, "name": ("in", chunk)},
+                    fields=ASSET_FETCH_FIELDS,
+                    order_by="asset_name",
+                )
+            )
+        }
+
+        removed_rows = []
+        for row in existing_rows:
+            current_row = current_rows.pop(row.asset, None)
+            update_totals_by_row(totals, row, -1)
+
+            if current_row:
+                values = {
+                    "item_code": current_row["item_code"],
+                    "location": current_row["location"],
+                    "asset_category": current_row["asset_category"],
+                    "custodian": current_row["custodian"],
+                    "system_qty": 1,
+                    "system_value": current_row["system_value"],
+                }
+            elif flt(row.reconcile_qty):
+                # Counted but gone from the system: keep the count as a variance
+                values = {"system_qty": 0, "system_value": 0}
+                if flt(row.system_qty):
+                    values["notes"] = _("No longer at this location in the system (refreshed on {0})").format(
+                        synced_on
+                    )
+                    summary["flagged"] += 1
+            else:
+                removed_rows.append(row.name)
+                continue
+
+            values["reconcile_value"], values["variance_qty"], values["variance_value"] = get_row_variance(
+                flt(values["system_qty"]), flt(values["system_value"]), flt(row.reconcile_qty)
+            )
+            if any(row.get(fieldname) != value for fieldname, value in values.items()):
+                frappe.db.set_value("Asset Reconcile Item", row.name, values, update_modified=False)
+                summary["updated"] += 1
+
+            row.update(values)
+            update_totals_by_row(totals, row, 1)
+
+        if removed_rows:
+            frappe.db.delete("Asset Reconcile Item", {"name": ("in", removed_rows)})
+            summary["removed"] += len(removed_rows)
+
+        # Assets that arrived at the location since the last sync
+        new_rows = list(current_rows.values())
+        if new_rows:
+            timestamp = now()
+            user = frappe.session.user
+            values = []
+            for row in new_rows:
+                next_idx += 1
+                update_totals_by_row(totals, row, 1)
+                values.append(
+                    (
+                        frappe.generate_hash(length=10),
+                        timestamp,
+                        timestamp,
+                        user,
+                        user,
+                        0,
+                        docname,
+                        "assets",
+                        "Asset Reconcile",
+                        next_idx,
+                        *(row[fieldname] for fieldname in POPULATE_ROW_FIELDS),
+                    )
+                )
+            frappe.db.bulk_insert(
+                "Asset Reconcile Item",
+                [
+                    "name",
+                    "creation",
+                    "modified",
+                    "owner",
+                    "modified_by",
+                    "docstatus",
+                    "parent",
+                    "parentfield",
+                    "parenttype",
+                    "idx",
+                    *POPULATE_ROW_FIELDS,
+                ],
+                values,
+            )
+            summary["added"] += len(new_rows)
+
+    set_reconcile_totals(docname, totals, last_synced_on=synced_on)
+
+    if summary["updated"] or summary["added"] or summary["removed"]:
+        frappe.get_doc("Asset Reconcile", docname).add_comment(
+            "Info",
+            _("System data refreshed: {0} rows updated, {1} added, {2} removed").format(
+                summary["updated"], summary["added"], summary["removed"]
+            ),
+        )
+
+    return summary
+
+
+def get_changed_assets(company, since):
+    """
+    Get the assets whose system data may have changed since a point in time
+
+    Besides assets modified since then, includes assets referenced by Journal
+    Entries (depreciation entries), Asset Value Adjustments and Asset
+    Depreciation Schedules changed since then, since those update finance
+    book values without touching Asset.modified.
+
+    Args:
+            company(str): Company of the assets
+            since(str): Datetime watermark
+
+    Returns:
+            set: Asset names
+    """
+    changed_assets = set(
+        frappe.get_all("Asset", filters={"company": company, "modified": (">=", since)}, pluck="name")
+    )
+
+    changed_assets.update(
+        frappe.db.sql_list(
+            """
+            select distinct account.reference_name
+            from `tabJournal Entry Account` account
+            inner join `tabJournal Entry` entry on entry.name = account.parent
+            where entry.company = %(company)s
+                and entry.modified >= %(since)s
+                and account.reference_type = 'Asset'
+                and account.reference_name is not null
+            """,
+            {"company": company, "since": since},
+        )
+    )
+
+    for doctype in ("Asset Value Adjustment", "Asset Depreciation Schedule"):
+        changed_assets.update(
+            frappe.get_all(doctype, filters={"modified": (">=", since)}, pluck="asset", distinct=True)
+        )
+
+    return changed_assets
+
+
+def update_totals_by_row(totals, row, sign):
+    """Add (sign 1) or take out (sign -1) the contribution of a row to document totals"""
+    totals["system_qty"] += sign * flt(row.get("system_qty"))
+    totals["system_value"] += sign * flt(row.get("system_value"))
+    totals["reconcile_qty"] += sign * flt(row.get("reconcile_qty"))
+    totals["reconcile_value"] += sign * flt(row.get("reconcile_value"))
+
+
+def get_reconcile_totals(docname, for_update=False):
+    """
+    Read the stored totals of an Asset Reconcile
+
+    Args:
+            docname(str): Asset Reconcile name
+            for_update(bool, optional): Lock the document row until commit
+
+    Returns:
+            dict: system_qty, system_value, reconcile_qty and reconcile_value
+    """
+    values = frappe.db.get_value(
+        "Asset Reconcile",
+        docname,
+        ["total_system_qty", "total_system_value", "total_reconcile_qty", "total_reconcile_value"],
+        as_dict=True,
+        for_update=for_update,
+    )
+    return {
+        "system_qty": flt(values.total_system_qty),
+        "system_value": flt(values.total_system_value),
+        "reconcile_qty": flt(values.total_reconcile_qty),
+        "reconcile_value": flt(values.total_reconcile_value),
+    }
+
+
+def set_reconcile_totals(docname, totals, update_modified=True, **values):
+    """
+    Write totals (and other header values) of an Asset Reconcile
+
+    Args:
+            docname(str): Asset Reconcile name
+            totals(dict): system_qty, system_value, reconcile_qty and reconcile_value
+            update_modified(bool, optional): Also update the modified timestamp
+            **values: Other fields to set
+
+    Returns:
+            dict: The total_* fields written
+    """
+    total_fields = {
+        "total_system_qty": totals["system_qty"],
+        "total_system_value": totals["system_value"],
+        "total_reconcile_qty": totals["reconcile_qty"],
+        "total_reconcile_value": totals["reconcile_value"],
+        "total_variance_qty": totals["reconcile_qty"] - totals["system_qty"],
+        "total_variance_value": totals["reconcile_value"] - totals["system_value"],
+    }
+    frappe.db.set_value(
+        "Asset Reconcile", docname, {**total_fields, **values}, update_modified=update_modified
+    )
+    return total_fields
+
+
+def get_max_row_idx(docname):
+    """Highest idx of the assets table of an Asset Reconcile"""
+    return cint(
+        frappe.db.sql(
+            "select max(idx) from `tabAsset Reconcile Item` where parent = %s and parenttype = 'Asset Reconcile'",
+            (docname,),
+        )[0][0]
+    )
+
+
+@frappe.whitelist()
+@instrument
+def get_asset_rows(docname, start=0, page_length=100, filters=None):
+    """
+    Get one page of the assets table of an Asset Reconcile
+
+    Used by the form for tables above PAGINATED_ROWS_THRESHOLD rows, so the
+    browser only holds and renders the rows on screen.
+
+    Args:
+            docname(str): Asset Reconcile name
+            start(int, optional): Offset of the first row
+            page_length(int, optional): Rows per page (max MAX_ROWS_PAGE_LENGTH)
+            filters(dict|str, optional): Any of
+                    - variance: Matched, Missing (variance_qty < 0) or Surplus (variance_qty > 0)
+                    - asset_category: Asset Category
+                    - asset_status: Status of the Asset
+                    - search: Part of the asset, asset name or item code
+
+    Returns:
+            dict: rows (in idx order, with asset_name and asset_status) and total_rows matching the filters
+    """
+    check_reconcile_permission(docname, "read")
+
+    filters = frappe._dict(frappe.parse_json(filters) or {})
+    start = max(cint(start), 0)
+    page_length = min(max(cint(page_length), 1), MAX_ROWS_PAGE_LENGTH)
+
+    conditions = ["item.parent = %(parent)s", "item.parenttype = 'Asset Reconcile'"]
+    params = {"parent": docname, "start": start, "page_length": page_length}
+
+    variance_conditions = {
+        "Matched": "item.variance_qty = 0",
+        "Missing": "item.variance_qty < 0",
+        "Surplus": "item.variance_qty > 0",
+    }
+    if filters.variance in variance_conditions:
+        conditions.append(variance_conditions[filters.variance])
+
+    if filters.asset_category:
+        conditions.append("item.asset_category = %(asset_category)s")
+        params["asset_category"] = filters.asset_category
+
+    if filters.asset_status:
+        conditions.append("asset.status = %(asset_status)s")
+        params["asset_status"] = filters.asset_status
+
+    if filters.search:
+        conditions.append(
+            "(item.asset like %(search)s or asset.asset_name like %(search)s or item.item_code like %(search)s)"
+        )
+        params["search"] = f"%{filters.search}%"
+
+    from_clause = """
+        from `tabAsset Reconcile Item` item
+        left join `tabAsset` asset on asset.name = item.asset
+        where {}
+    """.format(" and ".join(conditions))
+
+    rows = frappe.db.sql(
+        """
+        select {fields}, asset.asset_name, asset.status as asset_status
+        {from_clause}
+        order by item.idx asc
+        limit %(page_length)s offset %(start)s
+        """.format(
+            fields=", ".join(f"item.{fieldname}" for fieldname in ASSET_ROW_FIELDS),
+            from_clause=from_clause,
+        ),
+        params,
+        as_dict=True,
+    )
+    total_rows = frappe.db.sql(f"select count(*) {from_clause}", params)[0][0]
+
+    return {"rows": rows, "total_rows": total_rows}
+
+
+@frappe.whitelist()
+@instrument
+def apply_scan(docname, search_value):
+    """
+    Apply one scan to a paginated Asset Reconcile on the server
+
+    Same rules as AssetReconcile.merge_scan_counts for a single scan, but
+    only the scanned row and the document totals are written, so the cost
+    does not depend on the size of the table. The modified timestamp is left
+    alone, so the open form can still be saved.
+
+    Args:
+            docname(str): Asset Reconcile name
+            search_value(str): Barcode, asset name, or item barcode
+
+    Returns:
+            dict: Scanned row, action (added, updated or out_of_location) and
+                    document totals, or empty dict if the scan matches no asset
+    """
+    doc_values = check_reconcile_permission(docname, "write")
+    if doc_values.docstatus != 0:
+        frappe.throw(_("Scans can only be added to a draft Asset Reconcile"))
+
+    as_of = (
+        get_as_of_datetime(doc_values.reconciliation_date, doc_values.reconciliation_time)
+        if doc_values.value_as_of
+        else None
+    )
+
+    asset_name = resolve_barcode(
+        search_value, doc_values.company, doc_values.location, doc_values.include_sub_locations
+    )
+    # No location filter here: assets found elsewhere become flagged rows
+    data = get_asset_data(asset_name, doc_values.company, as_of=as_of) if asset_name else {}
+    if not data:
+        return {}
+
+    # Lock the document so concurrent scans of the same asset are counted once each
+    totals = get_reconcile_totals(docname, for_update=True)
+
+    row = frappe.db.get_value(
+        "Asset Reconcile Item",
+        {"parent": docname, "parenttype": "Asset Reconcile", "asset": asset_name},
+        ASSET_ROW_FIELDS,
+        as_dict=True,
+    )
+
+    if row:
+        update_totals_by_row(totals, row, -1)
+        row.reconcile_qty = flt(row.reconcile_qty) + 1
+        row.reconcile_value, row.variance_qty, row.variance_value = get_row_variance(
+            flt(row.system_qty), flt(row.system_value), row.reconcile_qty
+        )
+        frappe.db.set_value(
+            "Asset Reconcile Item",
+            row.name,
+            {
+                "reconcile_qty": row.reconcile_qty,
+                "reconcile_value": row.reconcile_value,
+                "variance_qty": row.variance_qty,
+                "variance_value": row.variance_value,
+            },
+            update_modified=False,
+        )
+        action = "updated"
+    else:
+        row = frappe._dict(
+            name=frappe.generate_hash(length=10),
+            idx=get_max_row_idx(docname) + 1,
+            asset=asset_name,
+            item_code=data["item_code"],
+            location=data["location"],
+            asset_category=data["asset_category"],
+            custodian=data["custodian"],
+            system_qty=1,
+            system_value=data["value_after_depreciation"],
+            reconcile_qty=1,
+            notes=None,
+        )
+        action = "added"
+        if not is_in_location(data["location"], doc_values.location, doc_values.include_sub_locations):
+            row.update(
+                {
+                    "system_qty": 0,
+                    "system_value": 0,
+                    "notes": _("Scanned outside location, asset is at {0}").format(data["location"]),
+                }
+            )
+            action = "out_of_location"
+
+        row.reconcile_value, row.variance_qty, row.variance_value = get_row_variance(
+            flt(row.system_qty), flt(row.system_value), flt(row.reconcile_qty)
+        )
+        timestamp = now()
+        frappe.db.bulk_insert(
+            "Asset Reconcile Item",
+            [
+                "creation",
+                "modified",
+                "owner",
+                "modified_by",
+                "docstatus",
+                "parent",
+                "parentfield",
+                "parenttype",
+                "custodian",
+                *ASSET_ROW_FIELDS,
+            ],
+            [
+                (
+                    timestamp,
+                    timestamp,
+                    frappe.session.user,
+                    frappe.session.user,
+                    0,
+                    docname,
+                    "assets",
+                    "Asset Reconcile",
+                    row.custodian,
+                    *(row[fieldname] for fieldname in ASSET_ROW_FIELDS),
+                )
+            ],
+        )
+
+    update_totals_by_row(totals, row, 1)
+    row.asset_name = data["asset_name"]
+
+    return {
+        "row": row,
+        "action": action,
+        "totals": set_reconcile_totals(docname, totals, update_modified=False),
+    }
+
+
+@frappe.whitelist()
+@instrument
+def update_asset_row(docname, row_name, reconcile_qty=None, notes=None):
+    """
+    Update the counted quantity or notes of one row of a paginated Asset Reconcile
+
+    Args:
+            docname(str): Asset Reconcile name
+            row_name(str): Asset Reconcile Item name
+            reconcile_qty(float, optional): New counted quantity
+            notes(str, optional): New notes
+
+    Returns:
+            dict: Updated row and document totals
+    """
+    if check_reconcile_permission(docname, "write").docstatus != 0:
+        frappe.throw(_("Rows can only be changed on a draft Asset Reconcile"))
+
+    totals = get_reconcile_totals(docname, for_update=True)
+    row = frappe.db.get_value(
+        "Asset Reconcile Item",
+        {"name": row_name, "parent": docname, "parenttype": "Asset Reconcile"},
+        ASSET_ROW_FIELDS,
+        as_dict=True,
+    )
+    if not row:
+        frappe.throw(_("Row {0} not found in {1}").format(row_name, docname), frappe.DoesNotExistError)
+
+    update_totals_by_row(totals, row, -1)
+
+    if reconcile_qty is not None:
+        row.reconcile_qty = cint(reconcile_qty)
+    if notes is not None:
+        row.notes = notes
+    row.reconcile_value, row.variance_qty, row.variance_value = get_row_variance(
+        flt(row.system_qty), flt(row.system_value), flt(row.reconcile_qty)
+    )
+
+    frappe.db.set_value(
+        "Asset Reconcile Item",
+        row.name,
+        {
+            "reconcile_qty": row.reconcile_qty,
+            "reconcile_value": row.reconcile_value,
+            "variance_qty": row.variance_qty,
+            "variance_value": row.variance_value,
+            "notes": row.notes,
+        },
+        update_modified=False,
+    )
+    update_totals_by_row(totals, row, 1)
+
+    return {"row": row, "totals": set_reconcile_totals(docname, totals, update_modified=False)}
+
+
+@frappe.whitelist()
+@instrument
+def retry_variance_posting(docname):
+    """
+    Queue the posting (or reversal) of variances again after a failure
+
+    Rows that already hold an Asset Movement or scrap Journal Entry are
+    skipped, so only what failed is posted.
+
+    Args:
+            docname(str): Asset Reconcile name
+    """
+    doc = frappe.get_doc("Asset Reconcile", docname)
+    doc.check_permission("submit" if doc.docstatus == 1 else "cancel")
+
+    if doc.posting_status != "Failed":
+        frappe.throw(_("Only a failed posting can be retried"))
+
+    if doc.docstatus == 1:
+        doc.db_set("posting_status", "Queued")
+        enqueue_variance_posting(docname)
+    elif doc.docstatus == 2:
+        doc.db_set("posting_status", "Reversing")
+        enqueue_variance_posting(docname, reverse=True)
+
+
+@frappe.whitelist()
+@instrument
+def export_asset_reconcile(docname, file_format="CSV"):
+    """
+    Export the assets table of an Asset Reconcile as CSV or XLSX
+
+    Rows are streamed from the database in idx order and written straight
+    to a private file attached to the document, so memory stays flat for
+    any row count. Variance fields are computed like calculate_totals.
+
+    Args:
+            docname(str): Asset Reconcile name
+            file_format(str, optional): CSV or XLSX
+
+    Returns:
+            str: URL of the exported file
+    """
+    # Parent row only: loading the document would read every row before streaming
+    check_reconcile_permission(docname, "read")
+
+    return write_export_file(docname, file_format)
+
+
 @frappe.whitelist()
+@instrument
 def get_system_data(item_code=None, location=None, company=None, asset=None):
     """
     Get system quantity and value for an item or asset from Asset records
@@ -387,53 +2421,104 @@ def get_system_data(item_code=None, location=None, company=None, asset=None):
     Returns:
             dict: Dictionary with quantity, value, and asset_category
     """
-    if not item_code and not asset:
-        return {}
-
-    # Build filters for Asset search
-    filters = {"docstatus": 1}
+    return get_system_data_bulk(
+        [{"item_code": item_code, "location": location, "asset": asset}], company
+    )[0]
 
-    if asset:
-        filters["name"] = asset
-    elif item_code:
-        filters["item_code"] = item_code
 
-    if company:
-        filters["company"] = company
+@frappe.whitelist()
+@instrument
+def get_system_data_bulk(rows, company=None):
+    """
+    Get system quantity and value for many item or asset rows at once
 
-    if location and not asset:
-        # If asset is specified, location check might be restrictive if asset moved?
-        # But for checking "System Data" at that location, we should probably respect it?
-        # ERPNext convention: Asset location is single.
-        filters["location"] = location
-
-    # Get all assets matching the filters
-    assets = frappe.get_all(
-        "Asset",
-        filters=filters,
-        fields=["name", "value_after_depreciation", "gross_purchase_amount", "asset_category"]
-    )
+    Rows are grouped by asset, or by (item_code, location) when no asset is
+    given, and answered from one Asset query and the bulk valuation,
+    whatever the number of rows.
 
-    if not assets:
-        return {"quantity": 0, "value": 0, "asset_category": ""}
+    Rules per row are the same as the single-row lookup:
+    - asset given: that asset (location is not checked, the asset may have moved)
+    - else item_code given: all assets of the item, at the location if given
+    - neither: empty dict
 
-    quantity = len(assets)
-    total_value = 0
-    asset_category = assets[0].asset_category if assets else ""
+    Args:
+            rows(list|str): Dicts (or JSON) with item_code, location and asset
+            company(str, optional): Company filter
 
-    for asset_data in assets:
-        # Get cached asset document for accurate value calculation
-        asset_doc = frappe.get_cached_doc("Asset", asset_data.name)
+    Returns:
+            list: Dictionary with quantity, value, and asset_category per row, in row order
+    """
+    rows = [frappe._dict(row) for row in (frappe.parse_json(rows) or [])]
 
-        if hasattr(asset_doc, 'get_value_after_depreciation'):
-            value = asset_doc.get_value_after_depreciation()
-        else:
-            value = flt(asset_data.value_after_depreciation) or flt(asset_data.gross_purchase_amount)
+    asset_names = list({row.asset for row in rows if row.asset})
+    item_codes = list({row.item_code for row in rows if row.item_code and not row.asset})
 
-        total_value += flt(value)
+    # Build filters for Asset search
+    filters = {"docstatus": 1}
+    if company:
+        filters["company"] = company
 
-    return {
-        "quantity": quantity,
-        "value": total_value,
-        "asset_category": asset_category
-    }
+    # Get all assets matching any row in one query per chunk of keys
+    # An asset can match by name and by item code in different chunks: keep it once
+    asset_records = []
+    seen = set()
+    for fieldname, keys in (("name", asset_names), ("item_code", item_codes)):
+        for start in range(0, len(keys), VALUATION_CHUNK_SIZE):
+            for asset_data in frappe.get_all(
+                "Asset",
+                filters={**filters, fieldname: ("in", keys[start : start + VALUATION_CHUNK_SIZE])},
+                fields=[
+                    "name",
+                    "company",
+                    "item_code",
+                    "location",
+                    "asset_category",
+                    "value_after_depreciation",
+                    "calculate_depreciation",
+                ],
+                order_by="modified desc",
+            ):
+                if asset_data.name not in seen:
+                    seen.add(asset_data.name)
+                    asset_records.append(asset_data)
+
+    # Same values as ERPNext's get_value_after_depreciation, without loading each doc
+    values_after_depreciation = get_values_after_depreciation(asset_records)
+
+    assets_by_name = {}
+    assets_by_item = {}
+    for asset_data in asset_records:
+        assets_by_name[asset_data.name] = asset_data
+        assets_by_item.setdefault(asset_data.item_code, []).append(asset_data)
+
+    results = {}
+    system_data = []
+
+    for row in rows:
+        if not row.item_code and not row.asset:
+            system_data.append({})
+            continue
+
+        key = ("asset", row.asset) if row.asset else ("item", row.item_code, row.location or None)
+        if key not in results:
+            if row.asset:
+                assets = [assets_by_name[row.asset]] if row.asset in assets_by_name else []
+            else:
+                assets = [
+                    asset_data
+                    for asset_data in assets_by_item.get(row.item_code, [])
+                    if not row.location or asset_data.location == row.location
+                ]
+
+            if not assets:
+                results[key] = {"quantity": 0, "value": 0, "asset_category": ""}
+            else:
+                results[key] = {
+                    "quantity": len(assets),
+                    "value": sum(flt(values_after_depreciation.get(asset_data.name)) for asset_data in assets),
+                    "asset_category": assets[0].asset_category,
+                }
+
+        system_data.append(dict(results[key]))
+
+    return system_data
@@ -0,0 +1,309 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import hashlib
+from math import sqrt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt, getdate, now
+
+# Dimension -> (SQL expression over item, DocType of the value)
+# Every dimension is read from the counted row, as it was at count time
+ANOMALY_DIMENSIONS = {
+    "Location": ("item.location", "Location"),
+    "Asset Category": ("item.asset_category", "Asset Category"),
+    "Custodian": ("item.custodian", "Employee"),
+}
+
+# Running statistics summed into every anomaly row
+ANOMALY_MEASURES = [
+    "reconciliation_count",
+    "missing_count",
+    "item_count",
+    "missing_qty",
+    "system_value",
+    "missing_value",
+    "sum_t",
+    "sum_t2",
+    "sum_y",
+    "sum_ty",
+]
+
+# Scores written back after every run
+ANOMALY_SCORES = ["recurrence_rate", "loss_rate", "loss_trend", "anomaly_score", "scored_on"]
+
+# Asset Reconcile documents folded in per query
+SCORING_BATCH_SIZE = 200
+
+# Trend months are counted from here: year * 12 + month would make Σt² overflow decimal(21,9)
+TREND_EPOCH_YEAR = 2000
+
+
+class AssetReconcileAnomaly(Document):
+    """
+    Document controller for Asset Reconcile Anomaly
+    Rows are maintained by score_reconciliations (daily) and on cancel of Asset Reconcile.
+    """
+    pass
+
+
+def on_doctype_update():
+    """Index the dashboard query: top scores of a company and dimension"""
+    frappe.db.add_index("Asset Reconcile Anomaly", ["company", "dimension", "anomaly_score"])
+
+
+def score_reconciliations():
+    """
+    Scheduler job: fold new submissions into the anomaly statistics
+
+    Only submitted Asset Reconcile documents not scored yet are read. Their
+    items are aggregated in SQL per document and dimension value, added to
+    the running statistics of every dimension, and the scores of the
+    affected companies are recomputed.
+    """
+    companies = set()
+
+    while True:
+        docs = frappe.get_all(
+            "Asset Reconcile",
+            filters={"docstatus": 1, "anomaly_scored": 0},
+            fields=["name", "company"],
+            order_by="name asc",
+            limit_page_length=SCORING_BATCH_SIZE,
+        )
+        if not docs:
+            break
+
+        names = [doc.name for doc in docs]
+        update_anomaly_statistics(names)
+        frappe.db.sql(
+            "update `tabAsset Reconcile` set anomaly_scored = 1 where name in %s",
+            (names,),
+        )
+        frappe.db.commit()
+        companies.update(doc.company for doc in docs)
+
+    for company in companies:
+        update_anomaly_scores(company)
+    frappe.db.commit()
+
+
+def update_anomaly_statistics(names, sign=1):
+    """
+    Add (or take out) Asset Reconcile documents to the running statistics
+
+    Per dimension, one query aggregates the items of all documents by
+    (document, dimension value). Every group then counts as one observation:
+    a reconciliation, missing or not, with loss rate y = missing value /
+    system value at month t (see get_trend_month). The sums kept (n, Σt, Σt², Σy, Σty) are enough
+    to compute the least squares trend of the loss rate later.
+
+    Args:
+            names(list): Asset Reconcile names
+            sign(int, optional): 1 when scoring, -1 on cancel of a scored document
+    """
+    for dimension, (expression, dimension_doctype) in ANOMALY_DIMENSIONS.items():
+        groups = frappe.db.sql(
+            f"""
+            select
+                reconcile.company,
+                reconcile.reconciliation_date,
+                {expression} as dimension_value,
+                count(*) as item_count,
+                sum(item.system_value) as system_value,
+                sum(case when item.variance_qty < 0 then -item.variance_qty else 0 end) as missing_qty,
+                sum(case when item.variance_value < 0 then -item.variance_value else 0 end) as missing_value
+            from `tabAsset Reconcile Item` item
+            inner join `tabAsset Reconcile` reconcile on reconcile.name = item.parent
+            where item.parent in %(names)s
+                and item.parenttype = 'Asset Reconcile'
+                and {expression} is not null
+                and {expression} != ''
+            group by reconcile.name, reconcile.company, reconcile.reconciliation_date, {expression}
+            """,
+            {"names": names},
+            as_dict=True,
+        )
+
+        statistics = {}
+        for group in groups:
+            key = (group.company, group.dimension_value)
+            row = statistics.setdefault(key, dict.fromkeys(ANOMALY_MEASURES, 0))
+
+            t = get_trend_month(group.reconciliation_date)
+            y = flt(group.missing_value) / flt(group.system_value) if flt(group.system_value) else 0
+
+            row["reconciliation_count"] += 1
+            row["missing_count"] += 1 if flt(group.missing_qty) > 0 else 0
+            row["item_count"] += group.item_count
+            row["missing_qty"] += flt(group.missing_qty)
+            row["system_value"] += flt(group.system_value)
+            row["missing_value"] += flt(group.missing_value)
+            row["sum_t"] += t
+            row["sum_t2"] += t * t
+            row["sum_y"] += y
+            row["sum_ty"] += t * y
+
+        upsert_anomaly_statistics(dimension, dimension_doctype, statistics, sign)
+
+
+def upsert_anomaly_statistics(dimension, dimension_doctype, statistics, sign=1):
+    """Add statistics per (company, dimension value) to the anomaly rows in one statement"""
+    if not statistics:
+        return
+
+    timestamp = now()
+    user = frappe.session.user
+    columns = [
+        "name",
+        "creation",
+        "modified",
+        "owner",
+        "modified_by",
+        "docstatus",
+        "idx",
+        "company",
+        "dimension",
+        "dimension_doctype",
+        "dimension_value",
+        *ANOMALY_MEASURES,
+    ]
+
+    values = []
+    for (company, dimension_value), row in statistics.items():
+        values.extend(
+            [
+                get_anomaly_name(company, dimension, dimension_value),
+                timestamp,
+                timestamp,
+                user,
+                user,
+                0,
+                0,
+                company,
+                dimension,
+                dimension_doctype,
+                dimension_value,
+                *(sign * row[measure] for measure in ANOMALY_MEASURES),
+            ]
+        )
+
+    placeholders = ", ".join(["({})".format(", ".join(["%s"] * len(columns)))] * len(statistics))
+    updates = ", ".join(f"`{column}` = `{column}` + values(`{column}`)" for column in ANOMALY_MEASURES)
+
+    frappe.db.sql(
+        f"""
+        insert into `tabAsset Reconcile Anomaly` ({", ".join(f"`{column}`" for column in columns)})
+        values {placeholders}
+        on duplicate key update {updates}, `modified` = values(`modified`), `modified_by` = values(`modified_by`)
+        """,
+        values,
+    )
+
+
+def update_anomaly_scores(company):
+    """
+    Recompute the scores of every anomaly row of a company
+
+    Per row: recurrence rate (reconciliations with missing assets / all),
+    value-weighted loss rate (missing value / system value) and loss trend
+    (least squares slope of the loss rate per month). The anomaly score is
+    the mean z-score of the three within the same dimension, so the values
+    that stand out from their peers rank first.
+
+    Args:
+            company(str): Company to rescore
+    """
+    # Every reconciliation of these was cancelled
+    frappe.db.delete("Asset Reconcile Anomaly", {"company": company, "reconciliation_count": ("<=", 0)})
+
+    rows = frappe.get_all(
+        "Asset Reconcile Anomaly",
+        filters={"company": company, "reconciliation_count": (">", 0)},
+        fields=["name", "dimension", *ANOMALY_MEASURES],
+    )
+
+    rows_by_dimension = {}
+    for row in rows:
+        row.recurrence_rate = flt(row.missing_count) / flt(row.reconciliation_count)
+        row.loss_rate = flt(row.missing_value) / flt(row.system_value) if flt(row.system_value) else 0
+        row.loss_trend = get_trend(row)
+        rows_by_dimension.setdefault(row.dimension, []).append(row)
+
+    scored_on = now()
+    values = []
+    for dimension_rows in rows_by_dimension.values():
+        z_scores = [get_z_scores([row[measure] for row in dimension_rows]) for measure in ANOMALY_SCORES[:3]]
+        for i, row in enumerate(dimension_rows):
+            anomaly_score = sum(z[i] for z in z_scores) / len(z_scores)
+            values.extend(
+                [
+                    row.name,
+                    flt(row.recurrence_rate * 100, 3),
+                    flt(row.loss_rate * 100, 3),
+                    flt(row.loss_trend, 6),
+                    flt(anomaly_score, 3),
+                    scored_on,
+                ]
+            )
+
+    if not values:
+        return
+
+    columns = ["name", *ANOMALY_SCORES]
+    placeholders = ", ".join(["({})".format(", ".join(["%s"] * len(columns)))] * (len(values) // len(columns)))
+    updates = ", ".join(f"`{column}` = values(`{column}`)" for column in ANOMALY_SCORES)
+
+    # Rows exist already: the insert only ever takes the update path
+    frappe.db.sql(
+        f"""
+        insert into `tabAsset Reconcile Anomaly` ({", ".join(f"`{column}`" for column in columns)})
+        values {placeholders}
+        on duplicate key update {updates}
+        """,
+        values,
+    )
+
+
+def get_trend_month(date):
+    """Months from January of TREND_EPOCH_YEAR to a date"""
+    date = getdate(date)
+    return (date.year - TREND_EPOCH_YEAR) * 12 + date.month - 1
+
+
+def get_trend(row):
+    """Least squares slope of the loss rate per month, from the running sums"""
+    n = flt(row.reconciliation_count)
+    denominator = n * flt(row.sum_t2) - flt(row.sum_t) ** 2
+    if n < 2 or denominator <= 0:
+        return 0
+
+    return (n * flt(row.sum_ty) - flt(row.sum_t) * flt(row.sum_y)) / denominator
+
+
+def get_z_scores(values):
+    """Standard scores of a list of values (all 0 when they do not vary)"""
+    mean = sum(values) / len(values)
+    deviation = sqrt(sum((value - mean) ** 2 for value in values) / len(values))
+    if not deviation:
+        return [0] * len(values)
+
+    return [(value - mean) / deviation for value in values]
+
+
+def get_anomaly_name(company, dimension, dimension_value):
+    """Build the anomaly row name of a company, dimension and value"""
+    key = "|".join([company or "", dimension, dimension_value or ""])
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def rebuild_anomaly_scores():
+    """
+    Rebuild the anomaly statistics from every submitted Asset Reconcile
+
+    Used to backfill history; regular updates happen in the daily job.
+    """
+    frappe.db.delete("Asset Reconcile Anomaly")
+    frappe.db.sql("update `tabAsset Reconcile` set anomaly_scored = 0")
+    score_reconciliations()
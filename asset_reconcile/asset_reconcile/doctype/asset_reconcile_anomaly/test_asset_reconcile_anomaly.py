@@ -0,0 +1,130 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import flt
+
+from asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile import get_assets_by_filters
+from asset_reconcile.asset_reconcile.doctype.asset_reconcile_anomaly.asset_reconcile_anomaly import (
+	get_anomaly_name,
+	get_trend,
+	get_trend_month,
+	get_z_scores,
+	score_reconciliations,
+)
+from asset_reconcile.benchmarks.generator import cleanup, generate
+
+
+class TestAssetReconcileAnomaly(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		# generate and scoring commit: drop the data set afterwards
+		cls.context = generate("tiny")
+
+	@classmethod
+	def tearDownClass(cls):
+		cleanup("tiny", keep_masters=False)
+		super().tearDownClass()
+
+	def test_trend_from_running_sums(self):
+		# Loss rate 0.1, 0.2, 0.3 in three consecutive months: slope 0.1 per month
+		points = [
+			(get_trend_month(date), y) for date, y in [("2025-11-30", 0.1), ("2025-12-01", 0.2), ("2026-01-15", 0.3)]
+		]
+		self.assertEqual([t for t, y in points], [310, 311, 312])
+		row = frappe._dict(
+			reconciliation_count=len(points),
+			sum_t=sum(t for t, y in points),
+			sum_t2=sum(t * t for t, y in points),
+			sum_y=sum(y for t, y in points),
+			sum_ty=sum(t * y for t, y in points),
+		)
+		self.assertAlmostEqual(get_trend(row), 0.1)
+
+	def test_z_scores(self):
+		self.assertEqual(get_z_scores([5, 5, 5]), [0, 0, 0])
+		self.assertEqual(get_z_scores([1, 3]), [-1, 1])
+
+	def test_score_and_cancel_upsert_statistics(self):
+		company = self.context.company
+		location = self.context.locations[0]
+		asset = frappe.get_all(
+			"Asset", filters={"company": company, "location": location, "docstatus": 1}, limit=1, pluck="name"
+		)[0]
+		employee = make_employee(company)
+		# Scoring commits: undo the custodian and the employee, committed as well
+		self.addCleanup(frappe.db.commit)
+		self.addCleanup(frappe.delete_doc, "Employee", employee, force=True, ignore_permissions=True)
+		self.addCleanup(frappe.db.set_value, "Asset", asset, "custodian", None)
+		frappe.db.set_value("Asset", asset, "custodian", employee)
+
+		custodian_row = get_anomaly_name(company, "Custodian", employee)
+		location_row = get_anomaly_name(company, "Location", location)
+		before = get_anomaly_values(location_row)
+
+		first = make_submitted_reconcile(company, location, missing_asset=asset)
+		# The asset changes hands after the count: its variance stays with the custodian who held it
+		frappe.db.set_value("Asset", asset, "custodian", None)
+		score_reconciliations()
+
+		self.assertEqual(get_anomaly_values(custodian_row)["reconciliation_count"], 1)
+		self.assertEqual(get_anomaly_values(custodian_row)["missing_qty"], 1)
+		self.assertEqual(
+			get_anomaly_values(location_row)["reconciliation_count"], before["reconciliation_count"] + 1
+		)
+
+		# A second reconciliation of the location adds to the same row (on duplicate key update)
+		make_submitted_reconcile(company, location)
+		score_reconciliations()
+		after = get_anomaly_values(location_row)
+		self.assertEqual(after["reconciliation_count"], before["reconciliation_count"] + 2)
+		self.assertEqual(after["missing_count"], before["missing_count"] + 1)
+
+		# Cancel takes the scored document out again (sign -1)
+		first.reload()
+		first.cancel()
+		after_cancel = get_anomaly_values(location_row)
+		self.assertEqual(after_cancel["reconciliation_count"], before["reconciliation_count"] + 1)
+		self.assertEqual(after_cancel["missing_count"], before["missing_count"])
+		self.assertAlmostEqual(after_cancel["missing_qty"], before["missing_qty"])
+		# No reconciliation left for the custodian: the row is dropped
+		self.assertFalse(frappe.db.exists("Asset Reconcile Anomaly", custodian_row))
+
+
+def make_employee(company):
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "Employee",
+				"first_name": "Reconcile Custodian",
+				"company": company,
+				"gender": "Female",
+				"date_of_birth": "1990-01-01",
+				"date_of_joining": "2020-01-01",
+				"status": "Active",
+			}
+		)
+		.insert(ignore_permissions=True)
+		.name
+	)
+
+
+def make_submitted_reconcile(company, location, missing_asset=None):
+	doc = frappe.new_doc("Asset Reconcile")
+	doc.company = company
+	doc.location = location
+	doc.set("assets", get_assets_by_filters(company=company, location=location))
+	for row in doc.assets:
+		if row.asset == missing_asset:
+			row.reconcile_qty = 0
+	doc.insert()
+	doc.submit()
+	return doc
+
+
+def get_anomaly_values(anomaly_name):
+	fields = ["reconciliation_count", "missing_count", "missing_qty"]
+	values = frappe.db.get_value("Asset Reconcile Anomaly", anomaly_name, fields, as_dict=True) or {}
+	return {field: flt(values.get(field)) for field in fields}
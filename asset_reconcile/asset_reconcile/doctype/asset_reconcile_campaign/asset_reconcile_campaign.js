@@ -0,0 +1,64 @@
+// Copyright (c) 2026, abdopcnet@gmail.com and contributors
+// For license information, please see license.txt
+
+/**
+ * Client-side form events for Asset Reconcile Campaign
+ * Starts the campaign and follows its progress per location
+ */
+frappe.ui.form.on('Asset Reconcile Campaign', {
+	/**
+	 * Setup function: Called once when form is created
+	 * Reloads the campaign whenever a location finishes
+	 */
+	setup(frm) {
+		frappe.realtime.on('asset_reconcile_campaign_progress', (data) => {
+			if (data.campaign === frm.doc.name && !frm.is_dirty()) {
+				frm.reload_doc();
+			}
+		});
+	},
+
+	/**
+	 * Refresh event: Called every time form is refreshed
+	 * Shows progress and the start / retry / resume button
+	 */
+	refresh(frm) {
+		if (frm.is_new()) {
+			return;
+		}
+
+		if (frm.doc.total_locations) {
+			const done = cint(frm.doc.completed_locations) + cint(frm.doc.failed_locations);
+			frm.dashboard.show_progress(
+				__('Locations'),
+				(done / frm.doc.total_locations) * 100,
+				__('{0} of {1} locations done, {2} failed', [
+					done,
+					frm.doc.total_locations,
+					cint(frm.doc.failed_locations),
+				]),
+			);
+		}
+
+		const label =
+			frm.doc.status === 'Draft'
+				? __('Start')
+				: frm.doc.status === 'Partially Completed' || cint(frm.doc.failed_locations)
+					? __('Retry Failed Locations')
+					: frm.doc.status === 'In Progress'
+						? __('Resume Stalled Locations')
+						: null;
+
+		if (label) {
+			frm.add_custom_button(label, () => {
+				frm.call('start').then((r) => {
+					frappe.show_alert({
+						message: __('{0} workers started', [r.message || 0]),
+						indicator: 'green',
+					});
+					frm.reload_doc();
+				});
+			}).addClass('btn-primary');
+		}
+	},
+});
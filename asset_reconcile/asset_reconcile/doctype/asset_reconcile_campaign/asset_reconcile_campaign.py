@@ -0,0 +1,264 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import cint, flt
+from frappe.utils.background_jobs import is_job_enqueued
+
+from asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile import (
+    get_asset_filters,
+    populate_assets_job,
+)
+
+# Used when max_parallel_jobs is not set
+DEFAULT_PARALLEL_JOBS = 4
+
+
+class AssetReconcileCampaign(Document):
+    """
+    Document controller for Asset Reconcile Campaign
+    Creates one draft Asset Reconcile per location of a location tree
+    """
+
+    def validate(self):
+        """
+        Main validation method
+        Called before saving the document
+        Loads the locations of the tree while the campaign is a draft
+        """
+        if self.status == "Draft":
+            self.set_locations()
+
+    def set_locations(self):
+        """
+        Fill the locations table with every location of the tree that holds assets
+
+        Asset counts are read with one aggregate query over the whole tree.
+        """
+        filters = get_asset_filters(self.company, self.location, include_sub_locations=True)
+
+        location_counts = frappe.get_all(
+            "Asset",
+            filters=filters,
+            fields=["location", "count(name) as asset_count"],
+            group_by="location",
+            order_by="location asc",
+        )
+
+        self.set("locations", [])
+        for row in location_counts:
+            self.append(
+                "locations",
+                {"location": row.location, "asset_count": row.asset_count, "status": "Pending"},
+            )
+
+        self.total_locations = len(self.locations)
+        self.total_assets = sum(row.asset_count for row in location_counts)
+
+    @frappe.whitelist()
+    def start(self):
+        """
+        Start (or retry) the campaign
+
+        Failed locations, and Running locations whose worker job is gone
+        (see get_stale_locations), are reset to Pending, then up to
+        max_parallel_jobs workers are enqueued. Every worker keeps claiming
+        pending locations until none are left, so the number of locations
+        fetched at the same time never exceeds the cap.
+        """
+        self.check_permission("write")
+
+        if not self.locations:
+            frappe.throw(_("No locations with assets found under {0}").format(frappe.bold(self.location)))
+
+        # Retry failed locations, and locations left running by a worker that died
+        retry_locations = frappe.get_all(
+            "Asset Reconcile Campaign Location", filters={"parent": self.name, "status": "Failed"}, pluck="name"
+        )
+        retry_locations += get_stale_locations(self.name)
+        if retry_locations:
+            frappe.db.sql(
+                """
+                update `tabAsset Reconcile Campaign Location`
+                set status = 'Pending', error = null, worker = null
+                where name in %s
+                """,
+                (retry_locations,),
+            )
+        self.db_set("status", "In Progress")
+
+        pending = frappe.db.count("Asset Reconcile Campaign Location", {"parent": self.name, "status": "Pending"})
+        workers = min(cint(self.max_parallel_jobs) or DEFAULT_PARALLEL_JOBS, pending)
+
+        for worker in range(workers):
+            worker_id = f"{self.name}::{worker}"
+            frappe.enqueue(
+                "asset_reconcile.asset_reconcile.doctype.asset_reconcile_campaign.asset_reconcile_campaign.run_campaign_worker",
+                queue="long",
+                timeout=6 * 3600,
+                job_id=get_worker_job_id(worker_id),
+                deduplicate=True,
+                enqueue_after_commit=True,
+                campaign=self.name,
+                worker=worker_id,
+            )
+
+        return workers
+
+
+def run_campaign_worker(campaign, worker):
+    """
+    Background job: fetch assets for pending campaign locations one by one
+
+    Args:
+            campaign(str): Asset Reconcile Campaign name
+            worker(str): Worker id, used to claim locations
+    """
+    company = frappe.db.get_value("Asset Reconcile Campaign", campaign, "company")
+
+    while location_row := claim_next_location(campaign, worker):
+        try:
+            doc = frappe.new_doc("Asset Reconcile")
+            doc.company = company
+            doc.location = location_row.location
+            # The assets table is filled by populate_assets_job
+            doc.flags.ignore_mandatory = True
+            doc.insert()
+
+            populate_assets_job(doc.name)
+
+            totals = frappe.db.get_value(
+                "Asset Reconcile", doc.name, ["total_system_qty", "total_system_value"], as_dict=True
+            )
+            frappe.db.set_value(
+                "Asset Reconcile Campaign Location",
+                location_row.name,
+                {
+                    "status": "Completed",
+                    "asset_reconcile": doc.name,
+                    "asset_count": cint(flt(totals.total_system_qty)),
+                    "total_system_value": flt(totals.total_system_value),
+                },
+                update_modified=False,
+            )
+        except Exception:
+            frappe.db.rollback()
+            frappe.log_error(
+                title=_("Asset Reconcile Campaign {0} failed for {1}").format(campaign, location_row.location)
+            )
+            frappe.db.set_value(
+                "Asset Reconcile Campaign Location",
+                location_row.name,
+                {"status": "Failed", "error": frappe.get_traceback()[-1000:]},
+                update_modified=False,
+            )
+
+        update_campaign_progress(campaign)
+        frappe.db.commit()
+
+
+def get_worker_job_id(worker):
+    """Build the background job id of a campaign worker"""
+    return f"asset_reconcile_campaign::{worker}"
+
+
+def get_stale_locations(campaign):
+    """
+    Find Running locations left behind by a worker that died
+
+    A worker runs as one background job and claims locations until none
+    are left. Once its job is neither queued nor started (killed, timed out,
+    worker restarted), its Running location will never finish.
+
+    Args:
+            campaign(str): Asset Reconcile Campaign name
+
+    Returns:
+            list: Asset Reconcile Campaign Location names
+    """
+    rows = frappe.get_all(
+        "Asset Reconcile Campaign Location",
+        filters={"parent": campaign, "status": "Running"},
+        fields=["name", "worker"],
+    )
+    return [row.name for row in rows if not row.worker or not is_job_enqueued(get_worker_job_id(row.worker))]
+
+
+def claim_next_location(campaign, worker):
+    """
+    Atomically claim the next pending location of a campaign
+
+    Args:
+            campaign(str): Asset Reconcile Campaign name
+            worker(str): Worker id
+
+    Returns:
+            dict: Claimed Asset Reconcile Campaign Location row (name, location) or None
+    """
+    frappe.db.sql(
+        """
+        update `tabAsset Reconcile Campaign Location`
+        set status = 'Running', worker = %(worker)s
+        where parent = %(campaign)s and status = 'Pending'
+        order by idx asc
+        limit 1
+        """,
+        {"campaign": campaign, "worker": worker},
+    )
+    frappe.db.commit()
+
+    rows = frappe.get_all(
+        "Asset Reconcile Campaign Location",
+        filters={"parent": campaign, "status": "Running", "worker": worker},
+        fields=["name", "location"],
+        limit=1,
+    )
+    return rows[0] if rows else None
+
+
+def update_campaign_progress(campaign):
+    """
+    Refresh campaign counters and status from its location rows
+
+    Args:
+            campaign(str): Asset Reconcile Campaign name
+    """
+    counts = dict(
+        frappe.db.sql(
+            """
+            select status, count(*)
+            from `tabAsset Reconcile Campaign Location`
+            where parent = %s
+            group by status
+            """,
+            (campaign,),
+        )
+    )
+    total_system_value = frappe.db.sql(
+        """
+        select sum(total_system_value)
+        from `tabAsset Reconcile Campaign Location`
+        where parent = %s and status = 'Completed'
+        """,
+        (campaign,),
+    )[0][0]
+
+    values = {
+        "completed_locations": counts.get("Completed", 0),
+        "failed_locations": counts.get("Failed", 0),
+        "total_system_value": flt(total_system_value),
+    }
+    if not counts.get("Pending") and not counts.get("Running"):
+        values["status"] = "Partially Completed" if counts.get("Failed") else "Completed"
+
+    frappe.db.set_value("Asset Reconcile Campaign", campaign, values)
+
+    frappe.publish_realtime(
+        "asset_reconcile_campaign_progress",
+        {"campaign": campaign, **values},
+        doctype="Asset Reconcile Campaign",
+        docname=campaign,
+        after_commit=True,
+    )
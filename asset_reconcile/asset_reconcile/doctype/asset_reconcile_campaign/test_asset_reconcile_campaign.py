@@ -0,0 +1,129 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import flt
+
+from asset_reconcile.asset_reconcile.doctype.asset_reconcile_campaign.asset_reconcile_campaign import (
+	get_worker_job_id,
+	run_campaign_worker,
+	update_campaign_progress,
+)
+from asset_reconcile.benchmarks.generator import cleanup, generate
+
+CAMPAIGN_MODULE = "asset_reconcile.asset_reconcile.doctype.asset_reconcile_campaign.asset_reconcile_campaign"
+
+
+class TestAssetReconcileCampaign(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		# generate and the campaign workers commit: drop the data set afterwards
+		cls.context = generate("tiny")
+
+	@classmethod
+	def tearDownClass(cls):
+		cleanup("tiny", keep_masters=False)
+		super().tearDownClass()
+
+	def test_start_runs_every_location(self):
+		campaign = make_campaign(self.context, max_parallel_jobs=2)
+		self.assertEqual(sorted(row.location for row in campaign.locations), sorted(self.context.locations))
+
+		with patch("frappe.enqueue") as enqueue:
+			self.assertEqual(campaign.start(), 2)
+
+		self.assertEqual(
+			[call.kwargs["job_id"] for call in enqueue.call_args_list],
+			[get_worker_job_id(f"{campaign.name}::{worker}") for worker in range(2)],
+		)
+		self.assertEqual(frappe.db.get_value("Asset Reconcile Campaign", campaign.name, "status"), "In Progress")
+
+		# One worker alone claims every pending location
+		run_campaign_worker(campaign.name, enqueue.call_args_list[0].kwargs["worker"])
+		campaign.reload()
+
+		self.assertEqual(campaign.status, "Completed")
+		self.assertEqual(campaign.completed_locations, campaign.total_locations)
+		for row in campaign.locations:
+			self.assertEqual(row.status, "Completed")
+			self.assertEqual(
+				frappe.db.get_value("Asset Reconcile", row.asset_reconcile, ["company", "location"]),
+				(self.context.company, row.location),
+			)
+		self.assertEqual(
+			flt(campaign.total_system_value), flt(sum(flt(row.total_system_value) for row in campaign.locations))
+		)
+
+	def test_retry_resumes_failed_and_stale_locations(self):
+		campaign = make_campaign(self.context)
+		with patch("frappe.enqueue"):
+			campaign.start()
+
+		failed, stale, running = campaign.locations[:3]
+		set_location_status(failed, "Failed", f"{campaign.name}::0")
+		set_location_status(stale, "Running", f"{campaign.name}::1")
+		set_location_status(running, "Running", f"{campaign.name}::2")
+
+		# The job of worker 1 is gone, worker 2 is still at work
+		live_job = get_worker_job_id(f"{campaign.name}::2")
+		with (
+			patch(f"{CAMPAIGN_MODULE}.is_job_enqueued", side_effect=lambda job_id: job_id == live_job),
+			patch("frappe.enqueue"),
+		):
+			campaign.start()
+
+		statuses = dict(
+			frappe.get_all(
+				"Asset Reconcile Campaign Location",
+				filters={"parent": campaign.name},
+				fields=["name", "status"],
+				as_list=True,
+			)
+		)
+		self.assertEqual(statuses[failed.name], "Pending")
+		self.assertEqual(statuses[stale.name], "Pending")
+		self.assertEqual(statuses[running.name], "Running")
+
+	def test_progress_counts_locations(self):
+		campaign = make_campaign(self.context)
+		with patch("frappe.enqueue"):
+			campaign.start()
+
+		failed, *completed = campaign.locations
+		set_location_status(failed, "Failed")
+		for row in completed:
+			set_location_status(row, "Completed")
+			frappe.db.set_value("Asset Reconcile Campaign Location", row.name, "total_system_value", 10)
+
+		update_campaign_progress(campaign.name)
+		campaign.reload()
+
+		self.assertEqual(campaign.status, "Partially Completed")
+		self.assertEqual(campaign.completed_locations, len(completed))
+		self.assertEqual(campaign.failed_locations, 1)
+		self.assertEqual(flt(campaign.total_system_value), 10 * len(completed))
+
+		# Retried: a location still running keeps the campaign in progress
+		campaign.db_set("status", "In Progress")
+		set_location_status(failed, "Running")
+		update_campaign_progress(campaign.name)
+		campaign.reload()
+
+		self.assertEqual(campaign.status, "In Progress")
+		self.assertEqual(campaign.failed_locations, 0)
+
+
+def make_campaign(context, max_parallel_jobs=4):
+	campaign = frappe.new_doc("Asset Reconcile Campaign")
+	campaign.company = context.company
+	campaign.location = context.root_location
+	campaign.max_parallel_jobs = max_parallel_jobs
+	return campaign.insert()
+
+
+def set_location_status(row, status, worker=None):
+	frappe.db.set_value("Asset Reconcile Campaign Location", row.name, {"status": status, "worker": worker})
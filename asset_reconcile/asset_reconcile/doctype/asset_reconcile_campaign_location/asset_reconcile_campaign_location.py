@@ -0,0 +1,12 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+from frappe.model.document import Document
+
+
+class AssetReconcileCampaignLocation(Document):
+    """
+    Document controller for Asset Reconcile Campaign Location child table.
+    Rows are created and updated by the campaign runner.
+    """
+    pass
@@ -0,0 +1,19 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class AssetReconcileScan(Document):
+    """
+    Document controller for Asset Reconcile Scan
+    Append-only scan log of multi-counter Asset Reconcile documents.
+    Rows are bulk-inserted by append_scans and folded into the document by merge_scan_log.
+    """
+    pass
+
+
+def on_doctype_update():
+    """Index used to find the unmerged scans of a document"""
+    frappe.db.add_index("Asset Reconcile Scan", ["asset_reconcile", "merged"])
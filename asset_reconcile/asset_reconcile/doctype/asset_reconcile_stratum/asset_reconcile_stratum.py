@@ -0,0 +1,12 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+from frappe.model.document import Document
+
+
+class AssetReconcileStratum(Document):
+    """
+    Document controller for Asset Reconcile Stratum child table.
+    Rows are built with the cycle count sample and their estimates updated on save.
+    """
+    pass
@@ -0,0 +1,160 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import hashlib
+from collections import Counter
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import get_first_day, now
+
+# Document counts summed into every summary row, one per report grouping:
+# a reconciliation adds 1 to its (location, category) rows, and fractions
+# to the others so it counts once per location, per category and in total
+SUMMARY_COUNTS = ["reconciliation_count", "location_share", "category_share", "document_share"]
+
+# Measures summed into every summary row
+SUMMARY_MEASURES = [
+    "item_count",
+    "system_qty",
+    "reconcile_qty",
+    "variance_qty",
+    "system_value",
+    "reconcile_value",
+    "variance_value",
+    "missing_qty",
+    "missing_value",
+]
+
+
+class AssetReconcileSummary(Document):
+    """
+    Document controller for Asset Reconcile Summary
+    Rows are maintained by update_reconcile_summary on submit and cancel of Asset Reconcile.
+    """
+    pass
+
+
+def update_reconcile_summary(doc, sign=1):
+    """
+    Add (or take out) an Asset Reconcile to the variance summary
+
+    Aggregates the items of the document per location and asset category
+    in one query and upserts them into the summary row of the same company
+    and month, so reports never have to scan Asset Reconcile Item.
+
+    A document is spread over several rows, so besides reconciliation_count
+    every row gets its share of the document per location, per category and
+    overall (see SUMMARY_COUNTS): summed over any grouping, the document
+    counts once.
+
+    Args:
+            doc(Document): Submitted or cancelled Asset Reconcile (name, company
+                    and reconciliation_date are used)
+            sign(int, optional): 1 on submit, -1 on cancel
+    """
+    groups = frappe.db.sql(
+        """
+        select
+            ifnull(location, '') as location,
+            ifnull(asset_category, '') as asset_category,
+            count(*) as item_count,
+            sum(system_qty) as system_qty,
+            sum(reconcile_qty) as reconcile_qty,
+            sum(variance_qty) as variance_qty,
+            sum(system_value) as system_value,
+            sum(reconcile_value) as reconcile_value,
+            sum(variance_value) as variance_value,
+            sum(case when variance_qty < 0 then variance_qty else 0 end) as missing_qty,
+            sum(case when variance_value < 0 then variance_value else 0 end) as missing_value
+        from `tabAsset Reconcile Item`
+        where parent = %s and parenttype = 'Asset Reconcile'
+        group by ifnull(location, ''), ifnull(asset_category, '')
+        """,
+        (doc.name,),
+        as_dict=True,
+    )
+    if not groups:
+        return
+
+    period = get_first_day(doc.reconciliation_date)
+    timestamp = now()
+    user = frappe.session.user
+    columns = [
+        "name",
+        "creation",
+        "modified",
+        "owner",
+        "modified_by",
+        "docstatus",
+        "idx",
+        "company",
+        "period",
+        "location",
+        "asset_category",
+        *SUMMARY_COUNTS,
+        *SUMMARY_MEASURES,
+    ]
+
+    categories_per_location = Counter(group.location for group in groups)
+    locations_per_category = Counter(group.asset_category for group in groups)
+
+    values = []
+    for group in groups:
+        values.extend(
+            [
+                get_summary_name(doc.company, period, group.location, group.asset_category),
+                timestamp,
+                timestamp,
+                user,
+                user,
+                0,
+                0,
+                doc.company,
+                period,
+                group.location,
+                group.asset_category,
+                sign,
+                sign / categories_per_location[group.location],
+                sign / locations_per_category[group.asset_category],
+                sign / len(groups),
+                *(sign * (group[measure] or 0) for measure in SUMMARY_MEASURES),
+            ]
+        )
+
+    placeholders = ", ".join(["({})".format(", ".join(["%s"] * len(columns)))] * len(groups))
+    updates = ", ".join(
+        f"`{column}` = `{column}` + values(`{column}`)"
+        for column in [*SUMMARY_COUNTS, *SUMMARY_MEASURES]
+    )
+
+    frappe.db.sql(
+        f"""
+        insert into `tabAsset Reconcile Summary` ({", ".join(f"`{column}`" for column in columns)})
+        values {placeholders}
+        on duplicate key update {updates}, `modified` = values(`modified`), `modified_by` = values(`modified_by`)
+        """,
+        values,
+    )
+
+
+def get_summary_name(company, period, location, asset_category):
+    """Build the summary row name of a company, month, location and category"""
+    key = "|".join([company or "", str(period), location or "", asset_category or ""])
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def rebuild_reconcile_summary():
+    """
+    Rebuild the whole summary from submitted Asset Reconcile documents
+
+    Used to backfill history; regular updates happen on submit and cancel.
+    """
+    frappe.db.delete("Asset Reconcile Summary")
+
+    for doc in frappe.get_all(
+        "Asset Reconcile",
+        filters={"docstatus": 1},
+        fields=["name", "company", "reconciliation_date"],
+    ):
+        update_reconcile_summary(doc)
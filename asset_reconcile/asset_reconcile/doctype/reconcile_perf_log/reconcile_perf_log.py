@@ -0,0 +1,20 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Interval
+from frappe.query_builder.functions import Now
+
+
+class ReconcilePerfLog(Document):
+    """
+    Document controller for Reconcile Perf Log
+    Rows are queued by asset_reconcile.asset_reconcile.perf.instrument for sampled calls.
+    """
+
+    @staticmethod
+    def clear_old_logs(days=7):
+        """Delete logs older than days, called by Log Settings (see default_log_clearing_doctypes)"""
+        table = frappe.qb.DocType("Reconcile Perf Log")
+        frappe.db.delete(table, filters=(table.creation < (Now() - Interval(days=days))))
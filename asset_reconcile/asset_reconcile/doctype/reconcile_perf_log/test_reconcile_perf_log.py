@@ -0,0 +1,22 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, now_datetime
+
+from asset_reconcile.asset_reconcile.doctype.reconcile_perf_log.reconcile_perf_log import ReconcilePerfLog
+
+
+class TestReconcilePerfLog(FrappeTestCase):
+	def test_clear_old_logs(self):
+		old_log = frappe.get_doc({"doctype": "Reconcile Perf Log", "method": "old"}).insert()
+		new_log = frappe.get_doc({"doctype": "Reconcile Perf Log", "method": "new"}).insert()
+		frappe.db.set_value(
+			"Reconcile Perf Log", old_log.name, "creation", add_days(now_datetime(), -10), update_modified=False
+		)
+
+		ReconcilePerfLog.clear_old_logs(days=7)
+
+		self.assertFalse(frappe.db.exists("Reconcile Perf Log", old_log.name))
+		self.assertTrue(frappe.db.exists("Reconcile Perf Log", new_log.name))
@@ -0,0 +1,137 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import csv
+import os
+
+import frappe
+from frappe import _
+from frappe.utils import flt, now_datetime
+
+# Asset Reconcile Item rows read per query while exporting
+EXPORT_CHUNK_SIZE = 2000
+
+# Exported columns: (label, key in the exported row)
+EXPORT_COLUMNS = [
+    ("No.", "idx"),
+    ("Asset", "asset"),
+    ("Asset Name", "asset_name"),
+    ("Item Code", "item_code"),
+    ("Location", "location"),
+    ("Asset Category", "asset_category"),
+    ("System Qty", "system_qty"),
+    ("System Value", "system_value"),
+    ("Reconcile Qty", "reconcile_qty"),
+    ("Reconcile Value", "reconcile_value"),
+    ("Variance Qty", "variance_qty"),
+    ("Variance Value", "variance_value"),
+    ("Notes", "notes"),
+]
+
+
+def iter_export_rows(docname, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream the assets table of an Asset Reconcile in idx order
+
+    Rows are read in chunks by keyset on (idx, name), so memory stays flat
+    whatever the size of the table. Variance fields are computed with the
+    same formula as AssetReconcile.calculate_totals.
+
+    Args:
+            docname(str): Asset Reconcile name
+            chunk_size(int, optional): Rows read per query
+
+    Yields:
+            dict: Row with every key of EXPORT_COLUMNS
+    """
+    from asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile import get_row_variance
+
+    last_idx, last_name = 0, ""
+    while True:
+        rows = frappe.db.sql(
+            """
+            select
+                item.name, item.idx, item.asset, asset.asset_name, item.item_code,
+                item.location, item.asset_category, item.system_qty, item.system_value,
+                item.reconcile_qty, item.notes
+            from `tabAsset Reconcile Item` item
+            left join `tabAsset` asset on asset.name = item.asset
+            where item.parent = %(parent)s
+                and item.parenttype = 'Asset Reconcile'
+                and (item.idx > %(idx)s or (item.idx = %(idx)s and item.name > %(name)s))
+            order by item.idx asc, item.name asc
+            limit %(limit)s
+            """,
+            {"parent": docname, "idx": last_idx, "name": last_name, "limit": chunk_size},
+            as_dict=True,
+        )
+        if not rows:
+            return
+
+        for row in rows:
+            row.reconcile_value, row.variance_qty, row.variance_value = get_row_variance(
+                flt(row.system_qty), flt(row.system_value), flt(row.reconcile_qty)
+            )
+            yield row
+
+        if len(rows) < chunk_size:
+            return
+        last_idx, last_name = rows[-1].idx, rows[-1].name
+
+
+def write_export_file(docname, file_format="CSV"):
+    """
+    Write the assets table of an Asset Reconcile to a private file
+
+    The file is written row by row to disk (XLSX uses openpyxl's write-only
+    mode) and attached to the document.
+
+    Args:
+            docname(str): Asset Reconcile name
+            file_format(str, optional): CSV or XLSX
+
+    Returns:
+            str: file_url of the attached File
+    """
+    file_format = (file_format or "CSV").upper()
+    if file_format not in ("CSV", "XLSX"):
+        frappe.throw(_("Export format must be CSV or XLSX"))
+
+    file_name = "{}-{}.{}".format(
+        docname, now_datetime().strftime("%Y%m%d%H%M%S"), file_format.lower()
+    )
+    file_path = frappe.get_site_path("private", "files", file_name)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    header = [_(label) for label, key in EXPORT_COLUMNS]
+    keys = [key for label, key in EXPORT_COLUMNS]
+
+    if file_format == "CSV":
+        with open(file_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for row in iter_export_rows(docname):
+                writer.writerow([row.get(key) for key in keys])
+    else:
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(docname[:31])
+        sheet.append(header)
+        for row in iter_export_rows(docname):
+            sheet.append([row.get(key) for key in keys])
+        workbook.save(file_path)
+
+    file_doc = frappe.get_doc(
+        {
+            "doctype": "File",
+            "file_name": file_name,
+            "file_url": f"/private/files/{file_name}",
+            "is_private": 1,
+            "attached_to_doctype": "Asset Reconcile",
+            "attached_to_name": docname,
+        }
+    )
+    file_doc.insert(ignore_permissions=True)
+
+    return file_doc.file_url
@@ -0,0 +1,130 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+
+from asset_reconcile.asset_reconcile.barcode import get_ambiguous_barcodes
+
+# Composite indexes on ERPNext tables: (DocType, index name, columns)
+# Secondary indexes carry the primary key (name), so queries reading only
+# these columns and name never touch the table rows
+RECONCILE_INDEXES = [
+    # get_assets_by_filters / populate: company, location (IN over the tree), status, docstatus
+    ("Asset", "asset_reconcile_scope", ["company", "docstatus", "location", "status"]),
+    # Barcode lookup 3: item barcode -> assets of the item, filtered by company and location
+    ("Asset", "asset_reconcile_item", ["item_code", "docstatus", "company", "location", "modified"]),
+    ("Item Barcode", "asset_reconcile_barcode", ["barcode", "parenttype", "parent"]),
+]
+
+# Columns every DocType table has
+STANDARD_COLUMNS = ("name", "docstatus", "modified", "parent", "parenttype")
+
+# Query paths checked with EXPLAIN: name -> (query, table alias, indexes expected)
+INDEX_CHECKS = {
+    "asset_scope": (
+        """
+        select asset.name from `tabAsset` asset
+        where asset.company = %(company)s and asset.docstatus = 1
+            and asset.location in %(locations)s
+            and asset.status not in ('Sold', 'Scrapped', 'Capitalized')
+        """,
+        "asset",
+        ("asset_reconcile_scope",),
+    ),
+    "custom_barcode": (
+        """
+        select asset.name, asset.modified from `tabAsset` asset
+        where asset.custom_barcode in %(values)s and asset.docstatus = 1
+        """,
+        "asset",
+        # Barcode lookup 1: served by the unique index of the custom field
+        ("custom_barcode",),
+    ),
+    "item_barcode": (
+        """
+        select item_barcode.barcode, asset.name from `tabItem Barcode` item_barcode
+        inner join `tabAsset` asset on asset.item_code = item_barcode.parent
+        where item_barcode.barcode in %(values)s and item_barcode.parenttype = 'Item'
+            and asset.docstatus = 1 and asset.company = %(company)s
+        """,
+        "item_barcode",
+        ("asset_reconcile_barcode",),
+    ),
+}
+
+
+def after_migrate():
+    """
+    Migration hook: create the reconcile indexes and report on them
+
+    Idempotent, runs after every migrate: missing indexes are added, then
+    the query paths are checked with EXPLAIN and barcodes that make scans
+    ambiguous are counted. Nothing fails the migration; findings are printed
+    and logged.
+    """
+    add_reconcile_indexes()
+
+    unused = [check for check in check_index_usage() if not check["used"]]
+    for check in unused:
+        print(
+            "Asset Reconcile: {} does not use index {} (uses {})".format(
+                check["query"], " or ".join(check["expected"]), check["key"] or "no index"
+            )
+        )
+
+    ambiguous = get_ambiguous_barcodes()
+    if ambiguous:
+        print(f"Asset Reconcile: {len(ambiguous)} ambiguous barcodes, see the Error Log")
+        frappe.log_error(
+            title="Asset Reconcile: ambiguous barcodes",
+            message="\n".join(
+                f"{row.barcode}: {row.reason} ({', '.join(row.assets)})" for row in ambiguous
+            )[:100000],
+        )
+
+
+def add_reconcile_indexes():
+    """Add the composite indexes of RECONCILE_INDEXES that do not exist yet"""
+    for doctype, index_name, columns in RECONCILE_INDEXES:
+        meta = frappe.get_meta(doctype)
+        # custom_barcode is a custom field, it may not be synced yet
+        if not all(column in STANDARD_COLUMNS or meta.has_field(column) for column in columns):
+            continue
+
+        frappe.db.add_index(doctype, columns, index_name)
+
+
+def check_index_usage():
+    """
+    Check with EXPLAIN which index each reconcile query path uses
+
+    Sample values are read from the site, so the optimizer sees realistic
+    statistics. On a near-empty table it may prefer a full scan, which is
+    reported as not used. Only MariaDB plans are read.
+
+    Returns:
+            list: One dict per query: query, expected (index names), key (index chosen) and used
+    """
+    if frappe.db.db_type != "mariadb":
+        return []
+
+    params = {
+        "company": frappe.db.get_value("Asset", {"docstatus": 1}, "company") or "",
+        "locations": frappe.get_all("Location", limit_page_length=5, pluck="name") or [""],
+        "values": frappe.get_all(
+            "Item Barcode", filters={"parenttype": "Item"}, limit_page_length=5, pluck="barcode"
+        )
+        or [""],
+    }
+    has_custom_barcode = frappe.get_meta("Asset").has_field("custom_barcode")
+
+    checks = []
+    for name, (query, alias, expected) in INDEX_CHECKS.items():
+        if name == "custom_barcode" and not has_custom_barcode:
+            continue
+
+        plan = frappe.db.sql(f"explain {query}", params, as_dict=True)
+        key = next((row.key for row in plan if row.table == alias), None)
+        checks.append({"query": name, "expected": expected, "key": key, "used": key in expected})
+
+    return checks
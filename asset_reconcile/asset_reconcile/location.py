@@ -0,0 +1,89 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+
+# Redis hash holding the descendant index: location -> [location, descendants in lft order]
+LOCATION_DESCENDANTS_CACHE_KEY = "asset_reconcile_location_descendants"
+
+
+def get_descendant_locations(location):
+    """
+    Get a location and all locations under it
+
+    Resolves the Location nested set (lft/rgt) with a single range query and
+    keeps the result in the descendant index, so repeated fetches of the
+    same site cost a single Redis lookup.
+
+    Args:
+            location(str): Root location
+
+    Returns:
+            list: Location names, the root first
+    """
+    locations = frappe.cache().hget(LOCATION_DESCENDANTS_CACHE_KEY, location)
+    if locations is None:
+        locations = get_descendant_locations_from_db(location)
+        frappe.cache().hset(LOCATION_DESCENDANTS_CACHE_KEY, location, locations)
+
+    return locations
+
+
+def get_descendant_locations_from_db(location):
+    """Read a location and all locations under it from the nested set"""
+    lft, rgt = frappe.db.get_value("Location", location, ["lft", "rgt"]) or (None, None)
+    if lft is None:
+        return [location]
+
+    return frappe.get_all(
+        "Location",
+        filters={"lft": (">=", lft), "rgt": ("<=", rgt)},
+        order_by="lft asc",
+        pluck="name",
+    )
+
+
+def get_location_filter(location, include_sub_locations=False):
+    """
+    Build the Asset location filter of a reconciliation
+
+    Args:
+            location(str): Reconciled location
+            include_sub_locations(bool, optional): Match every location under it too
+
+    Returns:
+            str|tuple: Location name, or an "in" filter over the location tree
+    """
+    if not include_sub_locations:
+        return location
+
+    locations = get_descendant_locations(location)
+    return ("in", locations) if len(locations) > 1 else location
+
+
+def is_in_location(asset_location, location, include_sub_locations=False):
+    """
+    Whether an asset location belongs to a reconciled location
+
+    Args:
+            asset_location(str): Location of the asset
+            location(str): Reconciled location (empty matches every location)
+            include_sub_locations(bool, optional): Locations under it belong to it too
+
+    Returns:
+            bool
+    """
+    if not location or asset_location == location:
+        return True
+
+    return bool(include_sub_locations) and asset_location in get_descendant_locations(location)
+
+
+def clear_location_index(doc=None, method=None):
+    """
+    Invalidate the descendant index
+
+    Called from Location doc events: adding, moving, renaming or deleting a
+    location changes the nested set of its whole tree.
+    """
+    frappe.cache().delete_value(LOCATION_DESCENDANTS_CACHE_KEY)
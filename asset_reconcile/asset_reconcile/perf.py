@@ -0,0 +1,184 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import functools
+import json
+import random
+import time
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import cint, flt, now
+
+# site_config key: share of calls to record, 0 (default) turns instrumentation off, 1 records every call
+PERF_SAMPLE_RATE_KEY = "asset_reconcile_perf_sample_rate"
+
+# Calls faster than this (ms) are not logged, even when sampled
+PERF_MIN_DURATION_KEY = "asset_reconcile_perf_min_duration"
+
+
+class PerfRecorder:
+    """
+    Timings, SQL queries and cache lookups of one instrumented call
+    """
+
+    def __init__(self, method):
+        self.method = method
+        self.started_at = now()
+        self.start = time.perf_counter()
+        self.query_count = 0
+        self.query_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Stage name -> {"calls", "ms", "queries"}
+        self.stages = {}
+        self.stage_stack = []
+
+    def record_query(self, duration):
+        self.query_count += 1
+        self.query_time += duration
+        for stage in self.stage_stack:
+            self.stages[stage]["queries"] += 1
+
+    def as_log(self, error=None):
+        return {
+            "method": self.method,
+            "user": frappe.session.user,
+            "started_at": self.started_at,
+            "duration_ms": flt((time.perf_counter() - self.start) * 1000, 3),
+            "query_count": self.query_count,
+            "query_time_ms": flt(self.query_time * 1000, 3),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "stages": json.dumps(
+                {name: {**stage, "ms": flt(stage["ms"], 3)} for name, stage in self.stages.items()},
+                indent=1,
+            ),
+            "error": error,
+        }
+
+
+def instrument(fn):
+    """
+    Record timing, SQL queries and cache lookups of a whitelisted method
+
+    Off unless asset_reconcile_perf_sample_rate is set in site_config. A
+    sampled call is written to Reconcile Perf Log through deferred insert
+    (a Redis list flushed by the scheduler), so the request itself does no
+    extra database write. Calls made from inside another instrumented call
+    are folded into the outer one.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if get_recorder() or not is_sampled():
+            return fn(*args, **kwargs)
+
+        recorder = PerfRecorder(f"{fn.__module__}.{fn.__qualname__}")
+        frappe.local.asset_reconcile_perf = recorder
+        error = None
+        try:
+            with track_queries(recorder.record_query):
+                return fn(*args, **kwargs)
+        except Exception as e:
+            error = repr(e)[:140]
+            raise
+        finally:
+            frappe.local.asset_reconcile_perf = None
+            save_perf_log(recorder, error)
+
+    return wrapper
+
+
+def is_sampled():
+    """Whether the current call is recorded, per the configured sample rate"""
+    sample_rate = flt(frappe.conf.get(PERF_SAMPLE_RATE_KEY))
+    return sample_rate > 0 and (sample_rate >= 1 or random.random() < sample_rate)
+
+
+def get_recorder():
+    """PerfRecorder of the instrumented call in progress, or None"""
+    return getattr(frappe.local, "asset_reconcile_perf", None)
+
+
+@contextmanager
+def perf_stage(name):
+    """
+    Time a stage of an instrumented call
+
+    Costs nothing when the call is not sampled. Stages can be nested; SQL
+    queries are counted in every enclosing stage.
+
+    Args:
+            name(str): Stage name, repeated stages are summed
+    """
+    recorder = get_recorder()
+    if not recorder:
+        yield
+        return
+
+    stage = recorder.stages.setdefault(name, {"calls": 0, "ms": 0.0, "queries": 0})
+    recorder.stage_stack.append(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage["calls"] += 1
+        stage["ms"] += (time.perf_counter() - start) * 1000
+        recorder.stage_stack.pop()
+
+
+def record_cache(hit, count=1):
+    """
+    Count cache hits or misses of the instrumented call in progress
+
+    Args:
+            hit(bool): True for a hit, False for a miss
+            count(int, optional): Number of lookups
+    """
+    recorder = get_recorder()
+    if not recorder:
+        return
+    if hit:
+        recorder.cache_hits += count
+    else:
+        recorder.cache_misses += count
+
+
+@contextmanager
+def track_queries(callback):
+    """
+    Call `callback(duration)` for every frappe.db.sql run inside the block
+
+    Args:
+            callback(callable): Gets the query duration in seconds
+    """
+    original_sql = frappe.db.sql
+
+    def sql(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_sql(*args, **kwargs)
+        finally:
+            callback(time.perf_counter() - start)
+
+    frappe.db.sql = sql
+    try:
+        yield
+    finally:
+        frappe.db.sql = original_sql
+
+
+def save_perf_log(recorder, error=None):
+    """Queue a Reconcile Perf Log for the scheduler to insert"""
+    from frappe.deferred_insert import deferred_insert
+
+    log = recorder.as_log(error)
+    if not error and log["duration_ms"] < cint(frappe.conf.get(PERF_MIN_DURATION_KEY)):
+        return
+
+    try:
+        deferred_insert("Reconcile Perf Log", [log])
+    except Exception:
+        # Instrumentation must never break the call it measures
+        pass
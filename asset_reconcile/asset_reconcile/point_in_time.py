@@ -0,0 +1,243 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import flt, get_datetime, getdate
+
+from asset_reconcile.asset_reconcile.perf import perf_stage
+from asset_reconcile.asset_reconcile.valuation import (
+    VALUATION_CHUNK_SIZE,
+    get_value_precision,
+    get_values_after_depreciation,
+)
+
+
+def get_as_of_datetime(reconciliation_date, reconciliation_time=None):
+    """
+    Point in time of a count: the reconciliation date at the reconciliation time
+
+    Without a time the end of the day is used, so everything posted on that
+    date is included.
+    """
+    return get_datetime(f"{getdate(reconciliation_date)} {reconciliation_time or '23:59:59.999999'}")
+
+
+def get_asset_records_as_of(filters, fields, as_of, locations=None):
+    """
+    Get Asset records as they were at a point in time
+
+    Candidates are the assets matching filters now, plus assets moved out of
+    the locations since then. Their location and value are then rolled back
+    to as_of (see apply_asset_timelines) and assets that were not at the
+    locations, not yet received or already disposed at that time are left out.
+
+    Args:
+            filters(dict): Asset filters (see get_asset_filters), without
+                    location and disposal status filters
+            fields(list): Asset fields to read
+            as_of(datetime): Point in time
+            locations(list, optional): Locations of the count, None for every location
+
+    Returns:
+            list: Asset records with location and value_after_depreciation as of as_of
+    """
+    fields = list(dict.fromkeys([*fields, "disposal_date"]))
+
+    with perf_stage("asset_query"):
+        current_filters = dict(filters)
+        if locations:
+            current_filters["location"] = ("in", locations)
+        asset_records = frappe.get_all("Asset", filters=current_filters, fields=fields, order_by="asset_name")
+
+        if locations:
+            # Assets that were at the locations and were moved away since
+            known = {asset.name for asset in asset_records}
+            moved_away = [name for name in get_assets_moved_from(locations, as_of) if name not in known]
+            for start in range(0, len(moved_away), VALUATION_CHUNK_SIZE):
+                asset_records.extend(
+                    frappe.get_all(
+                        "Asset",
+                        filters={**filters, "name": ("in", moved_away[start : start + VALUATION_CHUNK_SIZE])},
+                        fields=fields,
+                        order_by="asset_name",
+                    )
+                )
+
+    asset_records = apply_asset_timelines(asset_records, as_of)
+
+    location_set = set(locations or [])
+    return [asset for asset in asset_records if not location_set or asset.location in location_set]
+
+
+def apply_asset_timelines(asset_records, as_of):
+    """
+    Roll the location and value of assets back to a point in time
+
+    The current value (see get_values_after_depreciation) is the starting
+    point; events after as_of are replayed newest first:
+    - Asset Movement: the asset was at the source location before it
+      (a Receipt that is not a return from an employee means not yet received)
+    - posted depreciation: the value was higher by the depreciation amount
+    - Asset Value Adjustment: the value differed by the adjustment
+
+    Assets disposed on or before as_of, or not yet received, are left out.
+
+    Args:
+            asset_records(list): Asset records with ASSET_FETCH_FIELDS and disposal_date
+            as_of(datetime): Point in time
+
+    Returns:
+            list: Records in service at as_of, location and value_after_depreciation updated
+    """
+    as_of = get_datetime(as_of)
+    values = get_values_after_depreciation(asset_records)
+    timelines = get_asset_timelines([asset.name for asset in asset_records], as_of)
+
+    in_service = []
+    for asset in asset_records:
+        if asset.get("disposal_date") and getdate(asset.disposal_date) <= as_of.date():
+            continue
+
+        location = asset.location
+        value = flt(values.get(asset.name))
+        received = True
+
+        for event in timelines.get(asset.name, []):
+            if event.event_type == "movement":
+                location = event.source_location
+                if event.purpose == "Receipt" and not event.from_employee:
+                    received = False
+            elif event.event_type == "depreciation":
+                value += flt(event.amount)
+            elif event.event_type == "adjustment":
+                value -= flt(event.amount)
+
+        if not received:
+            continue
+
+        asset.location = location
+        asset.value_after_depreciation = flt(value, get_value_precision(asset.company))
+        # Values are final, do not value the record again
+        asset.calculate_depreciation = 0
+        in_service.append(asset)
+
+    return in_service
+
+
+def get_asset_timelines(asset_names, as_of):
+    """
+    Build the event timeline of many assets after a point in time
+
+    Reads Asset Movements, posted depreciation (schedule rows of the default
+    finance book with a Journal Entry) and Asset Value Adjustments with one
+    query per kind and chunk, instead of loading any document.
+
+    Args:
+            asset_names(list): Asset names
+            as_of(datetime): Point in time, only later events are read
+
+    Returns:
+            dict: Asset name -> events (event_type, timestamp, ...), newest first
+    """
+    as_of = get_datetime(as_of)
+    timelines = {}
+
+    with perf_stage("asset_timelines"):
+        for start in range(0, len(asset_names), VALUATION_CHUNK_SIZE):
+            params = {
+                "assets": asset_names[start : start + VALUATION_CHUNK_SIZE],
+                "as_of": as_of,
+                "as_of_date": as_of.date(),
+            }
+
+            for event in frappe.db.sql(
+                """
+                select item.asset, 'movement' as event_type, movement.transaction_date as timestamp,
+                    movement.purpose, item.source_location, item.from_employee
+                from `tabAsset Movement Item` item
+                inner join `tabAsset Movement` movement on movement.name = item.parent
+                where item.asset in %(assets)s
+                    and movement.docstatus = 1
+                    and movement.transaction_date > %(as_of)s
+                """,
+                params,
+                as_dict=True,
+            ):
+                timelines.setdefault(event.asset, []).append(event)
+
+            # Depreciation of the first finance book row, the one get_values_after_depreciation reads
+            for event in frappe.db.sql(
+                """
+                select schedule.asset, 'depreciation' as event_type, row.schedule_date as timestamp,
+                    row.depreciation_amount as amount
+                from `tabDepreciation Schedule` row
+                inner join `tabAsset Depreciation Schedule` schedule on schedule.name = row.parent
+                inner join `tabAsset Finance Book` finance_book
+                    on finance_book.parent = schedule.asset
+                    and finance_book.parenttype = 'Asset'
+                    and finance_book.idx = 1
+                    and coalesce(finance_book.finance_book, '') = coalesce(schedule.finance_book, '')
+                where schedule.asset in %(assets)s
+                    and schedule.docstatus = 1
+                    and row.journal_entry is not null
+                    and row.journal_entry != ''
+                    and row.schedule_date > %(as_of_date)s
+                """,
+                params,
+                as_dict=True,
+            ):
+                timelines.setdefault(event.asset, []).append(event)
+
+            for event in frappe.db.sql(
+                """
+                select adjustment.asset, 'adjustment' as event_type, adjustment.date as timestamp,
+                    adjustment.difference_amount as amount
+                from `tabAsset Value Adjustment` adjustment
+                left join `tabAsset Finance Book` finance_book
+                    on finance_book.parent = adjustment.asset
+                    and finance_book.parenttype = 'Asset'
+                    and finance_book.idx = 1
+                where adjustment.asset in %(assets)s
+                    and adjustment.docstatus = 1
+                    and adjustment.date > %(as_of_date)s
+                    and coalesce(adjustment.finance_book, '') = coalesce(finance_book.finance_book, '')
+                """,
+                params,
+                as_dict=True,
+            ):
+                timelines.setdefault(event.asset, []).append(event)
+
+    for events in timelines.values():
+        events.sort(key=lambda event: get_datetime(event.timestamp), reverse=True)
+
+    return timelines
+
+
+def get_assets_moved_from(locations, as_of):
+    """
+    Get assets moved out of some locations after a point in time
+
+    Args:
+            locations(list): Location names
+            as_of(datetime): Point in time
+
+    Returns:
+            list: Asset names
+    """
+    asset_names = set()
+    for start in range(0, len(locations), VALUATION_CHUNK_SIZE):
+        asset_names.update(
+            frappe.db.sql_list(
+                """
+                select distinct item.asset
+                from `tabAsset Movement Item` item
+                inner join `tabAsset Movement` movement on movement.name = item.parent
+                where item.source_location in %(locations)s
+                    and movement.docstatus = 1
+                    and movement.transaction_date > %(as_of)s
+                """,
+                {"locations": locations[start : start + VALUATION_CHUNK_SIZE], "as_of": get_datetime(as_of)},
+            )
+        )
+
+    return sorted(asset_names)
@@ -0,0 +1,327 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import now_datetime
+
+from asset_reconcile.asset_reconcile.location import is_in_location
+
+# Assets moved by one Asset Movement
+MOVEMENT_CHUNK_SIZE = 500
+
+# Asset statuses that can no longer be transferred or scrapped
+CLOSED_ASSET_STATUSES = ("Sold", "Scrapped", "Capitalized", "Cancelled")
+
+
+def enqueue_variance_posting(docname, reverse=False):
+    """
+    Enqueue posting (or reversing) the variances of a submitted Asset Reconcile
+
+    The job id is fixed per document and action, so a second request while
+    one is queued or running is dropped.
+
+    Args:
+            docname(str): Asset Reconcile name
+            reverse(bool, optional): Reverse the postings instead
+    """
+    action = "reverse" if reverse else "post"
+    frappe.enqueue(
+        f"asset_reconcile.asset_reconcile.posting.{action}_variances",
+        queue="long",
+        timeout=6 * 3600,
+        job_id=f"asset_reconcile_posting::{docname}::{action}",
+        deduplicate=True,
+        enqueue_after_commit=True,
+        docname=docname,
+    )
+
+
+def post_variances(docname):
+    """
+    Background job: post the variances of a submitted Asset Reconcile
+
+    - Counted here, but registered at another location (system_qty 0):
+      transferred with one Asset Movement per MOVEMENT_CHUNK_SIZE assets
+      (see post_transfers for the target location)
+    - Registered here, but not counted (reconcile_qty 0): scrapped
+
+    Every posted row keeps a reference to its Asset Movement or scrap
+    Journal Entry and work is committed chunk by chunk, so a retry after a
+    failure skips what was already posted. The comment added at the end
+    counts what was committed, also when the run failed half way.
+
+    Args:
+            docname(str): Asset Reconcile name
+    """
+    doc = frappe.get_doc("Asset Reconcile", docname)
+    if doc.docstatus != 1:
+        return
+
+    doc.db_set("posting_status", "In Progress")
+    frappe.db.commit()
+
+    errors = []
+    # Updated as chunks are committed: an exception keeps what was posted before it
+    posted = frappe._dict(moved=0, scrapped=0)
+    try:
+        post_transfers(doc, errors, posted)
+        post_scraps(doc, errors, posted)
+    except Exception:
+        frappe.db.rollback()
+        errors.append(frappe.get_traceback())
+
+    if errors:
+        frappe.log_error(
+            title=_("Posting variances of Asset Reconcile {0} failed").format(docname),
+            message="\n\n".join(errors)[:100000],
+            reference_doctype="Asset Reconcile",
+            reference_name=docname,
+        )
+
+    doc.db_set("posting_status", "Failed" if errors else "Posted")
+    message = (
+        _("Variances partially posted: {0} assets transferred, {1} assets scrapped, {2} errors")
+        if errors
+        else _("Variances posted: {0} assets transferred, {1} assets scrapped, {2} errors")
+    )
+    doc.add_comment("Info", message.format(posted.moved, posted.scrapped, len(errors)))
+    frappe.db.commit()
+
+
+def post_transfers(doc, errors, posted):
+    """
+    Transfer assets counted outside their registered location
+
+    The target is the row location when it lies in the reconciled location
+    (tree): the counter recorded where the asset was found. Otherwise it is
+    the reconciled location itself. A scanned row keeps the registered
+    location of the asset, and a scan only tells the asset is somewhere in
+    the tree, so with include_sub_locations the root is the one location
+    known to hold it. An asset already in the tree is then left where it is.
+
+    Args:
+            doc(AssetReconcile): Submitted Asset Reconcile
+            errors(list): Error messages are appended here
+            posted(dict): moved is incremented for every committed chunk
+    """
+    if not doc.location:
+        return
+
+    rows = frappe.get_all(
+        "Asset Reconcile Item",
+        filters={
+            "parent": doc.name,
+            "parenttype": "Asset Reconcile",
+            "system_qty": 0,
+            "reconcile_qty": (">", 0),
+            "asset_movement": ("is", "not set"),
+        },
+        fields=["name", "asset", "location"],
+        order_by="idx asc",
+    )
+    if not rows:
+        return
+
+    assets = {
+        asset.name: asset
+        for asset in frappe.get_all(
+            "Asset",
+            filters={"name": ("in", [row.asset for row in rows])},
+            fields=["name", "location", "status", "docstatus"],
+        )
+    }
+
+    for row in rows:
+        if row.location and is_in_location(row.location, doc.location, doc.include_sub_locations):
+            row.target_location = row.location
+        else:
+            row.target_location = doc.location
+
+    # Only assets still registered elsewhere and open can be moved
+    rows = [
+        row
+        for row in rows
+        if row.asset in assets
+        and assets[row.asset].docstatus == 1
+        and assets[row.asset].status not in CLOSED_ASSET_STATUSES
+        and assets[row.asset].location != row.target_location
+        and (
+            row.target_location != doc.location
+            or not is_in_location(assets[row.asset].location, doc.location, doc.include_sub_locations)
+        )
+    ]
+
+    for start in range(0, len(rows), MOVEMENT_CHUNK_SIZE):
+        chunk = rows[start : start + MOVEMENT_CHUNK_SIZE]
+        try:
+            movement = frappe.get_doc(
+                {
+                    "doctype": "Asset Movement",
+                    "company": doc.company,
+                    "purpose": "Transfer",
+                    "transaction_date": now_datetime(),
+                    "reference_doctype": "Asset Reconcile",
+                    "reference_name": doc.name,
+                    "assets": [
+                        {
+                            "asset": row.asset,
+                            "source_location": assets[row.asset].location,
+                            "target_location": row.target_location,
+                        }
+                        for row in chunk
+                    ],
+                }
+            )
+            movement.insert()
+            movement.submit()
+
+            frappe.db.sql(
+                "update `tabAsset Reconcile Item` set asset_movement = %s where name in %s",
+                (movement.name, [row.name for row in chunk]),
+            )
+            frappe.db.commit()
+            posted.moved += len(chunk)
+        except Exception:
+            frappe.db.rollback()
+            errors.append(frappe.get_traceback())
+
+
+def post_scraps(doc, errors, posted):
+    """
+    Scrap assets registered at the location that were not found
+
+    ERPNext has no bulk scrapping document: every asset is scrapped with its
+    own disposal Journal Entry (erpnext scrap_asset), committed one by one.
+
+    Args:
+            doc(AssetReconcile): Submitted Asset Reconcile
+            errors(list): Error messages are appended here
+            posted(dict): scrapped is incremented for every committed asset
+    """
+    from erpnext.assets.doctype.asset.depreciation import scrap_asset
+
+    rows = frappe.get_all(
+        "Asset Reconcile Item",
+        filters={
+            "parent": doc.name,
+            "parenttype": "Asset Reconcile",
+            "system_qty": (">", 0),
+            "reconcile_qty": 0,
+            "journal_entry": ("is", "not set"),
+        },
+        fields=["name", "asset"],
+        order_by="idx asc",
+    )
+
+    for row in rows:
+        try:
+            asset = frappe.db.get_value(
+                "Asset", row.asset, ["status", "docstatus", "journal_entry_for_scrap"], as_dict=True
+            )
+            if not asset or asset.docstatus != 1:
+                continue
+
+            # Scrapped by an earlier attempt that failed before recording it
+            if asset.status != "Scrapped":
+                if asset.status in CLOSED_ASSET_STATUSES:
+                    continue
+                scrap_asset(row.asset)
+                asset.journal_entry_for_scrap = frappe.db.get_value(
+                    "Asset", row.asset, "journal_entry_for_scrap"
+                )
+
+            frappe.db.set_value(
+                "Asset Reconcile Item",
+                row.name,
+                "journal_entry",
+                asset.journal_entry_for_scrap,
+                update_modified=False,
+            )
+            frappe.db.commit()
+            posted.scrapped += 1
+        except Exception:
+            frappe.db.rollback()
+            errors.append(f"{row.asset}: {frappe.get_traceback()}")
+
+
+def reverse_variances(docname):
+    """
+    Background job: reverse the postings of a cancelled Asset Reconcile
+
+    Asset Movements are cancelled (newest first, so every asset goes back to
+    its previous location) and scrapped assets are restored, which cancels
+    their scrap Journal Entry. References are cleared as rows are reversed,
+    so a retry continues where a failed run stopped.
+
+    Args:
+            docname(str): Asset Reconcile name
+    """
+    from erpnext.assets.doctype.asset.depreciation import restore_asset
+
+    frappe.db.set_value("Asset Reconcile", docname, "posting_status", "Reversing", update_modified=False)
+    frappe.db.commit()
+
+    errors = []
+
+    movements = frappe.get_all(
+        "Asset Reconcile Item",
+        filters={"parent": docname, "parenttype": "Asset Reconcile", "asset_movement": ("is", "set")},
+        pluck="asset_movement",
+        distinct=True,
+    )
+    for movement in sorted(movements, reverse=True):
+        try:
+            movement_doc = frappe.get_doc("Asset Movement", movement)
+            if movement_doc.docstatus == 1:
+                movement_doc.cancel()
+            frappe.db.sql(
+                "update `tabAsset Reconcile Item` set asset_movement = null where parent = %s and asset_movement = %s",
+                (docname, movement),
+            )
+            frappe.db.commit()
+        except Exception:
+            frappe.db.rollback()
+            errors.append(frappe.get_traceback())
+
+    scrapped_rows = frappe.get_all(
+        "Asset Reconcile Item",
+        filters={"parent": docname, "parenttype": "Asset Reconcile", "journal_entry": ("is", "set")},
+        fields=["name", "asset"],
+    )
+    for row in scrapped_rows:
+        try:
+            if frappe.db.get_value("Asset", row.asset, "status") == "Scrapped":
+                restore_asset(row.asset)
+            frappe.db.set_value("Asset Reconcile Item", row.name, "journal_entry", None, update_modified=False)
+            frappe.db.commit()
+        except Exception:
+            frappe.db.rollback()
+            errors.append(f"{row.asset}: {frappe.get_traceback()}")
+
+    if errors:
+        frappe.log_error(
+            title=_("Reversing variances of Asset Reconcile {0} failed").format(docname),
+            message="\n\n".join(errors)[:100000],
+            reference_doctype="Asset Reconcile",
+            reference_name=docname,
+        )
+
+    frappe.db.set_value(
+        "Asset Reconcile", docname, "posting_status", "Failed" if errors else "Reversed", update_modified=False
+    )
+    frappe.db.commit()
+
+
+def has_postings(docname):
+    """Whether any row of an Asset Reconcile was posted"""
+    return bool(
+        frappe.db.exists(
+            "Asset Reconcile Item",
+            {"parent": docname, "parenttype": "Asset Reconcile", "asset_movement": ("is", "set")},
+        )
+        or frappe.db.exists(
+            "Asset Reconcile Item",
+            {"parent": docname, "parenttype": "Asset Reconcile", "journal_entry": ("is", "set")},
+        )
+    )
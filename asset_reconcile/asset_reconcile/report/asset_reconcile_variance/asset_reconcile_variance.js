@@ -0,0 +1,48 @@
+// Copyright (c) 2026, abdopcnet@gmail.com and contributors
+// For license information, please see license.txt
+
+frappe.query_reports['Asset Reconcile Variance'] = {
+	filters: [
+		{
+			fieldname: 'company',
+			label: __('Company'),
+			fieldtype: 'Link',
+			options: 'Company',
+			default: frappe.defaults.get_user_default('Company'),
+			reqd: 1,
+		},
+		{
+			fieldname: 'from_date',
+			label: __('From Date'),
+			fieldtype: 'Date',
+			default: frappe.datetime.add_months(frappe.datetime.get_today(), -12),
+			reqd: 1,
+		},
+		{
+			fieldname: 'to_date',
+			label: __('To Date'),
+			fieldtype: 'Date',
+			default: frappe.datetime.get_today(),
+			reqd: 1,
+		},
+		{
+			fieldname: 'location',
+			label: __('Location'),
+			fieldtype: 'Link',
+			options: 'Location',
+		},
+		{
+			fieldname: 'asset_category',
+			label: __('Asset Category'),
+			fieldtype: 'Link',
+			options: 'Asset Category',
+		},
+		{
+			fieldname: 'group_by',
+			label: __('Group By'),
+			fieldtype: 'Select',
+			options: ['Location', 'Asset Category', 'Period', 'Location and Asset Category'],
+			default: 'Location',
+		},
+	],
+};
@@ -0,0 +1,134 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import flt, get_first_day
+
+from asset_reconcile.asset_reconcile.doctype.asset_reconcile_summary.asset_reconcile_summary import (
+    SUMMARY_MEASURES,
+)
+
+# Summary columns to group by for every "Group By" option
+GROUP_BY_FIELDS = {
+    "Location": ["location"],
+    "Asset Category": ["asset_category"],
+    "Period": ["period"],
+    "Location and Asset Category": ["location", "asset_category"],
+}
+
+# Summary count giving one per reconciliation, by the dimensions a report row is
+# pinned to (grouped by or filtered on): (location, asset category) -> column
+RECONCILIATION_COUNT_FIELDS = {
+    (True, True): "reconciliation_count",
+    (True, False): "location_share",
+    (False, True): "category_share",
+    (False, False): "document_share",
+}
+
+
+def execute(filters=None):
+    """
+    Variance of submitted Asset Reconcile documents by location, category and period
+
+    Reads the pre-aggregated Asset Reconcile Summary, so the report cost
+    depends on the number of locations, categories and months, not on
+    the number of reconciled items.
+    """
+    filters = frappe._dict(filters or {})
+    group_by = GROUP_BY_FIELDS.get(filters.group_by) or GROUP_BY_FIELDS["Location"]
+
+    columns = get_columns(group_by)
+    data = get_data(filters, group_by)
+
+    return columns, data, None, get_chart(data, group_by)
+
+
+def get_columns(group_by):
+    """Build report columns for the selected grouping"""
+    group_columns = {
+        "location": {
+            "label": _("Location"),
+            "fieldname": "location",
+            "fieldtype": "Link",
+            "options": "Location",
+            "width": 180,
+        },
+        "asset_category": {
+            "label": _("Asset Category"),
+            "fieldname": "asset_category",
+            "fieldtype": "Link",
+            "options": "Asset Category",
+            "width": 160,
+        },
+        "period": {"label": _("Period"), "fieldname": "period", "fieldtype": "Date", "width": 110},
+    }
+
+    return [group_columns[fieldname] for fieldname in group_by] + [
+        {"label": _("Reconciliations"), "fieldname": "reconciliation_count", "fieldtype": "Int", "width": 110},
+        {"label": _("Items"), "fieldname": "item_count", "fieldtype": "Int", "width": 90},
+        {"label": _("System Qty"), "fieldname": "system_qty", "fieldtype": "Float", "width": 100},
+        {"label": _("Reconcile Qty"), "fieldname": "reconcile_qty", "fieldtype": "Float", "width": 110},
+        {"label": _("Variance Qty"), "fieldname": "variance_qty", "fieldtype": "Float", "width": 100},
+        {"label": _("Missing Qty"), "fieldname": "missing_qty", "fieldtype": "Float", "width": 100},
+        {"label": _("System Value"), "fieldname": "system_value", "fieldtype": "Currency", "width": 130},
+        {"label": _("Reconcile Value"), "fieldname": "reconcile_value", "fieldtype": "Currency", "width": 130},
+        {"label": _("Variance Value"), "fieldname": "variance_value", "fieldtype": "Currency", "width": 130},
+        {"label": _("Missing Value"), "fieldname": "missing_value", "fieldtype": "Currency", "width": 130},
+    ]
+
+
+def get_data(filters, group_by):
+    """Aggregate summary rows for the filters"""
+    query_filters = {
+        "company": filters.company,
+        "period": ("between", [get_first_day(filters.from_date), filters.to_date]),
+    }
+    if filters.location:
+        query_filters["location"] = filters.location
+    if filters.asset_category:
+        query_filters["asset_category"] = filters.asset_category
+
+    # A reconciliation spans several summary rows: sum the count that adds up to one per row
+    count_field = RECONCILIATION_COUNT_FIELDS[
+        (
+            "location" in group_by or bool(filters.location),
+            "asset_category" in group_by or bool(filters.asset_category),
+        )
+    ]
+
+    data = frappe.get_all(
+        "Asset Reconcile Summary",
+        filters=query_filters,
+        fields=[
+            *group_by,
+            f"sum({count_field}) as reconciliation_count",
+            *(f"sum({measure}) as {measure}" for measure in SUMMARY_MEASURES),
+        ],
+        group_by=", ".join(group_by),
+        order_by=", ".join(group_by),
+    )
+
+    # Shares are fractions, their sums are whole numbers up to rounding
+    for row in data:
+        row.reconciliation_count = round(flt(row.reconciliation_count))
+
+    return data
+
+
+def get_chart(data, group_by):
+    """Bar chart of variance value per group"""
+    if not data:
+        return None
+
+    return {
+        "data": {
+            "labels": [" / ".join(str(row.get(fieldname) or "") for fieldname in group_by) for row in data],
+            "datasets": [
+                {"name": _("Variance Value"), "values": [row.variance_value for row in data]},
+                {"name": _("Missing Value"), "values": [row.missing_value for row in data]},
+            ],
+        },
+        "type": "bar",
+        "fieldtype": "Currency",
+    }
@@ -0,0 +1,244 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import random
+from math import sqrt
+
+from frappe.utils import cint, flt
+
+# Value bands per asset category, cut so every band holds the same total value
+SAMPLING_VALUE_BANDS = 3
+
+# Smallest sample of a stratum: a variance needs two observations
+MIN_STRATUM_SAMPLE = 2
+
+# Two-sided z-values of the confidence levels offered on the form
+CONFIDENCE_Z = {"90": 1.645, "95": 1.96, "99": 2.576}
+
+
+def build_cycle_count_sample(rows, sample_size, seed):
+    """
+    Draw a stratified, value-weighted sample of reconcile rows
+
+    - Key items: assets worth at least total value / sample size are all
+      counted (certainty stratum, no sampling error)
+    - The other assets are stratified by asset category and value band
+    - The sample is allocated to strata in proportion to their value (at
+      least MIN_STRATUM_SAMPLE each), then drawn at random within each stratum
+
+    The same rows, sample size and seed always give the same sample, so a
+    cycle count can be audited.
+
+    Args:
+            rows(list): Reconcile rows of the whole population (see make_reconcile_rows)
+            sample_size(int): Number of assets to count
+            seed(int): Random seed
+
+    Returns:
+            tuple: (sampled rows with stratum set, strata as dicts for Asset Reconcile Stratum)
+    """
+    sample_size = max(cint(sample_size), 1)
+    strata = get_value_strata(rows, sample_size)
+    allocation = allocate_sample(strata, sample_size)
+    rng = random.Random(cint(seed))
+
+    sample = []
+    for number, (stratum, sample_count) in enumerate(zip(strata, allocation, strict=True), start=1):
+        # Sorted by value: the draw depends on the seed only, not on the query order
+        drawn = rng.sample(stratum["rows"], sample_count)
+        for row in drawn:
+            row["stratum"] = number
+        sample.extend(drawn)
+
+        stratum["stratum"] = number
+        stratum["population_count"] = len(stratum["rows"])
+        stratum["population_value"] = sum(flt(row["system_value"]) for row in stratum["rows"])
+        stratum["sample_count"] = sample_count
+        del stratum["rows"]
+
+    return sample, strata
+
+
+def get_value_strata(rows, sample_size):
+    """
+    Split the population into the certainty stratum and category / value band strata
+
+    Args:
+            rows(list): Reconcile rows
+            sample_size(int): Number of assets to count
+
+    Returns:
+            list: Strata with asset_category, certainty, value_from, value_to and rows
+    """
+    total_value = sum(flt(row["system_value"]) for row in rows)
+    cutoff = total_value / sample_size if total_value else 0
+
+    certain = []
+    by_category = {}
+    for row in sorted(rows, key=lambda row: (flt(row["system_value"]), row["asset"])):
+        if cutoff and flt(row["system_value"]) >= cutoff:
+            certain.append(row)
+        else:
+            by_category.setdefault(row.get("asset_category") or "", []).append(row)
+
+    strata = []
+    if certain:
+        strata.append(make_stratum(certain, certainty=1))
+
+    for asset_category in sorted(by_category):
+        category_rows = by_category[asset_category]
+        category_value = sum(flt(row["system_value"]) for row in category_rows)
+        band_value = category_value / SAMPLING_VALUE_BANDS
+
+        band = []
+        bands = 0
+        cumulative = 0
+        for row in category_rows:
+            band.append(row)
+            cumulative += flt(row["system_value"])
+            # Close a band once the category value up to it reaches the next boundary
+            if band_value and cumulative >= band_value * (bands + 1):
+                strata.append(make_stratum(band, asset_category))
+                band = []
+                bands += 1
+        if band:
+            strata.append(make_stratum(band, asset_category))
+
+    return strata
+
+
+def make_stratum(rows, asset_category=None, certainty=0):
+    """Build a stratum of rows sorted by value"""
+    return {
+        "asset_category": asset_category or None,
+        "certainty": certainty,
+        "value_from": flt(rows[0]["system_value"]),
+        "value_to": flt(rows[-1]["system_value"]),
+        "rows": rows,
+    }
+
+
+def allocate_sample(strata, sample_size):
+    """
+    Share the sample size between strata in proportion to their value
+
+    The certainty stratum is counted in full. The rest of the sample is
+    rounded with the largest remainder method; every stratum gets at least
+    MIN_STRATUM_SAMPLE assets (or all of them), so the sample can end up
+    slightly larger than asked for on very small sample sizes.
+
+    Args:
+            strata(list): Strata (see get_value_strata)
+            sample_size(int): Number of assets to count
+
+    Returns:
+            list: Sample count per stratum
+    """
+    allocation = [len(stratum["rows"]) if stratum["certainty"] else 0 for stratum in strata]
+    sampled = [i for i, stratum in enumerate(strata) if not stratum["certainty"]]
+    remaining = max(sample_size - sum(allocation), 0)
+
+    values = {i: sum(flt(row["system_value"]) for row in strata[i]["rows"]) for i in sampled}
+    total_value = sum(values.values())
+
+    # Zero-value strata (or a zero-value population) share by asset count instead
+    weights = {i: values[i] if total_value else len(strata[i]["rows"]) for i in sampled}
+    total_weight = sum(weights.values())
+
+    shares = {i: remaining * weights[i] / total_weight if total_weight else 0 for i in sampled}
+    for i in sampled:
+        allocation[i] = int(shares[i])
+
+    for i in sorted(sampled, key=lambda i: shares[i] - int(shares[i]), reverse=True)[
+        : remaining - sum(allocation[i] for i in sampled)
+    ]:
+        allocation[i] += 1
+
+    for i in sampled:
+        population = len(strata[i]["rows"])
+        allocation[i] = min(max(allocation[i], MIN_STRATUM_SAMPLE), population)
+
+    return allocation
+
+
+def estimate_population_variance(strata, rows, confidence_level="95"):
+    """
+    Extrapolate the variances counted in a sample to the whole population
+
+    Stratified expansion estimator: per stratum, the mean variance of the
+    counted assets times the population count, with the variance of that
+    estimate N² (1 - n/N) s² / n. Strata estimates add up, and so do their
+    variances; the confidence interval is estimate ± z · standard error.
+
+    Rows without a stratum (assets found that were not drawn) are left out.
+
+    Args:
+            strata(list): Asset Reconcile Stratum rows, updated with their estimates
+            rows(list): Asset Reconcile Item rows
+            confidence_level(str, optional): "90", "95" or "99"
+
+    Returns:
+            dict: estimated_variance_qty / _value with their lower and upper bounds
+    """
+    z = CONFIDENCE_Z.get(str(confidence_level or "95"), CONFIDENCE_Z["95"])
+
+    rows_by_stratum = {}
+    for row in rows:
+        if cint(row.get("stratum")):
+            rows_by_stratum.setdefault(cint(row.get("stratum")), []).append(row)
+
+    estimate = {"qty": 0, "value": 0}
+    error = {"qty": 0, "value": 0}
+    for stratum in strata:
+        stratum_rows = rows_by_stratum.get(cint(stratum.get("stratum")), [])
+        population = cint(stratum.get("population_count"))
+
+        for measure in ("qty", "value"):
+            values = [flt(row.get(f"variance_{measure}")) for row in stratum_rows]
+            total, variance = get_stratum_estimate(population, values)
+            estimate[measure] += total
+            error[measure] += variance
+
+            stratum.update(
+                {f"sample_variance_{measure}": sum(values), f"estimated_variance_{measure}": total}
+            )
+
+        stratum.update({"counted_count": len(stratum_rows)})
+
+    result = {}
+    for measure in ("qty", "value"):
+        margin = z * sqrt(error[measure])
+        result[f"estimated_variance_{measure}"] = estimate[measure]
+        result[f"estimated_variance_{measure}_lower"] = estimate[measure] - margin
+        result[f"estimated_variance_{measure}_upper"] = estimate[measure] + margin
+
+    return result
+
+
+def get_stratum_estimate(population, values):
+    """
+    Estimate a stratum total from a simple random sample
+
+    Args:
+            population(int): Assets in the stratum (N)
+            values(list): Values observed on the sample (n = len(values))
+
+    Returns:
+            tuple: (estimated total, variance of the estimate)
+    """
+    n = len(values)
+    if not n or not population:
+        return 0, 0
+
+    mean = sum(values) / n
+    if n < 2 or n >= population:
+        # Census (or a single observation): no sampling variance to estimate
+        return population * mean, 0
+
+    sample_variance = sum((value - mean) ** 2 for value in values) / (n - 1)
+    return population * mean, population**2 * (1 - n / population) * sample_variance / n
+
+
+def get_sample_seed():
+    """New random seed for a cycle count sample"""
+    return random.SystemRandom().randrange(1, 2**31)
@@ -0,0 +1,265 @@
+# Copyright (c) 2025, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.meta import get_field_precision
+from frappe.utils import cstr, flt, nowdate
+from frappe.utils.caching import request_cache
+
+from asset_reconcile.asset_reconcile.perf import perf_stage, record_cache
+
+# Max number of asset names passed in a single IN (...) clause
+VALUATION_CHUNK_SIZE = 1000
+
+# Redis hash per valuation date: asset name -> finance book value after depreciation
+VALUATION_CACHE_KEY = "asset_reconcile_valuation::{0}"
+
+# Redis set of the valuation dates currently cached (used to invalidate every date)
+VALUATION_DATES_CACHE_KEY = "asset_reconcile_valuation_dates"
+
+# Seconds a valuation date stays cached, depreciation is posted daily
+VALUATION_CACHE_TTL = 24 * 3600
+
+# Max assets cached per valuation date, the whole date is evicted when reached
+VALUATION_CACHE_MAX_ASSETS = 500_000
+
+
+def get_values_after_depreciation(assets, valuation_date=None):
+    """
+    Get value after depreciation for many assets using bulk queries
+
+    Set-based equivalent of calling Asset.get_value_after_depreciation()
+    on every asset. Instead of loading each Asset document (with its finance
+    books and schedules) into the document cache, the first finance book row
+    of every depreciating asset is read in chunked bulk queries and the value
+    is computed in memory.
+
+    Mirrors ERPNext's method:
+    - calculate_depreciation not set: Asset.value_after_depreciation
+    - calculate_depreciation set: value_after_depreciation of the first
+      Asset Finance Book row (default finance book)
+    Both rounded to the precision of gross_purchase_amount.
+
+    Finance book values are read through the valuation cache, so repeated
+    fetches of the same assets on the same day skip the finance book query.
+
+    Args:
+            assets(list): Asset records (dicts) with at least name, company,
+                    calculate_depreciation and value_after_depreciation
+            valuation_date(str, optional): Cache date, defaults to today
+
+    Returns:
+            dict: Mapping of asset name to value after depreciation
+    """
+    values = {}
+    depreciating_assets = []
+
+    for asset in assets:
+        if asset.get("calculate_depreciation"):
+            depreciating_assets.append(asset.get("name"))
+        values[asset.get("name")] = flt(
+            asset.get("value_after_depreciation"),
+            get_value_precision(asset.get("company")),
+        )
+
+    if not depreciating_assets:
+        return values
+
+    finance_book_values = get_cached_finance_book_values(depreciating_assets, valuation_date)
+    company_by_asset = {asset.get("name"): asset.get("company") for asset in assets}
+
+    for asset_name in depreciating_assets:
+        # Assets without finance book rows keep the stored value
+        # (ERPNext would raise an IndexError here)
+        if asset_name in finance_book_values:
+            values[asset_name] = flt(
+                finance_book_values[asset_name],
+                get_value_precision(company_by_asset.get(asset_name)),
+            )
+
+    return values
+
+
+def get_cached_finance_book_values(asset_names, valuation_date=None):
+    """
+    Read finance book values through the Redis valuation cache
+
+    Cached values are read with one HMGET per chunk; misses are loaded with
+    get_finance_book_values and written back with one pipelined HSET.
+    Assets without a finance book row are not cached.
+
+    Args:
+            asset_names(list): Names of depreciating assets
+            valuation_date(str, optional): Cache date, defaults to today
+
+    Returns:
+            dict: Mapping of asset name to finance book value after depreciation
+    """
+    cache = frappe.cache()
+    cache_key = cache.make_key(VALUATION_CACHE_KEY.format(valuation_date or nowdate()))
+
+    finance_book_values = {}
+    missing = []
+
+    with perf_stage("valuation_cache"):
+        for start in range(0, len(asset_names), VALUATION_CHUNK_SIZE):
+            chunk = asset_names[start : start + VALUATION_CHUNK_SIZE]
+            for asset_name, value in zip(chunk, cache.hmget(cache_key, chunk), strict=True):
+                if value is None:
+                    missing.append(asset_name)
+                else:
+                    finance_book_values[asset_name] = flt(value)
+
+    record_cache(True, len(finance_book_values))
+    record_cache(False, len(missing))
+
+    if not missing:
+        return finance_book_values
+
+    with perf_stage("finance_books"):
+        loaded = get_finance_book_values(missing)
+    finance_book_values.update(loaded)
+
+    if loaded:
+        set_cached_finance_book_values(cache, cache_key, loaded)
+
+    return finance_book_values
+
+
+def set_cached_finance_book_values(cache, cache_key, values):
+    """
+    Write finance book values to a valuation date hash
+
+    The hash expires after VALUATION_CACHE_TTL. When it would grow past
+    VALUATION_CACHE_MAX_ASSETS it is dropped and refilled from scratch.
+    """
+    if cache.hlen(cache_key) + len(values) > VALUATION_CACHE_MAX_ASSETS:
+        cache.delete(cache_key)
+
+    pipeline = cache.pipeline()
+    pipeline.hset(cache_key, mapping={name: cstr(value) for name, value in values.items()})
+    pipeline.expire(cache_key, VALUATION_CACHE_TTL)
+    pipeline.sadd(cache.make_key(VALUATION_DATES_CACHE_KEY), cache_key)
+    pipeline.execute()
+
+
+def clear_valuation_cache(doc=None, method=None):
+    """
+    Drop cached values of the assets affected by a document
+
+    Called from doc events of Asset, Asset Depreciation Schedule, Asset Value
+    Adjustment and Journal Entry (depreciation entries reference the asset
+    on their account rows), since all of them change finance book values.
+    Without a document the whole valuation cache is cleared.
+
+    Keys are prefixed once with make_key and only passed to raw redis calls
+    (pipelines): the RedisWrapper set helpers would prefix them again.
+    """
+    cache = frappe.cache()
+    dates_key = cache.make_key(VALUATION_DATES_CACHE_KEY)
+    cache_keys = [cstr(key) for key in cache.pipeline().smembers(dates_key).execute()[0]]
+    if not cache_keys:
+        return
+
+    asset_names = get_affected_assets(doc) if doc else None
+    if asset_names is not None and not asset_names:
+        return
+
+    pipeline = cache.pipeline()
+    for cache_key in cache_keys:
+        if asset_names is None:
+            pipeline.delete(cache_key)
+            pipeline.srem(dates_key, cache_key)
+        else:
+            pipeline.hdel(cache_key, *asset_names)
+    pipeline.execute()
+
+    # Forget dates whose hash has expired
+    pipeline = cache.pipeline()
+    for cache_key in cache_keys:
+        pipeline.exists(cache_key)
+    stale_keys = [
+        cache_key
+        for cache_key, exists in zip(cache_keys, pipeline.execute(), strict=True)
+        if not exists
+    ]
+    if stale_keys:
+        cache.pipeline().srem(dates_key, *stale_keys).execute()
+
+
+def get_affected_assets(doc):
+    """
+    Get the assets whose value a document can change
+
+    Args:
+            doc(Document): Asset, Asset Depreciation Schedule, Asset Value
+                    Adjustment or Journal Entry
+
+    Returns:
+            list: Asset names
+    """
+    if doc.doctype == "Asset":
+        return [doc.name]
+
+    if doc.doctype == "Journal Entry":
+        return list(
+            {
+                row.reference_name
+                for row in doc.get("accounts") or []
+                if row.reference_type == "Asset" and row.reference_name
+            }
+        )
+
+    return [doc.asset] if doc.get("asset") else []
+
+
+def get_finance_book_values(asset_names):
+    """
+    Get value_after_depreciation of the first finance book row per asset
+
+    Args:
+            asset_names(list): Names of depreciating assets
+
+    Returns:
+            dict: Mapping of asset name to finance book value after depreciation
+    """
+    finance_book_values = {}
+
+    for start in range(0, len(asset_names), VALUATION_CHUNK_SIZE):
+        chunk = asset_names[start : start + VALUATION_CHUNK_SIZE]
+        rows = frappe.get_all(
+            "Asset Finance Book",
+            filters={
+                "parent": ("in", chunk),
+                "parenttype": "Asset",
+                "parentfield": "finance_books",
+            },
+            fields=["parent", "value_after_depreciation"],
+            order_by="parent asc, idx asc",
+        )
+
+        for row in rows:
+            # Rows are ordered by idx, keep the first one (default finance book)
+            finance_book_values.setdefault(row.parent, row.value_after_depreciation)
+
+    return finance_book_values
+
+
+@request_cache
+def get_value_precision(company=None):
+    """
+    Get the precision used by ERPNext to round asset values
+
+    Matches Asset.precision("gross_purchase_amount"), which depends on the
+    company currency.
+
+    Args:
+            company(str, optional): Company of the asset
+
+    Returns:
+            int: Number of decimal places
+    """
+    currency = frappe.get_cached_value("Company", company, "default_currency") if company else None
+    df = frappe.get_meta("Asset").get_field("gross_purchase_amount")
+
+    return get_field_precision(df, currency=currency)
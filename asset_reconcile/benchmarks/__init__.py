@@ -0,0 +1,15 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Benchmarks for the Asset Reconcile endpoints
+
+Run on a local site (MariaDB + Redis from bench, no outside services):
+
+    bench --site <site> execute asset_reconcile.benchmarks.runner.run --kwargs "{'scale': '10k'}"
+
+Compare two result files:
+
+    bench --site <site> execute asset_reconcile.benchmarks.runner.compare \\
+        --kwargs "{'base': '<base.json>', 'head': '<head.json>'}"
+"""
@@ -0,0 +1,330 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import random
+
+import frappe
+from frappe.utils import add_days, add_months, flt, getdate, now, nowdate
+
+from asset_reconcile.asset_reconcile.barcode import clear_barcode_index
+from asset_reconcile.asset_reconcile.location import clear_location_index
+from asset_reconcile.asset_reconcile.valuation import clear_valuation_cache
+
+# Size of every synthetic data set
+SCALES = {
+    "tiny": {"assets": 40, "locations": 4, "items": 8, "categories": 2},
+    "1k": {"assets": 1_000, "locations": 10, "items": 50, "categories": 5},
+    "10k": {"assets": 10_000, "locations": 50, "items": 200, "categories": 10},
+    "100k": {"assets": 100_000, "locations": 200, "items": 1_000, "categories": 20},
+}
+
+# Share of assets that calculate depreciation
+DEPRECIATING_SHARE = 0.6
+
+# Rows bulk-inserted per statement
+INSERT_CHUNK_SIZE = 5_000
+
+
+def get_prefix(scale):
+    """Name prefix of every record generated for a scale"""
+    return f"BENCH-{scale.upper()}"
+
+
+def generate(scale="1k", company=None, seed=42):
+    """
+    Generate a synthetic data set for benchmarks and tests
+
+    Creates a location tree, asset categories, fixed asset items with
+    barcodes and submitted assets (part of them depreciating, with a finance
+    book row). Items, barcodes, assets and finance books are bulk-inserted
+    without running their controllers, so 100k assets take seconds, not hours.
+    Running it again for the same scale reuses the existing data set.
+
+    Args:
+            scale(str, optional): tiny, 1k, 10k or 100k
+            company(str, optional): Existing company to use. Created if not given
+            seed(int, optional): Random seed, the same seed gives the same data
+
+    Returns:
+            dict: Data set context with company, root_location, locations,
+                    items and asset sample codes
+    """
+    if scale not in SCALES:
+        frappe.throw(f"Unknown scale {scale}, use one of {', '.join(SCALES)}")
+
+    size = SCALES[scale]
+    prefix = get_prefix(scale)
+    rng = random.Random(seed)
+
+    company = company or get_or_create_company(prefix)
+    _root_location, locations = get_or_create_locations(prefix, size["locations"])
+    categories = get_or_create_categories(prefix, size["categories"])
+    items = get_or_create_items(prefix, size["items"], categories)
+
+    if not frappe.db.exists("Asset", f"{prefix}-A{1:06d}"):
+        insert_assets(prefix, size["assets"], company, locations, items, rng)
+
+    frappe.db.commit()
+
+    return get_context(scale, company)
+
+
+def get_context(scale, company=None):
+    """
+    Describe an already generated data set
+
+    Args:
+            scale(str): Scale of the data set
+            company(str, optional): Company used when it was generated
+
+    Returns:
+            dict: Data set context (see generate)
+    """
+    prefix = get_prefix(scale)
+    company = company or frappe.db.get_value("Asset", f"{prefix}-A{1:06d}", "company")
+
+    return frappe._dict(
+        scale=scale,
+        prefix=prefix,
+        company=company,
+        root_location=f"{prefix} Site",
+        locations=frappe.get_all("Location", filters={"name": ("like", f"{prefix} Room %")}, pluck="name"),
+        items=frappe.get_all("Item", filters={"name": ("like", f"{prefix}-ITEM-%")}, pluck="name"),
+        asset_names=frappe.get_all(
+            "Asset", filters={"name": ("like", f"{prefix}-A%")}, pluck="name", limit=200, order_by="name"
+        ),
+        barcodes=frappe.get_all(
+            "Asset", filters={"name": ("like", f"{prefix}-A%")}, pluck="custom_barcode", limit=200, order_by="name"
+        ),
+        item_barcodes=frappe.get_all(
+            "Item Barcode", filters={"parent": ("like", f"{prefix}-ITEM-%")}, pluck="barcode", limit=200
+        ),
+    )
+
+
+def get_or_create_company(prefix):
+    """Create the benchmark company (with its chart of accounts) if needed"""
+    company_name = f"{prefix} Company"
+    if not frappe.db.exists("Company", company_name):
+        frappe.get_doc(
+            {
+                "doctype": "Company",
+                "company_name": company_name,
+                "abbr": prefix.replace("-", "")[:10],
+                "default_currency": frappe.db.get_default("currency") or "USD",
+                "country": frappe.db.get_default("country") or "United States",
+                "create_chart_of_accounts_based_on": "Standard Template",
+                "chart_of_accounts": "Standard",
+            }
+        ).insert(ignore_permissions=True)
+
+    return company_name
+
+
+def get_or_create_locations(prefix, count):
+    """Create a site location with `count` room locations under it"""
+    root_location = f"{prefix} Site"
+    if not frappe.db.exists("Location", root_location):
+        frappe.get_doc(
+            {"doctype": "Location", "location_name": root_location, "is_group": 1}
+        ).insert(ignore_permissions=True)
+
+    locations = []
+    for i in range(1, count + 1):
+        location = f"{prefix} Room {i:04d}"
+        if not frappe.db.exists("Location", location):
+            frappe.get_doc(
+                {"doctype": "Location", "location_name": location, "parent_location": root_location}
+            ).insert(ignore_permissions=True)
+        locations.append(location)
+
+    return root_location, locations
+
+
+def get_or_create_categories(prefix, count):
+    """Create asset categories (accounts are not needed for synthetic assets)"""
+    categories = []
+    for i in range(1, count + 1):
+        category = f"{prefix} Category {i:03d}"
+        if not frappe.db.exists("Asset Category", category):
+            doc = frappe.get_doc({"doctype": "Asset Category", "asset_category_name": category})
+            doc.flags.ignore_mandatory = True
+            doc.flags.ignore_validate = True
+            doc.insert(ignore_permissions=True)
+        categories.append(category)
+
+    return categories
+
+
+def get_or_create_items(prefix, count, categories):
+    """Bulk-insert fixed asset items with one barcode each"""
+    items = [f"{prefix}-ITEM-{i:05d}" for i in range(1, count + 1)]
+    if frappe.db.exists("Item", items[0]):
+        return items
+
+    timestamp = now()
+    user = frappe.session.user
+
+    frappe.db.bulk_insert(
+        "Item",
+        [
+            "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+            "item_code", "item_name", "item_group", "stock_uom", "is_stock_item",
+            "is_fixed_asset", "asset_category",
+        ],
+        [
+            (
+                item, timestamp, timestamp, user, user, 0, 0,
+                item, item, "All Item Groups", "Nos", 0,
+                1, categories[i % len(categories)],
+            )
+            for i, item in enumerate(items)
+        ],
+    )
+    frappe.db.bulk_insert(
+        "Item Barcode",
+        [
+            "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+            "parent", "parentfield", "parenttype", "barcode",
+        ],
+        [
+            (
+                frappe.generate_hash(length=10), timestamp, timestamp, user, user, 0, 1,
+                item, "barcodes", "Item", f"IB{item.replace('-', '')}",
+            )
+            for item in items
+        ],
+    )
+
+    return items
+
+
+def insert_assets(prefix, count, company, locations, items, rng):
+    """Bulk-insert submitted assets and the finance books of depreciating ones"""
+    timestamp = now()
+    user = frappe.session.user
+    today = getdate(nowdate())
+    item_categories = dict(
+        frappe.get_all("Item", filters={"name": ("in", items)}, fields=["name", "asset_category"], as_list=True)
+    )
+
+    asset_fields = [
+        "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+        "naming_series", "asset_name", "company", "item_code", "asset_category", "location",
+        "custom_barcode", "status", "purchase_date", "available_for_use_date",
+        "gross_purchase_amount", "calculate_depreciation", "value_after_depreciation",
+    ]
+    finance_book_fields = [
+        "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+        "parent", "parentfield", "parenttype", "depreciation_method",
+        "total_number_of_depreciations", "frequency_of_depreciation",
+        "depreciation_start_date", "value_after_depreciation",
+    ]
+
+    assets, finance_books = [], []
+    for i in range(1, count + 1):
+        name = f"{prefix}-A{i:06d}"
+        item = items[rng.randrange(len(items))]
+        gross_purchase_amount = flt(rng.uniform(100, 50_000), 2)
+        purchase_date = add_days(today, -rng.randrange(30, 5 * 365))
+        depreciating = rng.random() < DEPRECIATING_SHARE
+
+        value_after_depreciation = gross_purchase_amount
+        if depreciating:
+            # Straight line over 5 years, depreciated up to today
+            months = min(60, max(0, (today - getdate(purchase_date)).days // 30))
+            value_after_depreciation = flt(gross_purchase_amount * (60 - months) / 60, 2)
+            finance_books.append(
+                (
+                    frappe.generate_hash(length=10), timestamp, timestamp, user, user, 1, 1,
+                    name, "finance_books", "Asset", "Straight Line",
+                    60, 1, add_months(purchase_date, 1), value_after_depreciation,
+                )
+            )
+
+        assets.append(
+            (
+                name, timestamp, timestamp, user, user, 1, 0,
+                "ACC-ASS-.YYYY.-", f"{prefix} Asset {i}", company, item, item_categories.get(item),
+                locations[rng.randrange(len(locations))], f"BC{prefix.replace('-', '')}{i:06d}",
+                "Partially Depreciated" if depreciating else "Submitted", purchase_date, purchase_date,
+                gross_purchase_amount, int(depreciating), 0 if depreciating else value_after_depreciation,
+            )
+        )
+
+        if len(assets) >= INSERT_CHUNK_SIZE:
+            frappe.db.bulk_insert("Asset", asset_fields, assets)
+            assets = []
+        if len(finance_books) >= INSERT_CHUNK_SIZE:
+            frappe.db.bulk_insert("Asset Finance Book", finance_book_fields, finance_books)
+            finance_books = []
+
+    if assets:
+        frappe.db.bulk_insert("Asset", asset_fields, assets)
+    if finance_books:
+        frappe.db.bulk_insert("Asset Finance Book", finance_book_fields, finance_books)
+
+
+def cleanup(scale="1k", keep_masters=True):
+    """
+    Delete a generated data set (assets, finance books, items, barcodes)
+    and what was recorded against the benchmark company: reconciliations
+    with their child rows, scan logs, files and comments, summary and
+    anomaly rows, campaigns and asset movements
+
+    Locations, categories and the company are kept by default so the next
+    run is faster. Tests drop them as well.
+
+    Args:
+            scale(str, optional): Scale of the data set
+            keep_masters(bool, optional): Keep locations, categories and the company
+    """
+    prefix = get_prefix(scale)
+    company = f"{prefix} Company"
+
+    reconciliations = frappe.get_all("Asset Reconcile", filters={"company": company}, pluck="name")
+    if reconciliations:
+        for df in frappe.get_meta("Asset Reconcile").get_table_fields():
+            frappe.db.delete(df.options, {"parent": ("in", reconciliations), "parenttype": "Asset Reconcile"})
+        frappe.db.delete("Asset Reconcile Scan", {"asset_reconcile": ("in", reconciliations)})
+        for doctype in ("File", "Comment"):
+            reference_field = "attached_to" if doctype == "File" else "reference"
+            frappe.db.delete(
+                doctype,
+                {
+                    f"{reference_field}_doctype": "Asset Reconcile",
+                    f"{reference_field}_name": ("in", reconciliations),
+                },
+            )
+        frappe.db.delete("Asset Reconcile", {"name": ("in", reconciliations)})
+
+    campaigns = frappe.get_all("Asset Reconcile Campaign", filters={"company": company}, pluck="name")
+    if campaigns:
+        frappe.db.delete("Asset Reconcile Campaign Location", {"parent": ("in", campaigns)})
+        frappe.db.delete("Asset Reconcile Campaign", {"name": ("in", campaigns)})
+
+    frappe.db.delete("Asset Reconcile Summary", {"company": company})
+    frappe.db.delete("Asset Reconcile Anomaly", {"company": company})
+
+    movements = frappe.get_all("Asset Movement", filters={"company": company}, pluck="name")
+    if movements:
+        frappe.db.delete("Asset Movement Item", {"parent": ("in", movements)})
+        frappe.db.delete("Asset Movement", {"name": ("in", movements)})
+    if frappe.db.table_exists("Asset Activity"):
+        frappe.db.delete("Asset Activity", {"asset": ("like", f"{prefix}-A%")})
+
+    frappe.db.delete("Asset Finance Book", {"parent": ("like", f"{prefix}-A%")})
+    frappe.db.delete("Asset", {"name": ("like", f"{prefix}-A%")})
+    frappe.db.delete("Item Barcode", {"parent": ("like", f"{prefix}-ITEM-%")})
+    frappe.db.delete("Item", {"name": ("like", f"{prefix}-ITEM-%")})
+
+    if not keep_masters:
+        frappe.db.delete("Asset Category", {"name": ("like", f"{prefix} Category %")})
+        frappe.db.delete("Location", {"name": ("like", f"{prefix} %")})
+        if frappe.db.exists("Company", company):
+            frappe.delete_doc("Company", company, ignore_permissions=True, force=True)
+
+    frappe.db.commit()
+    clear_barcode_index()
+    clear_valuation_cache()
+    clear_location_index()
@@ -0,0 +1,280 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import add_days, cint, now_datetime
+
+from asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile import (
+    get_assets_by_filters,
+    get_cycle_count_sample,
+    get_system_data,
+    get_system_data_bulk,
+    scan_asset_barcode,
+)
+from asset_reconcile.asset_reconcile.perf import track_queries
+from asset_reconcile.benchmarks.generator import generate
+
+# Latency percentiles reported per benchmark
+PERCENTILES = (50, 90, 95, 99)
+
+# A head result slower than base by more than this share is flagged
+REGRESSION_THRESHOLD = 0.10
+
+
+@contextmanager
+def count_queries():
+    """
+    Count SQL statements run by frappe.db.sql inside the block
+
+    Yields:
+            dict: {"count": int}, updated as queries run
+    """
+    counter = {"count": 0}
+
+    def count(duration):
+        counter["count"] += 1
+
+    with track_queries(count):
+        yield counter
+
+
+def get_percentile(sorted_values, percentile):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-percentile * len(sorted_values) // 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def measure(fn, iterations, warmup=1):
+    """
+    Run a benchmark callable and collect its metrics
+
+    Latency and query counts are measured on plain runs; peak memory on one
+    extra run under tracemalloc, so tracing does not skew the timings.
+
+    Args:
+            fn(callable): Benchmark body, gets the iteration number
+            iterations(int): Timed runs
+            warmup(int, optional): Untimed runs first (fills request and Redis caches)
+
+    Returns:
+            dict: Latency percentiles (ms), queries per run and peak memory (KiB)
+    """
+    for i in range(warmup):
+        fn(i)
+        frappe.db.rollback()
+
+    timings, queries = [], []
+    for i in range(iterations):
+        with count_queries() as counter:
+            start = time.perf_counter()
+            fn(i)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(counter["count"])
+        frappe.db.rollback()
+
+    tracemalloc.start()
+    try:
+        fn(0)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        frappe.db.rollback()
+
+    timings.sort()
+    result = {f"p{percentile}_ms": round(get_percentile(timings, percentile), 3) for percentile in PERCENTILES}
+    result.update(
+        {
+            "max_ms": round(timings[-1], 3),
+            "mean_ms": round(sum(timings) / len(timings), 3),
+            "queries": round(sum(queries) / len(queries), 1),
+            "peak_memory_kib": round(peak_memory / 1024, 1),
+            "iterations": iterations,
+        }
+    )
+    return result
+
+
+def get_benchmarks(context):
+    """
+    Benchmark bodies for a generated data set
+
+    Args:
+            context(dict): Data set context from generator.generate
+
+    Returns:
+            dict: Benchmark name -> callable(iteration)
+    """
+    company = context.company
+    location = context.locations[0]
+    barcodes = context.barcodes or [""]
+    asset_names = context.asset_names or [""]
+    item_barcodes = context.item_barcodes or [""]
+    items = context.items or [""]
+
+    system_data_rows = [
+        {"item_code": items[i % len(items)], "location": context.locations[i % len(context.locations)]}
+        for i in range(100)
+    ] + [{"asset": asset_name} for asset_name in asset_names[:100]]
+
+    def validate(i):
+        doc = frappe.new_doc("Asset Reconcile")
+        doc.company = company
+        doc.location = location
+        doc.set("assets", get_assets_by_filters(company=company, location=location))
+        for row in doc.assets[: max(1, len(doc.assets) // 10)]:
+            row.reconcile_qty = 0
+        doc.run_method("validate")
+
+    return {
+        "scan_asset_barcode.custom_barcode": lambda i: scan_asset_barcode(
+            barcodes[i % len(barcodes)], company=company
+        ),
+        "scan_asset_barcode.asset_name": lambda i: scan_asset_barcode(
+            asset_names[i % len(asset_names)], company=company
+        ),
+        "scan_asset_barcode.item_barcode": lambda i: scan_asset_barcode(
+            item_barcodes[i % len(item_barcodes)], company=company
+        ),
+        "scan_asset_barcode.not_found": lambda i: scan_asset_barcode(f"MISSING-{i}", company=company),
+        "get_assets_by_filters.location": lambda i: get_assets_by_filters(
+            company=company, location=context.locations[i % len(context.locations)]
+        ),
+        "get_assets_by_filters.company": lambda i: get_assets_by_filters(company=company),
+        "get_assets_by_filters.company_compact": lambda i: get_assets_by_filters(
+            company=company,
+            fields=["asset", "item_code", "location", "asset_category", "system_value"],
+            compact=1,
+        ),
+        "get_assets_by_filters.sub_locations": lambda i: get_assets_by_filters(
+            company=company, location=context.root_location, include_sub_locations=1
+        ),
+        "get_assets_by_filters.as_of": lambda i: get_assets_by_filters(
+            company=company,
+            location=context.root_location,
+            include_sub_locations=1,
+            as_of=add_days(now_datetime(), -30),
+        ),
+        "get_cycle_count_sample.sub_locations": lambda i: get_cycle_count_sample(
+            company=company, location=context.root_location, include_sub_locations=1, sample_size=200, seed=i + 1
+        ),
+        "get_system_data.item": lambda i: get_system_data(
+            item_code=items[i % len(items)], location=location, company=company
+        ),
+        "get_system_data.asset": lambda i: get_system_data(asset=asset_names[i % len(asset_names)], company=company),
+        "get_system_data_bulk.200_rows": lambda i: get_system_data_bulk(system_data_rows, company=company),
+        "AssetReconcile.validate": validate,
+    }
+
+
+def run(scale="1k", iterations=20, output=None, company=None, only=None):
+    """
+    Generate (or reuse) a data set and benchmark the reconcile endpoints
+
+    Every benchmark runs in a rolled back transaction, so the data set is left
+    unchanged and can be reused by the next run.
+
+    Args:
+            scale(str, optional): tiny, 1k, 10k or 100k
+            iterations(int, optional): Timed runs per benchmark
+            output(str, optional): Result file path. Defaults to
+                    private/benchmarks/<scale>-<timestamp>.json in the site
+            company(str, optional): Existing company to generate data for
+            only(str, optional): Run only benchmarks whose name starts with this
+
+    Returns:
+            str: Path of the JSON result file
+    """
+    context = generate(scale, company=company)
+    iterations = cint(iterations) or 20
+
+    results = {}
+    for name, fn in get_benchmarks(context).items():
+        if only and not name.startswith(only):
+            continue
+        results[name] = measure(fn, iterations)
+        print(
+            f"{name:40} p50 {results[name]['p50_ms']:>10.3f} ms  p95 {results[name]['p95_ms']:>10.3f} ms"
+            f"  {results[name]['queries']:>7} queries  {results[name]['peak_memory_kib']:>10.1f} KiB"
+        )
+
+    report = {
+        "scale": scale,
+        "created_at": str(now_datetime()),
+        "git_revision": get_git_revision(),
+        "python": platform.python_version(),
+        "db_type": frappe.db.db_type,
+        "results": results,
+    }
+
+    output = output or frappe.get_site_path(
+        "private", "benchmarks", "{}-{}.json".format(scale, now_datetime().strftime("%Y%m%d%H%M%S"))
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+
+    print(f"Results written to {output}")
+    return output
+
+
+def compare(base, head, metric="p50_ms"):
+    """
+    Compare two benchmark result files
+
+    Args:
+            base(str): Result file of the reference run
+            head(str): Result file of the run to check
+            metric(str, optional): Latency metric to compare
+
+    Returns:
+            list: Benchmarks (name, base, head, change) slower than REGRESSION_THRESHOLD
+    """
+    with open(base) as f:
+        base_results = json.load(f)["results"]
+    with open(head) as f:
+        head_results = json.load(f)["results"]
+
+    regressions = []
+    for name in sorted(set(base_results) | set(head_results)):
+        if name not in base_results or name not in head_results:
+            print(f"{name:40} only in {'head' if name in head_results else 'base'}")
+            continue
+
+        base_value = base_results[name][metric]
+        head_value = head_results[name][metric]
+        change = (head_value - base_value) / base_value if base_value else 0
+        print(
+            f"{name:40} {base_value:>10.3f} -> {head_value:>10.3f} {metric} ({change:+.1%})"
+            f"  queries {base_results[name]['queries']} -> {head_results[name]['queries']}"
+        )
+        if change > REGRESSION_THRESHOLD:
+            regressions.append((name, base_value, head_value, change))
+
+    return regressions
+
+
+def get_git_revision():
+    """Current commit of the app, if it is a git checkout"""
+    import subprocess
+
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=frappe.get_app_path("asset_reconcile"),
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return None
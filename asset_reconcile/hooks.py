@@ -85,6 +85,12 @@ app_license = "mit"
 # before_install = "asset_reconcile.install.before_install"
 # after_install = "asset_reconcile.install.after_install"
 
+# Migration
+# ------------
+
+# Composite indexes for the reconcile query paths, EXPLAIN and barcode checks
+after_migrate = ["asset_reconcile.asset_reconcile.indexes.after_migrate"]
+
 # Uninstallation
 # ------------
 
@@ -145,6 +151,74 @@ app_license = "mit"
 # 	}
 # }
 
+doc_events = {
+	"Asset": {
+		"on_update": [
+			"asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+			"asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+		],
+		"on_submit": [
+			"asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+			"asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+		],
+		"on_update_after_submit": [
+			"asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+			"asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+		],
+		"on_cancel": [
+			"asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+			"asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+		],
+		"on_trash": [
+			"asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+			"asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+		],
+		"after_rename": [
+			"asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+			"asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+		],
+	},
+	# Location tree changes move lft/rgt of the whole tree
+	"Location": {
+		"on_update": [
+			"asset_reconcile.asset_reconcile.location.clear_location_index",
+			"asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+		],
+		"on_trash": [
+			"asset_reconcile.asset_reconcile.location.clear_location_index",
+			"asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+		],
+		"after_rename": [
+			"asset_reconcile.asset_reconcile.location.clear_location_index",
+			"asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+		],
+	},
+	# Asset Movement sets Asset.location with db_set, no Asset event runs
+	"Asset Movement": {
+		"on_submit": "asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+		"on_cancel": "asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+	},
+	# Item Barcode is a child table of Item
+	"Item": {
+		"on_update": "asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+		"on_trash": "asset_reconcile.asset_reconcile.barcode.clear_barcode_index",
+	},
+	# Documents that change finance book values after depreciation
+	"Asset Depreciation Schedule": {
+		"on_submit": "asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+		"on_update_after_submit": "asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+		"on_cancel": "asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+	},
+	"Asset Value Adjustment": {
+		"on_submit": "asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+		"on_cancel": "asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+	},
+	"Journal Entry": {
+		"on_submit": "asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+		"on_cancel": "asset_reconcile.asset_reconcile.valuation.clear_valuation_cache",
+	},
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -166,6 +240,15 @@ app_license = "mit"
 # 	],
 # }
 
+scheduler_events = {
+	"all": [
+		"asset_reconcile.asset_reconcile.doctype.asset_reconcile.asset_reconcile.merge_pending_scans",
+	],
+	"daily": [
+		"asset_reconcile.asset_reconcile.doctype.asset_reconcile_anomaly.asset_reconcile_anomaly.score_reconciliations",
+	],
+}
+
 # Testing
 # -------
 
@@ -242,6 +325,10 @@ app_license = "mit"
 # 	"Logging DocType Name": 30  # days to retain logs
 # }
 
+default_log_clearing_doctypes = {
+	"Reconcile Perf Log": 7,
+}
+
 # Translation
 # ------------
 # List of apps whose translatable strings should be excluded from this app's translations.
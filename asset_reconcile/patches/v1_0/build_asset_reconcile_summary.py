@@ -0,0 +1,11 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+from asset_reconcile.asset_reconcile.doctype.asset_reconcile_summary.asset_reconcile_summary import (
+    rebuild_reconcile_summary,
+)
+
+
+def execute():
+    """Backfill Asset Reconcile Summary, with its counts and shares, from already submitted reconciliations"""
+    rebuild_reconcile_summary()
@@ -0,0 +1,18 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+
+
+def execute():
+    """Fill the custodian of existing Asset Reconcile Item rows from their Asset (best known value)"""
+    frappe.db.sql(
+        """
+        update `tabAsset Reconcile Item` item
+        inner join `tabAsset` asset on asset.name = item.asset
+        set item.custodian = asset.custodian
+        where item.parenttype = 'Asset Reconcile'
+            and ifnull(item.custodian, '') = ''
+            and ifnull(asset.custodian, '') != ''
+        """
+    )